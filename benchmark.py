@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks and load tests for the NLP backend
+
+Three commands:
+
+    micro    Time the core functions in-process: parse_with_stanza,
+             QuantumGrammarParser.parse, detect_language, the analyze_*
+             helpers and document_statistics (tree analytics, run on a
+             synthetic treebank so they do not need Stanza).
+    load     Drive /api/parse, /api/parse-detailed and
+             /api/parse-quantum-grammar on a running server with concurrent
+             clients.
+    compare  Compare a baseline result file with a new one and flag
+             regressions. No baseline ships with the repository: timings
+             only mean something against a run on the same machine.
+
+Examples:
+    python3 benchmark.py micro -o benchmarks/micro-baseline.json
+    python3 benchmark.py load --url http://127.0.0.1:5000 --concurrency 8 \\
+        --server-pid $(pgrep -f 'gunicorn: master') -o benchmarks/load.json
+    python3 benchmark.py compare benchmarks/micro-baseline.json micro.json
+
+Every run uses fixed corpora: built-in English sentences, the sample
+paragraphs of the language detector, a synthetic Quantum Grammar corpus
+generated with a fixed seed from docs/QUANTUM_GRAMMAR_DOCUMENT.md, and a
+synthetic treebank of random dependency trees from the same seed. The load
+test tags every request's text with a per-run marker so the server's result
+cache cannot answer it (--repeat-texts measures the cached path instead), and
+records the server's cache hits. Results report throughput, p50/p95/p99
+latency and peak RSS, and are written as JSON so runs can be compared.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import resource
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+QUANTUM_DOCUMENT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'docs', 'QUANTUM_GRAMMAR_DOCUMENT.md')
+
+# Fixed English corpus, short to long
+SENTENCES = (
+    'The cat sat on the mat.',
+    'She reads a book every evening.',
+    'The quick brown fox jumps over the lazy dog.',
+    'My brother and I walked to the old bridge after dinner.',
+    'Although it was raining, the children played outside in the garden.',
+    'The committee will announce its decision at the end of the week.',
+    'He told me that he had never seen such a beautiful sunset before.',
+    'Scientists discovered a new species of frog in the rainforest last year.',
+    'If you finish your homework early, we can go to the cinema together.',
+    'The museum, which opened in 1902, houses one of the largest collections of '
+    'ancient pottery in the country.',
+    'Because the train was delayed by more than an hour, most of the passengers missed '
+    'their connections and had to spend the night in the small town near the station.',
+    'After reviewing the proposal carefully, the board decided that the project should '
+    'be postponed until the budget for the following year has been approved by the council.',
+)
+
+
+def paragraph_corpus(sentences: Sequence[str] = SENTENCES, size: int = 4) -> List[str]:
+    """Consecutive sentences joined into paragraphs of size sentences"""
+    return [' '.join(sentences[i:i + size]) for i in range(0, len(sentences), size)]
+
+
+def multilingual_corpus() -> List[str]:
+    """Sentences of every language known to the detector"""
+    from language_detection import TRIGRAM_SAMPLES
+
+    corpus = []
+    for samples in TRIGRAM_SAMPLES.values():
+        for paragraphs in samples.values():
+            for paragraph in paragraphs:
+                corpus.extend(sentence for sentence in re.split(r'(?<=[.!?])\s+', paragraph) if sentence)
+    return corpus
+
+
+# Tag and relation inventories of the synthetic treebank
+UPOS_TAGS = ('NOUN', 'VERB', 'ADJ', 'ADV', 'DET', 'ADP', 'PRON', 'PROPN', 'AUX', 'CCONJ', 'PUNCT')
+DEPRELS = ('nsubj', 'obj', 'iobj', 'obl', 'amod', 'advmod', 'det', 'case', 'aux', 'cc',
+           'conj', 'nmod', 'mark', 'punct')
+
+
+def synthetic_treebank(size: int = 200, seed: int = 42) -> List[Dict]:
+    """
+    Random dependency trees in the API sentence format
+
+    Each sentence has 5-40 words whose 1-based heads form a single tree
+    rooted at head 0, with random UPOS tags and relations. The tree
+    analytics only look at these fields, so they can be timed without
+    Stanza. The same size and seed always give the same treebank.
+    """
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(size):
+        length = rng.randint(5, 40)
+        order = list(range(1, length + 1))
+        rng.shuffle(order)
+        heads = {order[0]: 0}
+        for position, word in enumerate(order[1:], 1):
+            heads[word] = rng.choice(order[:position])
+        sentences.append({'tokens': [
+            {'id': word, 'head': heads[word], 'upos': rng.choice(UPOS_TAGS),
+             'deprel': 'root' if heads[word] == 0 else rng.choice(DEPRELS)}
+            for word in range(1, length + 1)
+        ]})
+    return sentences
+
+
+def _word_list(document: str, heading: str) -> List[str]:
+    """Comma-separated words on the first line after heading"""
+    match = re.search(rf'^###\s*{heading}.*\n(?:[^\n]*:\n)?([A-Z ,]+)$', document, re.MULTILINE)
+    if not match:
+        return []
+    return [word.strip().lower() for word in match.group(1).split(',') if word.strip()]
+
+
+def quantum_corpus(path: str = QUANTUM_DOCUMENT, size: int = 200, seed: int = 42) -> List[str]:
+    """
+    Synthetic Quantum Grammar sentences built from the vocabulary of path
+
+    Sentences follow the document's templates: positioned-lodial-fact
+    phrases around a verb, with occasional adverbs and tensed words. The
+    document's own example sentences are included as is. The same path,
+    size and seed always give the same corpus.
+    """
+    with open(path, encoding='utf-8') as handle:
+        document = handle.read()
+
+    positions = _word_list(document, 'POSITION Words') or ['for', 'of', 'with', 'by']
+    lodials = _word_list(document, 'LODIAL Words') or ['the']
+    facts = sorted(set(re.findall(r'\b(?:the|an?) ([a-z]+(?:-[a-z]+)*) = 5 6 7', document))
+                   | set(re.findall(r'^- ([a-z]+(?:-[a-z]+)*) (?:\(present\) )?= 7 \(FACT', document,
+                                    re.MULTILINE))) or ['healing']
+    tensed = sorted(set(re.findall(r'^- ([a-z]+(?: [a-z]+)?) \((?:past|future|present adverb)', document,
+                                   re.MULTILINE)))
+    examples = re.findall(r'^\*\*Sentence:\*\* (.+)$', document, re.MULTILINE)
+
+    rng = random.Random(seed)
+
+    def phrase() -> str:
+        return f'{rng.choice(positions)} {rng.choice(lodials)} {rng.choice(facts)}'
+
+    corpus = list(examples)
+    while len(corpus) < size:
+        words = [phrase() for _ in range(rng.randint(1, 3))]
+        words.append(rng.choice(('is', 'are', 'was', 'will be')))
+        if tensed and rng.random() < 0.4:
+            words.append(rng.choice(tensed))
+        words.extend(phrase() for _ in range(rng.randint(1, 3)))
+        sentence = ' '.join(words)
+        corpus.append(sentence[0].upper() + sentence[1:] + '.')
+    return corpus[:size]
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linearly interpolated q-th percentile (0-100) of sorted values"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Peak resident set size of pid (default: this process) in MB
+
+    Other processes are read from /proc; returns None where unavailable.
+    """
+    if pid is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict:
+    """Throughput and latency percentiles (ms) for one benchmark"""
+    ordered = sorted(latencies)
+    return {
+        'calls': len(ordered),
+        'errors': errors,
+        'seconds': elapsed,
+        'throughput': len(ordered) / elapsed if elapsed else 0.0,
+        'mean_ms': sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p95_ms': percentile(ordered, 95) * 1000,
+        'p99_ms': percentile(ordered, 99) * 1000,
+        'max_ms': ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def time_calls(function: Callable, inputs: Sequence, rounds: int) -> Dict:
+    """Call function on every input, rounds times, timing each call"""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for value in inputs:
+            call_started = time.perf_counter()
+            function(value)
+            latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_metadata(args: argparse.Namespace) -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'command': args.command,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {key: value for key, value in vars(args).items()
+                    if key not in ('command', 'output', 'handler')},
+    }
+
+
+def run_micro(args: argparse.Namespace) -> Dict:
+    # Keep runs independent of any persistent result cache configured in the environment
+    os.environ['RESULT_CACHE_PATH'] = ''
+    import nlp_backend
+    from quantum_grammar_parser import get_parser
+
+    results: Dict[str, Dict] = {}
+
+    def record(name: str, function: Callable, inputs: Sequence, rounds: int = args.rounds) -> None:
+        results[name] = time_calls(function, inputs, rounds)
+        print(f"{name:<32} {results[name]['throughput']:>10.1f}/s  "
+              f"p50 {results[name]['p50_ms']:.3f} ms  p99 {results[name]['p99_ms']:.3f} ms",
+              file=sys.stderr)
+
+    parser = get_parser()
+    quantum = quantum_corpus(size=args.corpus_size, seed=args.seed)
+    record('QuantumGrammarParser.parse', parser.parse, quantum)
+    record('detect_language', nlp_backend.detect_language, multilingual_corpus())
+
+    # Tree analytics only read ids, heads, tags and relations
+    treebank = synthetic_treebank(size=args.corpus_size, seed=args.seed)
+    # NumPy is imported on first use; keep that out of the timings
+    nlp_backend.analyze_pos_distribution(treebank[0]['tokens'])
+    record('analyze_pos_distribution', nlp_backend.analyze_pos_distribution,
+           [sentence['tokens'] for sentence in treebank])
+    record('analyze_dependencies', nlp_backend.analyze_dependencies,
+           [sentence['tokens'] for sentence in treebank])
+    record('document_statistics',
+           lambda sentences: nlp_backend.document_statistics(sentences, nlp_backend.STANZA_PROCESSORS),
+           [treebank[i:i + 4] for i in range(0, len(treebank), 4)])
+
+    sentences = list(SENTENCES)
+    try:
+        first = nlp_backend.parse_with_stanza(sentences[0], args.language)
+    except ImportError as e:
+        # Stanza is not installed (also raised by the model version lookup)
+        first = {'success': False, 'error': f'Stanza unavailable: {e}'}
+    if not first['success']:
+        print(f"Skipping Stanza benchmarks: {first.get('error')}", file=sys.stderr)
+        results['parse_with_stanza'] = {'skipped': first.get('error')}
+    else:
+        # The first pass over each text runs inference, later passes hit the result cache
+        record('parse_with_stanza[uncached]',
+               lambda text: nlp_backend.parse_with_stanza(text, args.language),
+               sentences[1:] + paragraph_corpus(), rounds=1)
+        record('parse_with_stanza[cached]',
+               lambda text: nlp_backend.parse_with_stanza(text, args.language), sentences)
+
+    return {'peak_rss_mb': peak_rss_mb(), 'results': results}
+
+
+def get_json(url: str, timeout: float) -> Optional[Dict]:
+    """Decoded JSON body of a GET, or None when it fails"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read())
+    except (OSError, ValueError):
+        return None
+
+
+def post_json(url: str, payload: Dict, timeout: float) -> int:
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Accept-Encoding': 'identity'}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+def load_scenarios(args: argparse.Namespace) -> Dict[str, List[Dict]]:
+    """Endpoint -> request payloads, cycled through by the load generator"""
+    language = {'language': args.language}
+    texts = list(SENTENCES) + paragraph_corpus()
+    return {
+        '/api/parse': [{'text': text, **language} for text in texts],
+        '/api/parse-detailed': [{'text': text, **language} for text in texts],
+        '/api/parse-quantum-grammar': [{'text': text}
+                                       for text in quantum_corpus(size=args.corpus_size, seed=args.seed)],
+    }
+
+
+def unique_payload(payload: Dict, tag: str) -> Dict:
+    """payload with tag appended to its text, so the server's result cache misses"""
+    return {**payload, 'text': f"{payload['text']} [{tag}]"}
+
+
+def run_load_scenario(url: str, payloads: List[Dict], requests: int, concurrency: int,
+                      timeout: float, unique_prefix: Optional[str] = None) -> Dict:
+    """
+    Send requests POSTs from concurrency threads, cycling through payloads
+
+    With unique_prefix, every request's text is made unique by tagging it
+    with the prefix and the request index.
+    """
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def client() -> None:
+        while True:
+            index = next(counter)
+            if index >= requests:
+                return
+            payload = payloads[index % len(payloads)]
+            if unique_prefix is not None:
+                payload = unique_payload(payload, f'{unique_prefix}{index}')
+            started = time.perf_counter()
+            try:
+                status = post_json(url, payload, timeout)
+            except (OSError, urllib.error.URLError):
+                status = 0
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def result_cache_counts(base_url: str, timeout: float) -> Optional[Dict]:
+    """The server's result cache hits and misses so far, from /api/health"""
+    health = get_json(base_url + '/api/health', timeout)
+    cache = (health or {}).get('result_cache')
+    if not cache:
+        return None
+    return {
+        'enabled': bool(cache.get('max_entries')),
+        'hits': cache.get('memory_hits', 0) + cache.get('disk_hits', 0),
+        'misses': cache.get('misses', 0),
+    }
+
+
+def run_load(args: argparse.Namespace) -> Dict:
+    scenarios = load_scenarios(args)
+    endpoints = args.endpoint or list(scenarios)
+    base_url = args.url.rstrip('/')
+    # Fresh per run, so texts from earlier runs against the same server do not hit either
+    run_tag = secrets.token_hex(3)
+    results: Dict[str, Dict] = {}
+    cache_enabled = None
+    for number, endpoint in enumerate(endpoints):
+        url = base_url + endpoint
+        payloads = scenarios[endpoint]
+        warmup_tag = measured_tag = None
+        if not args.repeat_texts:
+            # /api/parse and /api/parse-detailed share cache entries, so tags differ per endpoint
+            warmup_tag, measured_tag = f'{run_tag}-{number}w', f'{run_tag}-{number}-'
+        # Warm up pipelines and connections; not measured
+        run_load_scenario(url, payloads, min(args.warmup, len(payloads)), 1, args.timeout, warmup_tag)
+        before = result_cache_counts(base_url, args.timeout)
+        results[endpoint] = run_load_scenario(url, payloads, args.requests, args.concurrency,
+                                              args.timeout, measured_tag)
+        after = result_cache_counts(base_url, args.timeout)
+        summary = results[endpoint]
+        if before and after:
+            cache_enabled = after['enabled']
+            summary['result_cache_hits'] = after['hits'] - before['hits']
+            summary['result_cache_misses'] = after['misses'] - before['misses']
+        print(f"{endpoint:<32} {summary['throughput']:>8.1f} req/s  p50 {summary['p50_ms']:.1f} ms  "
+              f"p95 {summary['p95_ms']:.1f} ms  p99 {summary['p99_ms']:.1f} ms  "
+              f"errors {summary['errors']}  cache hits {summary.get('result_cache_hits', '?')}",
+              file=sys.stderr)
+    return {
+        'peak_rss_mb': peak_rss_mb(),
+        'server_peak_rss_mb': peak_rss_mb(args.server_pid) if args.server_pid else None,
+        'unique_texts': not args.repeat_texts,
+        # None when the server's /api/health could not be read
+        'result_cache_enabled': cache_enabled,
+        'results': results,
+    }
+
+
+# Metrics where a higher value is better; all other compared metrics are latencies
+HIGHER_IS_BETTER = ('throughput',)
+COMPARED_METRICS = ('throughput', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def compare_runs(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print relative changes per benchmark and return the regressions beyond threshold"""
+    regressions = []
+    for name, before in baseline['results'].items():
+        after = current['results'].get(name)
+        if after is None or 'skipped' in before or 'skipped' in after:
+            print(f'{name}: not comparable')
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            if not before[metric]:
+                continue
+            change = (after[metric] - before[metric]) / before[metric]
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = ''
+            if worse > threshold:
+                flag = ' !'
+                regressions.append(f'{name} {metric} {change:+.1%}')
+            changes.append(f'{metric} {change:+.1%}{flag}')
+        print(f"{name}: {', '.join(changes)}")
+
+    for key in ('peak_rss_mb', 'server_peak_rss_mb'):
+        if baseline.get(key) and current.get(key):
+            change = (current[key] - baseline[key]) / baseline[key]
+            print(f'{key}: {baseline[key]:.1f} -> {current[key]:.1f} ({change:+.1%})')
+            if change > threshold:
+                regressions.append(f'{key} {change:+.1%}')
+    return regressions
+
+
+def meta_mismatches(baseline: Dict, current: Dict) -> List[str]:
+    """Run metadata that differs between two results, making timings incomparable"""
+    before, after = baseline.get('meta', {}), current.get('meta', {})
+    return [key for key in ('command', 'platform', 'cpu_count', 'python', 'options')
+            if before.get(key) != after.get(key)]
+
+
+def run_compare(args: argparse.Namespace) -> None:
+    with open(args.baseline, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    with open(args.current, encoding='utf-8') as handle:
+        current = json.load(handle)
+    mismatches = meta_mismatches(baseline, current)
+    if mismatches:
+        print(f"Warning: runs differ in {', '.join(mismatches)}; "
+              f"compare runs taken on the same machine with the same options", file=sys.stderr)
+    regressions = compare_runs(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+        for regression in regressions:
+            print(f'  {regression}', file=sys.stderr)
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark and load-test the NLP backend')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    micro = commands.add_parser('micro', help='Time core functions in-process')
+    micro.add_argument('--rounds', type=int, default=20, help='Passes over each corpus')
+    micro.set_defaults(handler=run_micro)
+
+    load = commands.add_parser('load', help='Load-test a running server')
+    load.add_argument('--url', default='http://127.0.0.1:5000', help='Server base URL')
+    load.add_argument('--endpoint', action='append',
+                      choices=('/api/parse', '/api/parse-detailed', '/api/parse-quantum-grammar'),
+                      help='Endpoint to drive (repeatable; default: all)')
+    load.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+    load.add_argument('--requests', type=int, default=500, help='Measured requests per endpoint')
+    load.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per endpoint')
+    load.add_argument('--timeout', type=float, default=60.0, help='Seconds per request')
+    load.add_argument('--server-pid', type=int, help='Server process whose peak RSS to report')
+    load.add_argument('--repeat-texts', action='store_true',
+                      help='Cycle through the corpus unchanged, measuring result cache hits '
+                           '(default: tag every text so each request runs inference)')
+    load.set_defaults(handler=run_load)
+
+    for command in (micro, load):
+        command.add_argument('--language', default='en', help='Language of the English corpus')
+        command.add_argument('--corpus-size', type=int, default=200,
+                             help='Sentences in the synthetic Quantum Grammar corpus')
+        command.add_argument('--seed', type=int, default=42, help='Synthetic corpus seed')
+        command.add_argument('-o', '--output', help='Write results as JSON to this file')
+
+    compare = commands.add_parser('compare', help='Compare two result files')
+    compare.add_argument('baseline', help='Baseline results JSON')
+    compare.add_argument('current', help='Results JSON to check')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative change reported as a regression')
+    compare.set_defaults(handler=None)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        run_compare(args)
+        return
+
+    report = {'meta': run_metadata(args), **args.handler(args)}
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+        print(f'Results written to {args.output}', file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
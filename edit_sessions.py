@@ -0,0 +1,116 @@
+"""
+Editing sessions for incremental re-parsing
+
+While a document is being edited, the server keeps its previous version as a
+list of sentence-sized segments with their parse results. A new version is
+diffed against it at segment granularity (difflib.SequenceMatcher), so only
+inserted or changed segments have to be parsed again, and the client
+receives just the changed ranges.
+
+Sessions live in process memory, bounded by count and idle time. A request
+for an unknown or expired session (another gunicorn worker, a restart)
+starts a new one, and its delta then covers the whole document.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+# (op, old start, old end, new start, new end), as from SequenceMatcher.get_opcodes
+Opcode = Tuple[str, int, int, int, int]
+
+
+def diff_segments(old: List[str], new: List[str]) -> List[Opcode]:
+    """Opcodes turning the segment list old into new, 'equal' ranges included"""
+    return SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+
+
+class EditSession:
+    """The last parsed version of one document"""
+
+    __slots__ = ('session_id', 'language', 'processors', 'version', 'texts', 'segments', 'lock')
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.language: Optional[str] = None
+        self.processors: Optional[str] = None
+        self.version = 0
+        # Segment texts and their parse results, in document order
+        self.texts: List[str] = []
+        self.segments: List[Any] = []
+        # Serializes edits to the same session
+        self.lock = threading.Lock()
+
+    def apply(self, texts: List[str], segments: List[Any], language: str, processors: str) -> None:
+        """Replace the document with a new version"""
+        self.texts = texts
+        self.segments = segments
+        self.language = language
+        self.processors = processors
+        self.version += 1
+
+
+class SessionStore:
+    """LRU collection of EditSessions with an idle timeout"""
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 3600):
+        """
+        Args:
+            max_sessions: Least recently used sessions beyond this are dropped
+            ttl: Seconds without an edit after which a session expires (0 = never)
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        # session id -> (session, last used), least recently used first
+        self._sessions: 'OrderedDict[str, Tuple[EditSession, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+
+    def get(self, session_id: Optional[str]) -> Optional[EditSession]:
+        """Live session with this id, or None"""
+        if not session_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            session, last_used = entry
+            if self.ttl and now - last_used > self.ttl:
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+            self._sessions[session_id] = (session, now)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def create(self) -> EditSession:
+        """Start a new, empty session"""
+        session = EditSession(secrets.token_urlsafe(16))
+        with self._lock:
+            self._sessions[session.session_id] = (session, time.monotonic())
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.expired += 1
+        return session
+
+    def discard(self, session_id: str) -> bool:
+        """End a session, returning whether it existed"""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            active = len(self._sessions)
+        return {
+            'active': active,
+            'max_sessions': self.max_sessions,
+            'ttl': self.ttl,
+            'created': self.created,
+            'expired': self.expired,
+        }
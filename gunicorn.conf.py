@@ -0,0 +1,66 @@
+"""
+gunicorn configuration for the Diagrammatic NLP backend
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers are forked from a master that has already imported the app (and,
+with PRELOAD_MODELS=true, loaded the Stanza pipelines), so model weights are
+shared copy-on-write between workers. Settings are read from the
+environment:
+
+    BIND              Address to listen on (default 127.0.0.1:5000)
+    WEB_CONCURRENCY   Number of worker processes (default: CPU count)
+    WEB_THREADS       Request threads per worker (default 4)
+    WEB_TIMEOUT       Seconds before a silent worker is restarted (default 120)
+    MAX_REQUESTS      Recycle workers after this many requests (default 0 = never)
+
+Graceful reload: `kill -HUP <master pid>` replaces workers without dropping
+in-flight requests, reusing the models already loaded in the master. To
+pick up new code or models, start a new master with `kill -USR2`, then stop
+the old one with `kill -WINCH` followed by `kill -QUIT`.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+
+bind = os.environ.get('BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WEB_THREADS', '4'))
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', '120'))
+graceful_timeout = 30
+max_requests = int(os.environ.get('MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+# Import the app (and load models) in the master so workers share them
+preload_app = True
+
+
+def when_ready(server):
+    """Master is about to fork: freeze loaded objects out of the GC"""
+    # Without this the cyclic GC in each worker touches every object header,
+    # copying the shared model pages one by one
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Per-worker setup: size torch thread pools and warm up pipelines"""
+    from nlp_backend import env_flag, inference_pool, preloader, start_preload
+
+    # Split the cores between workers instead of every worker using all of them
+    threads_per_worker = max(1, multiprocessing.cpu_count() // workers)
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(threads_per_worker)
+    else:
+        # torch is imported with the first pipeline and sizes its pools from this
+        os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    if inference_pool.enabled:
+        # Each worker owns an inference pool, which loads its own models
+        if env_flag('PRELOAD_MODELS'):
+            start_preload()
+        return
+    # Inference must not run in the master (OpenMP state does not survive
+    # fork), so pipelines loaded there are warmed here in each worker
+    preloader.warm()
@@ -0,0 +1,97 @@
+"""
+HTTP response compression and conditional requests
+
+- Responses above a size threshold are compressed with brotli (when the
+  brotli package is installed and the client accepts it) or gzip.
+- Parse endpoints tag responses with a deterministic ETag derived from the
+  request inputs (text, language, format, model version), so a repeated
+  request carrying If-None-Match is answered with 304 before any parsing.
+"""
+
+import gzip
+from typing import Any, Optional
+
+from flask import Flask, Request, Response
+
+from result_cache import make_key
+
+try:
+    import brotli
+except ImportError:  # optional encoding
+    brotli = None
+
+# Only these content types are worth compressing
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'application/vnd.diagrammatic.columnar+json',
+    'application/msgpack',
+    'text/plain',
+)
+
+
+def make_etag(namespace: str, text: str, *parts: Any) -> str:
+    """Deterministic ETag value for a request's inputs (see result_cache.make_key)"""
+    return make_key(namespace, text, *parts)[:32]
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response when the request's If-None-Match matches etag
+
+    ETags are weak because the compressed and uncompressed bodies differ
+    byte-wise while being semantically identical.
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def tag_response(response: Response, etag: str, cache_control: str = 'no-cache') -> Response:
+    """Attach the ETag (and a revalidation policy) to a successful response"""
+    if response.status_code == 200:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def choose_encoding(request: Request) -> Optional[str]:
+    """Best content coding the client accepts, or None"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def install_compression(app: Flask, min_bytes: int = 1024, gzip_level: int = 6,
+                        brotli_quality: int = 5) -> None:
+    """Compress eligible responses of app that are at least min_bytes long"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+
+        encoding = choose_encoding(request)
+        if encoding == 'br':
+            body = brotli.compress(body, quality=brotli_quality)
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=gzip_level)
+        else:
+            return response
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
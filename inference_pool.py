@@ -0,0 +1,254 @@
+"""
+Process pool for offloading NLP inference from request threads
+
+Stanza inference is CPU-bound and holds the GIL for long stretches, so
+running it on Flask request threads starves cheap endpoints such as health
+checks. InferencePool runs inference in dedicated worker processes instead:
+
+- Each language is routed to a fixed worker (language affinity), so every
+  worker keeps only its own languages' pipelines hot.
+- Each worker has a bounded queue; submissions beyond it are rejected with
+  QueueFullError so the API can answer 429 instead of piling up work.
+- Callers wait with a timeout and get InferenceTimeoutError when it expires.
+- Crashed workers are restarted and their pending requests failed.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """The worker queue for a language is at capacity"""
+
+
+class InferenceTimeoutError(Exception):
+    """Inference did not finish within the request timeout"""
+
+
+class WorkerCrashedError(Exception):
+    """The worker process died while the request was pending"""
+
+
+def _worker_main(handler: Callable, tasks, results) -> None:
+    """Worker process loop: run handler on each task until told to stop"""
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        task_id, args = item
+        try:
+            results.put((task_id, True, handler(*args)))
+        except Exception as e:
+            results.put((task_id, False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """Parent-side handle for one worker process"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.tasks = None
+        self.pending: Dict[int, Future] = {}
+
+
+class InferencePool:
+    """Language-affine pool of inference worker processes"""
+
+    def __init__(self, handler: Callable, workers: int = 0, max_queue: int = 32,
+                 timeout: float = 30.0):
+        """
+        Args:
+            handler: Top-level (picklable) function run in the workers
+            workers: Number of worker processes (0 disables the pool)
+            max_queue: Maximum pending requests per worker
+            timeout: Default seconds to wait for a result
+        """
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pool: List[_Worker] = []
+        self._results = None
+        self._owner_pid: Optional[int] = None
+        # Spawned workers do not inherit the parent's threads or torch state
+        self._context = multiprocessing.get_context('spawn')
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def start(self) -> None:
+        """Start the worker processes (done lazily on first submit)"""
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        # A pool belongs to the process that started it; after a fork the
+        # child needs its own workers and collector thread (lock held)
+        if self._owner_pid == os.getpid():
+            return
+        self._owner_pid = os.getpid()
+        self._results = self._context.Queue()
+        self._pool = [_Worker(index) for index in range(self.workers)]
+        for worker in self._pool:
+            self._spawn(worker)
+        threading.Thread(target=self._collect, name='inference-results', daemon=True).start()
+        logger.info(f"Started {self.workers} inference worker(s)")
+
+    def _spawn(self, worker: _Worker) -> None:
+        worker.tasks = self._context.Queue()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(self.handler, worker.tasks, self._results),
+            name=f'inference-worker-{worker.index}',
+            daemon=True
+        )
+        worker.process.start()
+
+    def worker_for(self, language: str) -> int:
+        """Index of the worker that owns language"""
+        return zlib.crc32(language.encode('utf-8')) % self.workers
+
+    def submit(self, language: str, *args: Any) -> Future:
+        """
+        Queue handler(*args) on the worker that owns language
+
+        Raises:
+            QueueFullError: If that worker already has max_queue pending requests
+        """
+        with self._lock:
+            self._ensure_started()
+            worker = self._pool[self.worker_for(language)]
+            if len(worker.pending) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"Inference queue for {language} is full ({self.max_queue} pending)"
+                )
+            task_id = next(self._ids)
+            future: Future = Future()
+            worker.pending[task_id] = future
+            self.submitted += 1
+            worker.tasks.put((task_id, args))
+        return future
+
+    def run(self, language: str, *args: Any, timeout: Optional[float] = -1) -> Any:
+        """
+        Submit and wait for the result
+
+        Args:
+            timeout: Seconds to wait; -1 uses the pool default, None waits forever
+
+        Raises:
+            QueueFullError: The language's worker is saturated
+            InferenceTimeoutError: No result within the timeout
+            WorkerCrashedError: The worker died while processing the request
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        future = self.submit(language, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise InferenceTimeoutError(f"Inference for {language} timed out after {timeout}s")
+
+    def _collect(self) -> None:
+        """Resolve futures from worker results and restart dead workers"""
+        results = self._results
+        owner_pid = self._owner_pid
+        while self._owner_pid == owner_pid:
+            try:
+                task_id, ok, payload = results.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                future = None
+                for worker in self._pool:
+                    future = worker.pending.pop(task_id, None)
+                    if future is not None:
+                        break
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self) -> None:
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                return
+            for worker in self._pool:
+                if worker.process.is_alive():
+                    continue
+                logger.error(f"Inference worker {worker.index} exited "
+                             f"(code {worker.process.exitcode}); restarting")
+                lost = list(worker.pending.values())
+                worker.pending.clear()
+                self.failed += len(lost)
+                self.restarts += 1
+                self._spawn(worker)
+                for future in lost:
+                    future.set_exception(WorkerCrashedError(
+                        f"Inference worker {worker.index} crashed"
+                    ))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Ask workers to exit after their current task"""
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                return
+            for worker in self._pool:
+                worker.tasks.put(None)
+            deadline = time.monotonic() + timeout
+            for worker in self._pool:
+                worker.process.join(max(0.0, deadline - time.monotonic()))
+            self._owner_pid = None
+
+    def stats(self) -> Dict:
+        """Queue depth and throughput counters for health reporting"""
+        with self._lock:
+            started = self._owner_pid == os.getpid()
+            return {
+                'enabled': self.enabled,
+                'workers': self.workers,
+                'alive': sum(1 for worker in self._pool if started and worker.process.is_alive()),
+                'max_queue': self.max_queue,
+                'timeout': self.timeout,
+                'queue_depth': sum(len(worker.pending) for worker in self._pool) if started else 0,
+                'queue_depth_per_worker': [len(worker.pending) for worker in self._pool] if started else [],
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'restarts': self.restarts,
+            }
@@ -0,0 +1,295 @@
+"""
+Asynchronous jobs for long-running parses
+
+JobManager runs submitted work on background threads and records every job
+in a JobStore: an SQLite table holding status, progress and, once finished,
+the result. Finished jobs expire after a TTL. When the store is a file,
+gunicorn workers on the same host share it, so a job can be polled,
+fetched or cancelled through any worker.
+
+Submissions carry a key; submitting a key that matches a queued, running or
+finished job returns that job instead of starting another one. Handlers
+report progress through a callback, which is also where cancellation takes
+effect: the callback raises JobCancelled once the job has been cancelled.
+"""
+
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Jobs in these states can still produce a result
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Columns returned by JobStore.get, in table order
+JOB_FIELDS = ('job_id', 'key', 'status', 'done', 'total', 'error', 'owner', 'created', 'updated')
+
+
+class JobCancelled(Exception):
+    """The job was cancelled while its handler was running"""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite table of jobs, their progress and results"""
+
+    def __init__(self, path: str = ':memory:', ttl: float = 3600):
+        """
+        Args:
+            path: SQLite database file, or ':memory:' for a per-process store
+            ttl: Seconds a finished job and its result are kept (0 = forever)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._owner_pid: Optional[int] = None
+        self._creates_since_purge = 0
+
+    def _db(self) -> sqlite3.Connection:
+        """This process's connection (lock held)"""
+        # Connections must not cross a fork (gunicorn imports the app in the master)
+        if self._owner_pid != os.getpid():
+            self._owner_pid = os.getpid()
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' job_id TEXT PRIMARY KEY,'
+                ' key TEXT NOT NULL,'
+                ' status TEXT NOT NULL,'
+                ' done INTEGER NOT NULL,'
+                ' total INTEGER NOT NULL,'
+                ' error TEXT,'
+                ' owner INTEGER NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' updated REAL NOT NULL,'
+                ' result TEXT)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key)')
+            self._conn.commit()
+        return self._conn
+
+    def create(self, key: str, total: int = 0) -> Dict:
+        """Record a new queued job owned by this process"""
+        now = time.time()
+        job_id = secrets.token_urlsafe(12)
+        with self._lock:
+            db = self._db()
+            db.execute(
+                'INSERT INTO jobs (job_id, key, status, done, total, error, owner, created, updated)'
+                ' VALUES (?, ?, ?, 0, ?, NULL, ?, ?, ?)',
+                (job_id, key, QUEUED, total, os.getpid(), now, now)
+            )
+            self._creates_since_purge += 1
+            # Purging scans the table, so only do it every so often
+            if self._creates_since_purge >= 100:
+                self._purge(db, now)
+            db.commit()
+        return dict(zip(JOB_FIELDS, (job_id, key, QUEUED, 0, total, None, os.getpid(), now, now)))
+
+    def get(self, job_id: str, with_result: bool = False) -> Optional[Dict]:
+        """
+        The job, or None if it is unknown or expired
+
+        With with_result, the decoded result (None until the job is done) is
+        read in the same query under 'result', so it cannot expire between
+        the status check and the fetch.
+        """
+        columns = JOB_FIELDS + ('result',) if with_result else JOB_FIELDS
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                f"SELECT {', '.join(columns)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            job = self._live(db, row)
+        if job is not None and with_result:
+            result = row[len(JOB_FIELDS)]
+            job['result'] = json.loads(result) if result is not None and job['status'] == DONE else None
+        return job
+
+    def find(self, key: str) -> Optional[Dict]:
+        """Newest job for key that is queued, running or done"""
+        with self._lock:
+            db = self._db()
+            rows = db.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE key = ? AND status IN (?, ?, ?)"
+                ' ORDER BY created DESC',
+                (key, QUEUED, RUNNING, DONE)
+            ).fetchall()
+            for row in rows:
+                job = self._live(db, row)
+                if job is not None and job['status'] != FAILED:
+                    return job
+        return None
+
+    def _live(self, db: sqlite3.Connection, row) -> Optional[Dict]:
+        """Apply expiry and orphan detection to a fetched row (lock held)"""
+        if row is None:
+            return None
+        job = dict(zip(JOB_FIELDS, row[:len(JOB_FIELDS)]))
+        now = time.time()
+        if job['status'] not in ACTIVE_STATES:
+            if self.ttl and now - job['updated'] > self.ttl:
+                db.execute('DELETE FROM jobs WHERE job_id = ?', (job['job_id'],))
+                db.commit()
+                return None
+        elif job['owner'] != os.getpid() and not _pid_alive(job['owner']):
+            # The process running it exited (restart, crash) before finishing
+            job.update(status=FAILED, error='The server process running this job exited', updated=now)
+            db.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated = ? WHERE job_id = ?',
+                (FAILED, job['error'], now, job['job_id'])
+            )
+            db.commit()
+        return job
+
+    def transition(self, job_id: str, from_states: Tuple[str, ...], status: str, **fields: Any) -> bool:
+        """
+        Atomically move a job from one of from_states to status
+
+        Extra fields (done, total, error, result) are updated with it; result
+        is JSON-encoded. Returns False if the job was in another state.
+        """
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], ensure_ascii=False)
+        assignments = ''.join(f', {name} = ?' for name in fields)
+        placeholders = ', '.join('?' for _ in from_states)
+        with self._lock:
+            db = self._db()
+            cursor = db.execute(
+                f'UPDATE jobs SET status = ?, updated = ?{assignments}'
+                f' WHERE job_id = ? AND status IN ({placeholders})',
+                (status, time.time(), *fields.values(), job_id, *from_states)
+            )
+            db.commit()
+            return cursor.rowcount > 0
+
+    def _purge(self, db: sqlite3.Connection, now: float) -> None:
+        """Drop finished jobs past the TTL (lock held)"""
+        self._creates_since_purge = 0
+        if self.ttl:
+            db.execute(
+                'DELETE FROM jobs WHERE status NOT IN (?, ?) AND updated < ?',
+                (QUEUED, RUNNING, now - self.ttl)
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs in the store per status (runs a query; keep it off liveness probes)"""
+        with self._lock:
+            rows = self._db().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return dict(rows)
+
+
+class JobManager:
+    """Runs jobs on a thread pool and tracks them in a JobStore"""
+
+    def __init__(self, store: JobStore,
+                 handler: Callable[[Dict, Callable[[int, int], None]], Any], workers: int = 2):
+        """
+        Args:
+            store: Where jobs, progress and results are recorded
+            handler: Called as handler(payload, progress) on a worker thread;
+                progress(done, total) records progress and raises JobCancelled
+                once the job has been cancelled
+            workers: Jobs run concurrently; further jobs wait in the queue
+        """
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        # Makes the duplicate lookup and creation of a job atomic within this process
+        self._submit_lock = threading.Lock()
+        # Counted by this process only, so reading them never touches the store
+        self.submitted = 0
+        self.deduplicated = 0
+        self.finished: Dict[str, int] = {DONE: 0, FAILED: 0, CANCELLED: 0}
+        self._counter_lock = threading.Lock()
+
+    def submit(self, key: str, payload: Dict, total: int = 0) -> Tuple[Dict, bool]:
+        """
+        Queue a job for payload, or return the live job with the same key
+
+        Returns (job, deduplicated).
+        """
+        with self._submit_lock:
+            existing = self.store.find(key)
+            if existing is not None:
+                self.deduplicated += 1
+                return existing, True
+            job = self.store.create(key, total)
+            self.submitted += 1
+        self._executor.submit(self._run, job['job_id'], payload)
+        return job, False
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued or running job; returns the job, or None if unknown"""
+        if self.store.transition(job_id, ACTIVE_STATES, CANCELLED):
+            self._count(CANCELLED)
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str, payload: Dict) -> None:
+        if not self.store.transition(job_id, (QUEUED,), RUNNING):
+            return  # cancelled while queued
+
+        def progress(done: int, total: int) -> None:
+            if not self.store.transition(job_id, (RUNNING,), RUNNING, done=done, total=total):
+                raise JobCancelled(job_id)
+
+        try:
+            result = self.handler(payload, progress)
+        except JobCancelled:
+            logger.info(f"Job {job_id} cancelled")
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.transition(job_id, (RUNNING,), FAILED, error=str(e))
+            self._count(FAILED)
+            return
+
+        if isinstance(result, dict) and result.get('success') is False:
+            self.store.transition(job_id, (RUNNING,), FAILED, error=result.get('error'))
+            self._count(FAILED)
+        else:
+            self.store.transition(job_id, (RUNNING,), DONE, result=result)
+            self._count(DONE)
+
+    def _count(self, status: str) -> None:
+        with self._counter_lock:
+            self.finished[status] += 1
+
+    def stats(self) -> Dict:
+        """In-memory counters of this process; JobStore.counts covers the shared store"""
+        with self._counter_lock:
+            finished = dict(self.finished)
+        return {
+            'workers': self.workers,
+            'store': self.store.path,
+            'ttl': self.store.ttl,
+            'submitted': self.submitted,
+            'deduplicated': self.deduplicated,
+            'finished': finished,
+        }
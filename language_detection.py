@@ -0,0 +1,783 @@
+"""
+Script- and trigram-based language detection
+
+Detection walks a bounded prefix of the text once, classifying every
+character through a sorted table of Unicode script ranges and keeping the
+letters the trigram models need as it goes:
+
+- Scripts used by a single supported language (Hebrew, Thai, Devanagari,
+  Bengali) decide the language directly; Han text is Japanese when any
+  kana is present, Chinese otherwise.
+- Scripts shared by several languages (Latin, Cyrillic, Arabic) are
+  resolved with a small character-trigram naive Bayes model built from the
+  sample paragraphs below (everyday and technical register).
+
+Confidence combines how much of the text is in the winning script with the
+trigram model's posterior for the winning language. The trigram vote only
+overrides the script's default language (English for Latin) when it rests
+on enough trigrams and its posterior clears a fixed floor with a clear lead
+over the runner-up; short or ambiguous inputs ("OK.", "Data processing
+pipeline") get the default, since loading another language's pipeline for
+English text costs far more than the rare miss.
+
+For documents that mix languages, LanguageDetector.segments cuts the text at
+sentence boundaries and script changes and labels each piece separately.
+"""
+
+import bisect
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+LATIN = 'Latin'
+CYRILLIC = 'Cyrillic'
+ARABIC = 'Arabic'
+HEBREW = 'Hebrew'
+DEVANAGARI = 'Devanagari'
+BENGALI = 'Bengali'
+THAI = 'Thai'
+KANA = 'Kana'
+HAN = 'Han'
+
+# (first codepoint, last codepoint, script), sorted and non-overlapping
+SCRIPT_RANGES: List[Tuple[int, int, str]] = [
+    (0x0041, 0x005A, LATIN),
+    (0x0061, 0x007A, LATIN),
+    (0x00C0, 0x024F, LATIN),
+    (0x0400, 0x052F, CYRILLIC),
+    (0x0590, 0x05FF, HEBREW),
+    (0x0600, 0x06FF, ARABIC),
+    (0x0750, 0x077F, ARABIC),
+    (0x0900, 0x097F, DEVANAGARI),
+    (0x0980, 0x09FF, BENGALI),
+    (0x0E00, 0x0E7F, THAI),
+    (0x1E00, 0x1EFF, LATIN),
+    (0x3040, 0x30FF, KANA),
+    (0x31F0, 0x31FF, KANA),
+    (0x3400, 0x4DBF, HAN),
+    (0x4E00, 0x9FFF, HAN),
+    (0xF900, 0xFAFF, HAN),
+    (0xFB50, 0xFDFF, ARABIC),
+    (0xFE70, 0xFEFF, ARABIC),
+    (0xFF66, 0xFF9F, KANA),
+]
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Scripts written by exactly one supported language
+SCRIPT_LANGUAGES: Dict[str, str] = {
+    HEBREW: 'he',
+    DEVANAGARI: 'hi',
+    BENGALI: 'bn',
+    THAI: 'th',
+    HAN: 'zh',
+    KANA: 'ja',
+}
+
+# Parallel sample paragraphs per language; trigram profiles are built from these
+TRIGRAM_SAMPLES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    LATIN: {
+        'en': (
+            "The dog sleeps in my parents' house. The children play in the park every day "
+            "after school. I don't know what to do with this problem, but I think that we will "
+            "find a solution tomorrow. The city is very quiet at night and the streets are "
+            "empty. Where are my keys? She said that she had arrived early, although nobody "
+            "saw her come in. We want to learn English because it is a very beautiful and "
+            "useful language for work. It was the best of times and it was the worst of times, "
+            "which is what they would have said about the people who lived there. Yesterday we "
+            "went to the market to buy bread, cheese and vegetables. The weather was cold, so "
+            "we drank hot tea in a small café. My sister reads a book every week and writes "
+            "letters to her old teacher. How much does this cost? It is too expensive for me, "
+            "but my friends bought two of them.",
+            "This program analyzes the structure of sentences and shows the results in a "
+            "diagram. Enter a sentence, choose a language and press the button to start the "
+            "analysis. The server processes the text, finds the words and their relations, and "
+            "sends the data back as a list. If a model is missing, it is downloaded the first "
+            "time it is needed. Large documents are split into smaller parts that are "
+            "processed one after another. The system keeps the latest results in memory, so "
+            "the same request is answered much faster the second time. Errors are written to "
+            "the log file together with the time and the name of the request. Please check the "
+            "settings before you install a new version of the application.",
+        ),
+        'es': (
+            "El perro duerme en la casa de mis padres. Los niños juegan en el parque todos los "
+            "días después de la escuela. No sé qué hacer con este problema, pero creo que "
+            "mañana encontraremos una solución. La ciudad está muy tranquila por la noche y "
+            "las calles están vacías. ¿Dónde están mis llaves? Ella dijo que había llegado "
+            "temprano, aunque nadie la vio entrar. Queremos aprender español porque es una "
+            "lengua muy hermosa y útil para el trabajo. Fue el mejor de los tiempos y también "
+            "el peor, según decían las personas que vivían allí. Hola, ¿cómo estás? Muy bien, "
+            "gracias. Hace mucho que no nos vemos, así que me alegra verte otra vez. Ayer "
+            "fuimos al mercado a comprar pan, queso y verduras. Hacía frío, así que tomamos té "
+            "caliente en un pequeño café. Mi hermana lee un libro cada semana y escribe cartas "
+            "a su antigua maestra. ¿Cuánto cuesta esto? Es demasiado caro para mí, pero mis "
+            "amigos compraron dos.",
+            "Este programa analiza la estructura de las oraciones y muestra los resultados en "
+            "un diagrama. Escriba una oración, elija un idioma y pulse el botón para empezar "
+            "el análisis. El servidor procesa el texto, encuentra las palabras y sus "
+            "relaciones, y devuelve los datos como una lista. Si falta un modelo, se descarga "
+            "la primera vez que se necesita. Los documentos grandes se dividen en partes más "
+            "pequeñas que se procesan una tras otra. El sistema guarda los últimos resultados "
+            "en memoria, así que la misma petición se responde mucho más rápido la segunda "
+            "vez. Los errores se escriben en el archivo de registro junto con la hora y el "
+            "nombre de la petición. Por favor, revise la configuración antes de instalar una "
+            "nueva versión de la aplicación.",
+        ),
+        'fr': (
+            "Le chien dort dans la maison de mes parents. Les enfants jouent dans le parc tous "
+            "les jours après l'école. Je ne sais pas quoi faire avec ce problème, mais je "
+            "pense que nous trouverons une solution demain. La ville est très calme la nuit et "
+            "les rues sont vides. Où sont mes clés ? Elle a dit qu'elle était arrivée en "
+            "avance, bien que personne ne l'ait vue entrer. Nous voulons apprendre le français "
+            "parce que c'est une langue très belle et utile pour le travail. C'était le "
+            "meilleur des temps et aussi le pire, disaient les gens qui vivaient là. Hier, "
+            "nous sommes allés au marché pour acheter du pain, du fromage et des légumes. Il "
+            "faisait froid, alors nous avons bu du thé chaud dans un petit café. Ma sœur lit "
+            "un livre chaque semaine et écrit des lettres à son ancienne institutrice. Combien "
+            "ça coûte ? C'est trop cher pour moi, mais mes amis en ont acheté deux.",
+            "Ce programme analyse la structure des phrases et affiche les résultats dans un "
+            "diagramme. Saisissez une phrase, choisissez une langue et appuyez sur le bouton "
+            "pour lancer l'analyse. Le serveur traite le texte, trouve les mots et leurs "
+            "relations, et renvoie les données sous forme de liste. Si un modèle manque, il "
+            "est téléchargé la première fois qu'on en a besoin. Les grands documents sont "
+            "découpés en parties plus petites qui sont traitées l'une après l'autre. Le "
+            "système garde les derniers résultats en mémoire, donc la même requête reçoit une "
+            "réponse beaucoup plus rapide la deuxième fois. Les erreurs sont écrites dans le "
+            "fichier journal avec l'heure et le nom de la requête. Veuillez vérifier les "
+            "paramètres avant d'installer une nouvelle version de l'application.",
+        ),
+        'de': (
+            "Der Hund schläft im Haus meiner Eltern. Die Kinder spielen jeden Tag nach der "
+            "Schule im Park. Ich weiß nicht, was ich mit diesem Problem machen soll, aber ich "
+            "glaube, dass wir morgen eine Lösung finden werden. Die Stadt ist in der Nacht "
+            "sehr ruhig und die Straßen sind leer. Wo sind meine Schlüssel? Sie sagte, dass "
+            "sie früh angekommen sei, obwohl niemand sie hereinkommen sah. Wir wollen Deutsch "
+            "lernen, weil es eine sehr schöne und nützliche Sprache für die Arbeit ist. Es war "
+            "die beste und zugleich die schlimmste Zeit, sagten die Leute, die dort lebten. "
+            "Gestern sind wir auf den Markt gegangen, um Brot, Käse und Gemüse zu kaufen. Es "
+            "war kalt, also haben wir in einem kleinen Café heißen Tee getrunken. Meine "
+            "Schwester liest jede Woche ein Buch und schreibt Briefe an ihre alte Lehrerin. "
+            "Wie viel kostet das? Es ist mir zu teuer, aber meine Freunde haben zwei davon "
+            "gekauft.",
+            "Dieses Programm analysiert den Aufbau von Sätzen und zeigt die Ergebnisse in "
+            "einem Diagramm. Geben Sie einen Satz ein, wählen Sie eine Sprache und drücken Sie "
+            "die Taste, um die Analyse zu starten. Der Server verarbeitet den Text, findet die "
+            "Wörter und ihre Beziehungen und schickt die Daten als Liste zurück. Wenn ein "
+            "Modell fehlt, wird es heruntergeladen, sobald es zum ersten Mal gebraucht wird. "
+            "Große Dokumente werden in kleinere Teile zerlegt, die nacheinander verarbeitet "
+            "werden. Das System behält die letzten Ergebnisse im Speicher, deshalb wird "
+            "dieselbe Anfrage beim zweiten Mal viel schneller beantwortet. Fehler werden "
+            "zusammen mit der Uhrzeit und dem Namen der Anfrage in die Protokolldatei "
+            "geschrieben. Bitte prüfen Sie die Einstellungen, bevor Sie eine neue Version der "
+            "Anwendung installieren.",
+        ),
+        'it': (
+            "Il cane dorme nella casa dei miei genitori. I bambini giocano nel parco tutti i "
+            "giorni dopo la scuola. Non so cosa fare con questo problema, ma penso che domani "
+            "troveremo una soluzione. La città è molto tranquilla di notte e le strade sono "
+            "vuote. Dove sono le mie chiavi? Lei ha detto che era arrivata presto, anche se "
+            "nessuno l'ha vista entrare. Vogliamo imparare l'italiano perché è una lingua "
+            "molto bella e utile per il lavoro. Era il migliore dei tempi e anche il peggiore, "
+            "dicevano le persone che vivevano lì. Ieri siamo andati al mercato a comprare "
+            "pane, formaggio e verdure. Faceva freddo, quindi abbiamo bevuto un tè caldo in un "
+            "piccolo bar. Mia sorella legge un libro ogni settimana e scrive lettere alla sua "
+            "vecchia maestra. Quanto costa questo? È troppo caro per me, ma i miei amici ne "
+            "hanno comprati due.",
+            "Questo programma analizza la struttura delle frasi e mostra i risultati in un "
+            "diagramma. Scrivi una frase, scegli una lingua e premi il pulsante per avviare "
+            "l'analisi. Il server elabora il testo, trova le parole e le loro relazioni e "
+            "rimanda i dati sotto forma di elenco. Se manca un modello, viene scaricato la "
+            "prima volta che serve. I documenti grandi vengono divisi in parti più piccole che "
+            "vengono elaborate una dopo l'altra. Il sistema conserva gli ultimi risultati in "
+            "memoria, quindi la stessa richiesta riceve una risposta molto più veloce la "
+            "seconda volta. Gli errori vengono scritti nel file di registro insieme all'ora e "
+            "al nome della richiesta. Si prega di controllare le impostazioni prima di "
+            "installare una nuova versione dell'applicazione.",
+        ),
+        'pt': (
+            "O cachorro dorme na casa dos meus pais. As crianças brincam no parque todos os "
+            "dias depois da escola. Não sei o que fazer com este problema, mas acho que amanhã "
+            "vamos encontrar uma solução. A cidade é muito tranquila à noite e as ruas estão "
+            "vazias. Onde estão as minhas chaves? Ela disse que tinha chegado cedo, embora "
+            "ninguém a tenha visto entrar. Queremos aprender português porque é uma língua "
+            "muito bonita e útil para o trabalho. Foi o melhor dos tempos e também o pior, "
+            "diziam as pessoas que viviam lá. Ontem fomos ao mercado comprar pão, queijo e "
+            "legumes. Estava frio, então bebemos chá quente num pequeno café. A minha irmã lê "
+            "um livro todas as semanas e escreve cartas à sua antiga professora. Quanto custa "
+            "isto? É caro demais para mim, mas os meus amigos compraram dois.",
+            "Este programa analisa a estrutura das frases e mostra os resultados em um "
+            "diagrama. Escreva uma frase, escolha um idioma e aperte o botão para começar a "
+            "análise. O servidor processa o texto, encontra as palavras e as suas relações e "
+            "devolve os dados em forma de lista. Se faltar um modelo, ele é baixado na "
+            "primeira vez em que for necessário. Os documentos grandes são divididos em partes "
+            "menores que são processadas uma após a outra. O sistema guarda os últimos "
+            "resultados na memória, por isso o mesmo pedido é respondido muito mais depressa "
+            "na segunda vez. Os erros são escritos no arquivo de registro junto com a hora e o "
+            "nome do pedido. Por favor, verifique as configurações antes de instalar uma nova "
+            "versão do aplicativo.",
+        ),
+        'tr': (
+            "Köpek annemlerin evinde uyuyor. Çocuklar her gün okuldan sonra parkta oynuyor. Bu "
+            "sorunla ne yapacağımı bilmiyorum, ama yarın bir çözüm bulacağımızı düşünüyorum. "
+            "Şehir gece çok sessiz ve sokaklar boş. Anahtarlarım nerede? Erken geldiğini "
+            "söyledi, ama kimse onun içeri girdiğini görmedi. Türkçe öğrenmek istiyoruz çünkü "
+            "çok güzel ve iş için faydalı bir dil. Orada yaşayan insanlar bunun zamanların en "
+            "iyisi ve aynı zamanda en kötüsü olduğunu söylüyorlardı. Dün ekmek, peynir ve "
+            "sebze almak için pazara gittik. Hava soğuktu, bu yüzden küçük bir kafede sıcak "
+            "çay içtik. Kız kardeşim her hafta bir kitap okuyor ve eski öğretmenine mektuplar "
+            "yazıyor. Bu ne kadar? Benim için çok pahalı, ama arkadaşlarım iki tane aldı.",
+            "Bu program cümlelerin yapısını inceler ve sonuçları bir diyagramda gösterir. Bir "
+            "cümle yazın, bir dil seçin ve analizi başlatmak için düğmeye basın. Sunucu metni "
+            "işler, kelimeleri ve aralarındaki ilişkileri bulur ve verileri bir liste olarak "
+            "geri gönderir. Bir model eksikse, ilk gerektiğinde indirilir. Büyük belgeler, "
+            "birbiri ardına işlenen daha küçük parçalara bölünür. Sistem son sonuçları "
+            "bellekte tutar, bu yüzden aynı istek ikinci seferde çok daha hızlı yanıtlanır. "
+            "Hatalar, saat ve isteğin adıyla birlikte kayıt dosyasına yazılır. Uygulamanın "
+            "yeni bir sürümünü kurmadan önce lütfen ayarları kontrol edin.",
+        ),
+        'pl': (
+            "Pies śpi w domu moich rodziców. Dzieci bawią się w parku codziennie po szkole. "
+            "Nie wiem, co zrobić z tym problemem, ale myślę, że jutro znajdziemy rozwiązanie. "
+            "Miasto jest w nocy bardzo spokojne, a ulice są puste. Gdzie są moje klucze? "
+            "Powiedziała, że przyszła wcześnie, chociaż nikt nie widział, jak wchodziła. "
+            "Chcemy uczyć się polskiego, ponieważ to bardzo piękny i przydatny język w pracy. "
+            "To były najlepsze i zarazem najgorsze czasy, mówili ludzie, którzy tam mieszkali. "
+            "Wczoraj poszliśmy na targ kupić chleb, ser i warzywa. Było zimno, więc piliśmy "
+            "gorącą herbatę w małej kawiarni. Moja siostra czyta co tydzień książkę i pisze "
+            "listy do swojej dawnej nauczycielki. Ile to kosztuje? To dla mnie za drogie, ale "
+            "moi przyjaciele kupili dwa.",
+            "Ten program analizuje budowę zdań i pokazuje wyniki na diagramie. Wpisz zdanie, "
+            "wybierz język i naciśnij przycisk, aby rozpocząć analizę. Serwer przetwarza "
+            "tekst, znajduje słowa i związki między nimi, a następnie odsyła dane w postaci "
+            "listy. Jeśli brakuje modelu, jest on pobierany za pierwszym razem, gdy jest "
+            "potrzebny. Duże dokumenty są dzielone na mniejsze części, które są przetwarzane "
+            "jedna po drugiej. System przechowuje ostatnie wyniki w pamięci, więc na to samo "
+            "zapytanie za drugim razem odpowiada znacznie szybciej. Błędy są zapisywane w "
+            "pliku dziennika razem z godziną i nazwą zapytania. Przed zainstalowaniem nowej "
+            "wersji aplikacji prosimy sprawdzić ustawienia.",
+        ),
+        'nl': (
+            "De hond slaapt in het huis van mijn ouders. De kinderen spelen elke dag na school "
+            "in het park. Ik weet niet wat ik met dit probleem moet doen, maar ik denk dat we "
+            "morgen een oplossing zullen vinden. De stad is 's nachts erg rustig en de straten "
+            "zijn leeg. Waar zijn mijn sleutels? Ze zei dat ze vroeg was aangekomen, hoewel "
+            "niemand haar had zien binnenkomen. Wij willen Nederlands leren omdat het een heel "
+            "mooie en nuttige taal is voor het werk. Het was de beste en tegelijk de slechtste "
+            "tijd, zeiden de mensen die daar woonden. Gisteren gingen we naar de markt om "
+            "brood, kaas en groenten te kopen. Het was koud, dus we dronken warme thee in een "
+            "klein café. Mijn zus leest elke week een boek en schrijft brieven aan haar oude "
+            "lerares. Hoeveel kost dit? Het is te duur voor mij, maar mijn vrienden hebben er "
+            "twee gekocht.",
+            "Dit programma analyseert de opbouw van zinnen en toont de resultaten in een "
+            "diagram. Typ een zin, kies een taal en druk op de knop om de analyse te starten. "
+            "De server verwerkt de tekst, vindt de woorden en hun relaties en stuurt de "
+            "gegevens terug als een lijst. Als er een model ontbreekt, wordt het gedownload op "
+            "het moment dat het voor het eerst nodig is. Grote documenten worden opgesplitst "
+            "in kleinere delen die na elkaar worden verwerkt. Het systeem houdt de laatste "
+            "resultaten in het geheugen, zodat hetzelfde verzoek de tweede keer veel sneller "
+            "wordt beantwoord. Fouten worden samen met de tijd en de naam van het verzoek naar "
+            "het logbestand geschreven. Controleer de instellingen voordat u een nieuwe versie "
+            "van de toepassing installeert.",
+        ),
+        'sv': (
+            "Hunden sover i mina föräldrars hus. Barnen leker i parken varje dag efter skolan. "
+            "Jag vet inte vad jag ska göra med det här problemet, men jag tror att vi hittar "
+            "en lösning i morgon. Staden är mycket lugn på natten och gatorna är tomma. Var är "
+            "mina nycklar? Hon sa att hon hade kommit tidigt, fast ingen såg henne gå in. Vi "
+            "vill lära oss svenska eftersom det är ett mycket vackert och användbart språk för "
+            "arbetet. Det var den bästa och samtidigt den värsta tiden, sa människorna som "
+            "bodde där. I går gick vi till torget för att köpa bröd, ost och grönsaker. Det "
+            "var kallt, så vi drack varmt te på ett litet kafé. Min syster läser en bok varje "
+            "vecka och skriver brev till sin gamla lärarinna. Hur mycket kostar det här? Det "
+            "är för dyrt för mig, men mina vänner köpte två stycken.",
+            "Det här programmet analyserar hur meningar är uppbyggda och visar resultatet i "
+            "ett diagram. Skriv en mening, välj ett språk och tryck på knappen för att starta "
+            "analysen. Servern bearbetar texten, hittar orden och deras relationer och skickar "
+            "tillbaka uppgifterna som en lista. Om en modell saknas laddas den ner första "
+            "gången den behövs. Stora dokument delas upp i mindre delar som bearbetas en i "
+            "taget. Systemet sparar de senaste resultaten i minnet, så att samma förfrågan "
+            "besvaras mycket snabbare andra gången. Fel skrivs till loggfilen tillsammans med "
+            "tiden och namnet på förfrågan. Kontrollera inställningarna innan du installerar "
+            "en ny version av programmet.",
+        ),
+        'no': (
+            "Hunden sover i huset til foreldrene mine. Barna leker i parken hver dag etter "
+            "skolen. Jeg vet ikke hva jeg skal gjøre med dette problemet, men jeg tror at vi "
+            "finner en løsning i morgen. Byen er veldig rolig om natten, og gatene er tomme. "
+            "Hvor er nøklene mine? Hun sa at hun hadde kommet tidlig, selv om ingen så henne "
+            "gå inn. Vi vil lære norsk fordi det er et veldig vakkert og nyttig språk for "
+            "arbeidet. Det var den beste og samtidig den verste tiden, sa folkene som bodde "
+            "der. Jeg vil gjerne ha en kopp kaffe. Hvordan har du det? Det går bra med meg, "
+            "takk. Vi har ikke sett hverandre på lenge, så det er hyggelig å møtes igjen. I "
+            "går dro vi på torget for å kjøpe brød, ost og grønnsaker. Det var kaldt, så vi "
+            "drakk varm te på en liten kafé. Søsteren min leser en bok hver uke og skriver "
+            "brev til den gamle læreren sin. Hvor mye koster dette? Det er for dyrt for meg, "
+            "men vennene mine kjøpte to.",
+            "Dette programmet analyserer hvordan setninger er bygd opp, og viser resultatene i "
+            "et diagram. Skriv inn en setning, velg et språk og trykk på knappen for å starte "
+            "analysen. Serveren behandler teksten, finner ordene og forholdet mellom dem, og "
+            "sender dataene tilbake som en liste. Hvis en modell mangler, blir den lastet ned "
+            "første gang den trengs. Store dokumenter blir delt opp i mindre deler som "
+            "behandles etter hverandre. Systemet tar vare på de siste resultatene i minnet, "
+            "slik at den samme forespørselen blir besvart mye raskere andre gang. Feil blir "
+            "skrevet til loggfilen sammen med klokkeslettet og navnet på forespørselen. "
+            "Vennligst sjekk innstillingene før du installerer en ny versjon av programmet.",
+        ),
+        'da': (
+            "Hunden sover i mine forældres hus. Børnene leger i parken hver dag efter skole. "
+            "Jeg ved ikke, hvad jeg skal gøre ved dette problem, men jeg tror, at vi finder en "
+            "løsning i morgen. Byen er meget stille om natten, og gaderne er tomme. Hvor er "
+            "mine nøgler? Hun sagde, at hun var kommet tidligt, selvom ingen så hende gå ind. "
+            "Vi vil gerne lære dansk, fordi det er et meget smukt og nyttigt sprog til "
+            "arbejdet. Det var den bedste og samtidig den værste tid, sagde de mennesker, som "
+            "boede der. Jeg vil gerne have en kop kaffe. Hvordan har du det? Det går godt, "
+            "tak. Vi har ikke set hinanden længe, så det er hyggeligt at mødes igen. I går gik "
+            "vi på torvet for at købe brød, ost og grøntsager. Det var koldt, så vi drak varm "
+            "te på en lille café. Min søster læser en bog hver uge og skriver breve til sin "
+            "gamle lærer. Hvor meget koster det her? Det er for dyrt for mig, men mine venner "
+            "købte to.",
+            "Dette program analyserer, hvordan sætninger er bygget op, og viser resultaterne i "
+            "et diagram. Skriv en sætning, vælg et sprog og tryk på knappen for at starte "
+            "analysen. Serveren behandler teksten, finder ordene og forholdet mellem dem og "
+            "sender dataene tilbage som en liste. Hvis en model mangler, bliver den hentet "
+            "første gang, den skal bruges. Store dokumenter bliver delt op i mindre dele, som "
+            "behandles efter hinanden. Systemet gemmer de seneste resultater i hukommelsen, så "
+            "den samme forespørgsel bliver besvaret meget hurtigere anden gang. Fejl bliver "
+            "skrevet i logfilen sammen med tidspunktet og navnet på forespørgslen. Kontrollér "
+            "venligst indstillingerne, før du installerer en ny version af programmet.",
+        ),
+        'fi': (
+            "Koira nukkuu vanhempieni talossa. Lapset leikkivät puistossa joka päivä koulun "
+            "jälkeen. En tiedä, mitä minun pitäisi tehdä tämän ongelman kanssa, mutta uskon, "
+            "että löydämme ratkaisun huomenna. Kaupunki on yöllä hyvin rauhallinen ja kadut "
+            "ovat tyhjiä. Missä avaimeni ovat? Hän sanoi tulleensa aikaisin, vaikka kukaan ei "
+            "nähnyt hänen tulevan sisään. Haluamme oppia suomea, koska se on hyvin kaunis ja "
+            "hyödyllinen kieli työssä. Se oli parasta ja samalla pahinta aikaa, sanoivat "
+            "ihmiset, jotka asuivat siellä. Eilen menimme torille ostamaan leipää, juustoa ja "
+            "vihanneksia. Oli kylmä, joten joimme kuumaa teetä pienessä kahvilassa. Siskoni "
+            "lukee kirjan joka viikko ja kirjoittaa kirjeitä vanhalle opettajalleen. Paljonko "
+            "tämä maksaa? Se on minulle liian kallis, mutta ystäväni ostivat kaksi.",
+            "Tämä ohjelma analysoi lauseiden rakenteen ja näyttää tulokset kaaviossa. Kirjoita "
+            "lause, valitse kieli ja paina painiketta aloittaaksesi analyysin. Palvelin "
+            "käsittelee tekstin, löytää sanat ja niiden väliset suhteet ja lähettää tiedot "
+            "takaisin luettelona. Jos malli puuttuu, se ladataan ensimmäisellä kerralla, kun "
+            "sitä tarvitaan. Suuret asiakirjat jaetaan pienempiin osiin, jotka käsitellään "
+            "yksi kerrallaan. Järjestelmä säilyttää viimeisimmät tulokset muistissa, joten "
+            "sama pyyntö saa vastauksen paljon nopeammin toisella kerralla. Virheet "
+            "kirjoitetaan lokitiedostoon yhdessä kellonajan ja pyynnön nimen kanssa. Tarkista "
+            "asetukset ennen kuin asennat sovelluksen uuden version.",
+        ),
+        'vi': (
+            "Con chó đang ngủ trong nhà của bố mẹ tôi. Bọn trẻ chơi trong công viên mỗi ngày "
+            "sau giờ học. Tôi không biết phải làm gì với vấn đề này, nhưng tôi nghĩ rằng ngày "
+            "mai chúng ta sẽ tìm ra giải pháp. Thành phố rất yên tĩnh vào ban đêm và đường phố "
+            "vắng người. Chìa khóa của tôi ở đâu? Cô ấy nói rằng cô đã đến sớm, mặc dù không "
+            "ai thấy cô đi vào. Chúng tôi muốn học tiếng Việt vì đó là một ngôn ngữ rất đẹp và "
+            "hữu ích cho công việc. Những người sống ở đó nói rằng đó là thời kỳ tốt nhất và "
+            "cũng là tồi tệ nhất. Hôm qua chúng tôi đi chợ để mua bánh mì, phô mai và rau. "
+            "Trời lạnh nên chúng tôi uống trà nóng ở một quán cà phê nhỏ. Em gái tôi đọc một "
+            "cuốn sách mỗi tuần và viết thư cho cô giáo cũ của mình. Cái này giá bao nhiêu? Nó "
+            "quá đắt đối với tôi, nhưng bạn bè tôi đã mua hai cái.",
+            "Chương trình này phân tích cấu trúc của câu và hiển thị kết quả trong một sơ đồ. "
+            "Hãy nhập một câu, chọn một ngôn ngữ và nhấn nút để bắt đầu phân tích. Máy chủ xử "
+            "lý văn bản, tìm các từ và quan hệ giữa chúng, rồi gửi dữ liệu trở lại dưới dạng "
+            "một danh sách. Nếu thiếu một mô hình, nó sẽ được tải xuống vào lần đầu tiên cần "
+            "dùng. Các tài liệu lớn được chia thành những phần nhỏ hơn và được xử lý lần lượt. "
+            "Hệ thống giữ các kết quả mới nhất trong bộ nhớ, vì vậy cùng một yêu cầu sẽ được "
+            "trả lời nhanh hơn nhiều ở lần thứ hai. Các lỗi được ghi vào tệp nhật ký cùng với "
+            "thời gian và tên của yêu cầu. Vui lòng kiểm tra cài đặt trước khi cài đặt phiên "
+            "bản mới của ứng dụng.",
+        ),
+    },
+    CYRILLIC: {
+        'ru': (
+            "Собака спит в доме моих родителей. Дети играют в парке каждый день после школы. Я "
+            "не знаю, что делать с этой проблемой, но думаю, что завтра мы найдём решение. "
+            "Город очень тихий ночью, и улицы пустые. Где мои ключи? Она сказала, что пришла "
+            "рано, хотя никто не видел, как она вошла. Мы хотим выучить русский язык, потому "
+            "что это очень красивый и полезный язык для работы. Это было лучшее и одновременно "
+            "худшее время, говорили люди, которые там жили. Доброе утро, как дела? Спасибо, "
+            "всё хорошо. Мы давно не виделись, поэтому приятно встретиться снова. Вчера мы "
+            "ходили на рынок, чтобы купить хлеб, сыр и овощи. Было холодно, поэтому мы пили "
+            "горячий чай в маленьком кафе. Моя сестра каждую неделю читает книгу и пишет "
+            "письма своей старой учительнице. Сколько это стоит? Для меня это слишком дорого, "
+            "но мои друзья купили два.",
+            "Эта программа анализирует строение предложений и показывает результаты в виде "
+            "схемы. Введите предложение, выберите язык и нажмите кнопку, чтобы начать анализ. "
+            "Сервер обрабатывает текст, находит слова и связи между ними и отправляет данные "
+            "обратно в виде списка. Если модели не хватает, она загружается в первый раз, "
+            "когда становится нужна. Большие документы делятся на более мелкие части, которые "
+            "обрабатываются одна за другой. Система хранит последние результаты в памяти, "
+            "поэтому на тот же запрос во второй раз приходит ответ гораздо быстрее. Ошибки "
+            "записываются в файл журнала вместе со временем и названием запроса. Пожалуйста, "
+            "проверьте настройки перед установкой новой версии приложения.",
+        ),
+        'uk': (
+            "Собака спить у будинку моїх батьків. Діти граються в парку щодня після школи. Я "
+            "не знаю, що робити з цією проблемою, але думаю, що завтра ми знайдемо рішення. "
+            "Місто дуже тихе вночі, і вулиці порожні. Де мої ключі? Вона сказала, що прийшла "
+            "рано, хоча ніхто не бачив, як вона увійшла. Ми хочемо вивчити українську мову, "
+            "тому що це дуже гарна і корисна мова для роботи. Це був найкращий і водночас "
+            "найгірший час, казали люди, які там жили. Доброго ранку, як справи? Дякую, все "
+            "добре. Ми давно не бачилися, тому приємно зустрітися знову. Учора ми ходили на "
+            "ринок, щоб купити хліб, сир і овочі. Було холодно, тому ми пили гарячий чай у "
+            "маленькому кафе. Моя сестра щотижня читає книжку і пише листи своїй старій "
+            "вчительці. Скільки це коштує? Для мене це занадто дорого, але мої друзі купили "
+            "два.",
+            "Ця програма аналізує будову речень і показує результати у вигляді схеми. Введіть "
+            "речення, виберіть мову та натисніть кнопку, щоб почати аналіз. Сервер обробляє "
+            "текст, знаходить слова та зв'язки між ними і надсилає дані назад у вигляді "
+            "списку. Якщо моделі бракує, вона завантажується першого разу, коли стає "
+            "потрібною. Великі документи поділяються на менші частини, які обробляються одна "
+            "за одною. Система зберігає останні результати в пам'яті, тому на той самий запит "
+            "удруге надходить відповідь набагато швидше. Помилки записуються до файлу журналу "
+            "разом із часом і назвою запиту. Будь ласка, перевірте налаштування перед "
+            "встановленням нової версії застосунку.",
+        ),
+    },
+    ARABIC: {
+        'ar': (
+            "ينام الكلب في بيت والدي. يلعب الأطفال في الحديقة كل يوم بعد المدرسة. لا أعرف ماذا "
+            "أفعل بهذه المشكلة، لكنني أعتقد أننا سنجد حلا غدا. المدينة هادئة جدا في الليل "
+            "والشوارع فارغة. أين مفاتيحي؟ قالت إنها وصلت مبكرا، مع أن أحدا لم يرها تدخل. نريد "
+            "أن نتعلم اللغة العربية لأنها لغة جميلة جدا ومفيدة للعمل. كان ذلك أفضل الأوقات "
+            "وأسوأها في الوقت نفسه، كما قال الناس الذين عاشوا هناك. ذهبنا أمس إلى السوق لشراء "
+            "الخبز والجبن والخضروات. كان الجو باردا، فشربنا الشاي الساخن في مقهى صغير. تقرأ "
+            "أختي كتابا كل أسبوع وتكتب رسائل إلى معلمتها القديمة. كم ثمن هذا؟ إنه غال جدا "
+            "بالنسبة لي، لكن أصدقائي اشتروا اثنين.",
+            "يحلل هذا البرنامج بنية الجمل ويعرض النتائج في مخطط. اكتب جملة واختر لغة واضغط على "
+            "الزر لبدء التحليل. يعالج الخادم النص ويجد الكلمات والعلاقات بينها ثم يرسل "
+            "البيانات على شكل قائمة. إذا كان أحد النماذج مفقودا فإنه ينزل في أول مرة يحتاج "
+            "إليه فيها. تقسم المستندات الكبيرة إلى أجزاء أصغر تعالج واحدا بعد الآخر. يحتفظ "
+            "النظام بآخر النتائج في الذاكرة، لذلك يجاب عن الطلب نفسه بسرعة أكبر بكثير في المرة "
+            "الثانية. تكتب الأخطاء في ملف السجل مع الوقت واسم الطلب. يرجى التحقق من الإعدادات "
+            "قبل تثبيت إصدار جديد من التطبيق.",
+        ),
+        'fa': (
+            "سگ در خانه پدر و مادرم خوابیده است. بچه‌ها هر روز بعد از مدرسه در پارک بازی "
+            "می‌کنند. نمی‌دانم با این مشکل چه کار کنم، اما فکر می‌کنم فردا راه حلی پیدا خواهیم "
+            "کرد. شهر در شب خیلی آرام است و خیابان‌ها خالی هستند. کلیدهای من کجا هستند؟ او گفت "
+            "که زود رسیده است، هرچند کسی ندید که وارد شود. ما می‌خواهیم فارسی یاد بگیریم چون "
+            "زبان بسیار زیبا و مفیدی برای کار است. مردمی که آنجا زندگی می‌کردند می‌گفتند آن "
+            "بهترین و در عین حال بدترین دوران بود. دیروز برای خرید نان، پنیر و سبزیجات به "
+            "بازار رفتیم. هوا سرد بود، بنابراین در یک کافه کوچک چای داغ نوشیدیم. خواهرم هر "
+            "هفته یک کتاب می‌خواند و برای معلم قدیمی‌اش نامه می‌نویسد. این چند است؟ برای من "
+            "خیلی گران است، اما دوستانم دو تا خریدند.",
+            "این برنامه ساختار جمله‌ها را تحلیل می‌کند و نتایج را در یک نمودار نشان می‌دهد. یک "
+            "جمله بنویسید، یک زبان انتخاب کنید و برای شروع تحلیل دکمه را فشار دهید. سرور متن "
+            "را پردازش می‌کند، واژه‌ها و رابطه‌های میان آن‌ها را پیدا می‌کند و داده‌ها را به "
+            "صورت یک فهرست برمی‌گرداند. اگر مدلی وجود نداشته باشد، نخستین باری که لازم شود "
+            "دانلود می‌شود. سندهای بزرگ به بخش‌های کوچک‌تری تقسیم می‌شوند که یکی پس از دیگری "
+            "پردازش می‌شوند. سیستم آخرین نتایج را در حافظه نگه می‌دارد، بنابراین همان درخواست "
+            "بار دوم خیلی سریع‌تر پاسخ داده می‌شود. خطاها همراه با زمان و نام درخواست در فایل "
+            "گزارش نوشته می‌شوند. لطفا پیش از نصب نسخه تازه برنامه، تنظیمات را بررسی کنید.",
+        ),
+    },
+}
+
+# Fallback when the text has no recognizable letters, and for Latin script
+# text whose trigram vote is too weak
+DEFAULT_LANGUAGE = 'en'
+
+# Trigram votes need this posterior, and this lead over the runner-up, to
+# override the script's default language
+MIN_POSTERIOR = 0.7
+MIN_MARGIN = 0.4
+
+# Prior weight of the default language against each other language of its
+# script: technical English is full of Latinate words that look French or
+# Italian to a model trained on a few paragraphs
+DEFAULT_PRIOR = 10.0
+
+# Paragraph breaks, sentence-ending punctuation followed by whitespace, and
+# CJK full stops (which need no whitespace after them)
+SEGMENT_BREAK = re.compile(r'\n\s*\n|(?<=[.!?])\s+|(?<=[。！？])\s*')
+
+
+class Detection(NamedTuple):
+    language: str
+    confidence: float
+    script: Optional[str]
+
+
+class TrigramVote(NamedTuple):
+    """Outcome of a TrigramModel classification"""
+    language: str
+    posterior: float
+    # Posterior lead over the runner-up language
+    margin: float
+    # Trigrams known to the model, i.e. that contributed evidence
+    evidence: int
+    posteriors: Dict[str, float]
+
+
+class Segment(NamedTuple):
+    """A [start, end) span of the input in a single language"""
+    start: int
+    end: int
+    language: str
+    confidence: float
+
+
+def script_of(char: str) -> Optional[str]:
+    """Script of a single character, or None outside the known ranges"""
+    codepoint = ord(char)
+    index = bisect.bisect_right(_RANGE_STARTS, codepoint) - 1
+    if index >= 0:
+        start, end, script = SCRIPT_RANGES[index]
+        if codepoint <= end:
+            return script
+    return None
+
+
+def trigrams(letters: str) -> Counter:
+    """Character trigrams of a space-separated letter stream, padded at word edges"""
+    padded = f' {letters} '
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def normalize_letters(text: str) -> str:
+    """Lowercased letters with everything else collapsed to single spaces"""
+    # Lowercasing İ leaves a combining dot that would otherwise split the word
+    lowered = text.lower().replace('\u0307', '')
+    return ' '.join(''.join(char if char.isalpha() else ' ' for char in lowered).split())
+
+
+def _opens(char: str) -> bool:
+    """Whether char can open a quotation or parenthetical"""
+    return char in '"\'' or unicodedata.category(char) in ('Ps', 'Pi')
+
+
+class TrigramModel:
+    """Naive Bayes over character trigrams for languages sharing a script"""
+
+    def __init__(self, samples: Dict[str, Sequence[str]], smoothing: float = 0.5,
+                 temperature: float = 2.0, priors: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            samples: language -> sample paragraphs
+            smoothing: Additive smoothing for trigrams missing from a sample
+            temperature: Divides the log-likelihoods before normalizing; overlapping
+                trigrams are not independent, so raw naive Bayes is overconfident
+            priors: Relative prior weight per language (default 1)
+        """
+        self.languages = list(samples)
+        self.temperature = temperature
+        self.priors = [(priors or {}).get(language, 1.0) for language in self.languages]
+        profiles = [trigrams(normalize_letters(' '.join(paragraphs))) for paragraphs in samples.values()]
+        vocabulary = len(set().union(*profiles)) + 1
+
+        # trigram -> log probability under each language, in self.languages order
+        self.log_probs: Dict[str, Tuple[float, ...]] = {}
+        denominators = [sum(profile.values()) + smoothing * vocabulary for profile in profiles]
+        for trigram in set().union(*profiles):
+            self.log_probs[trigram] = tuple(
+                math.log((profile[trigram] + smoothing) / denominator)
+                for profile, denominator in zip(profiles, denominators)
+            )
+
+    def classify(self, letters: str) -> TrigramVote:
+        """
+        Most likely language for a letter stream, with its posterior, its
+        lead over the runner-up and the number of trigrams behind the vote
+
+        Trigrams absent from every sample carry no evidence and are skipped,
+        which also keeps words in other scripts from skewing the scores.
+        """
+        scores = [0.0] * len(self.languages)
+        evidence = 0
+        for trigram, count in trigrams(letters).items():
+            log_probs = self.log_probs.get(trigram)
+            if log_probs is None:
+                continue
+            evidence += count
+            for index, log_prob in enumerate(log_probs):
+                scores[index] += log_prob * count
+
+        best = max(scores)
+        weights = [math.exp((score - best) / self.temperature) * prior
+                   for score, prior in zip(scores, self.priors)]
+        total = sum(weights)
+        posteriors = dict(sorted(
+            ((language, weight / total) for language, weight in zip(self.languages, weights)),
+            key=lambda item: item[1], reverse=True
+        ))
+        ranked = list(posteriors.items())
+        language, posterior = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        return TrigramVote(language, posterior, posterior - runner_up, evidence, posteriors)
+
+
+class LanguageDetector:
+    """Single-pass script detection with trigram disambiguation"""
+
+    def __init__(self, max_chars: int = 1000,
+                 samples: Dict[str, Dict[str, Sequence[str]]] = TRIGRAM_SAMPLES,
+                 default: str = DEFAULT_LANGUAGE,
+                 min_trigrams: int = 6, min_posterior: float = MIN_POSTERIOR,
+                 min_margin: float = MIN_MARGIN, default_prior: float = DEFAULT_PRIOR):
+        """
+        Args:
+            max_chars: Only this many leading characters of a text are examined
+            samples: script -> language -> sample paragraphs for the trigram models
+            default: Language returned when no letters are recognized
+            min_trigrams: Known trigrams needed before the trigram model decides
+            min_posterior: Posterior the trigram model's choice needs
+            min_margin: Lead over the runner-up the trigram model's choice needs;
+                unless all three thresholds are met, the script's default
+                language is returned instead
+            default_prior: Prior weight of default in the trigram model of its script
+        """
+        self.max_chars = max_chars
+        self.default = default
+        self.min_trigrams = min_trigrams
+        self.min_posterior = min_posterior
+        self.min_margin = min_margin
+        self.models = {
+            script: TrigramModel(by_language, priors={default: default_prior})
+            for script, by_language in samples.items()
+        }
+        # default where the script can write it, otherwise the script's first sample language
+        self.script_defaults = {
+            script: default if default in by_language else next(iter(by_language))
+            for script, by_language in samples.items()
+        }
+
+    def detect(self, text: str) -> Detection:
+        """Detect the language of text, with a confidence between 0 and 1"""
+        sample = unicodedata.normalize('NFC', text[:self.max_chars])
+
+        counts: Dict[str, int] = {}
+        letters: List[str] = []
+        for char in sample:
+            script = script_of(char)
+            if script is not None:
+                counts[script] = counts.get(script, 0) + 1
+            letters.append(char if script in self.models else ' ')
+
+        if not counts:
+            return Detection(self.default, 0.0, None)
+
+        if KANA in counts:
+            # Kana marks Japanese even when Han characters outnumber it
+            script, in_script = KANA, counts[KANA] + counts.get(HAN, 0)
+        else:
+            script = max(counts, key=counts.__getitem__)
+            in_script = counts[script]
+        share = in_script / sum(counts.values())
+
+        model = self.models.get(script)
+        if model is None:
+            return Detection(SCRIPT_LANGUAGES[script], round(share, 4), script)
+
+        vote = model.classify(normalize_letters(''.join(letters)))
+        language, posterior = vote.language, vote.posterior
+        if (vote.evidence < self.min_trigrams or vote.posterior < self.min_posterior
+                or vote.margin < self.min_margin):
+            # Too little or too ambiguous evidence to tell related languages
+            # apart ("OK.", "Data processing pipeline"): loading the wrong
+            # language's pipeline costs more than defaulting
+            language = self.script_defaults[script]
+            posterior = min(vote.posteriors.get(language, 0.0), vote.evidence / (2 * self.min_trigrams),
+                            self.min_posterior)
+        return Detection(language, round(share * posterior, 4), script)
+
+    def segments(self, text: str, min_run_chars: int = 12,
+                 min_confidence: float = 0.5) -> List[Segment]:
+        """
+        Split text into consecutive single-language segments
+
+        The text is cut at sentence boundaries and wherever the script
+        changes (e.g. an Arabic quotation inside English). Minority-script
+        runs without letters, or holding a single word shorter than
+        min_run_chars, are kept with the majority, so stray names and
+        abbreviations do not become segments of their own; a phrase of
+        several words in another script always does, together with the
+        quotes or brackets around it. Each piece is detected separately; a
+        piece detected with less than min_confidence takes the language of
+        a neighbour in the same script, and neighbours in the same language
+        are merged.
+        """
+        pieces: List[Tuple[int, int, Detection]] = []
+        sentence_start = 0
+        for boundary in [*SEGMENT_BREAK.finditer(text), None]:
+            sentence_end = boundary.start() if boundary else len(text)
+            for start, end in self._script_runs(text, sentence_start, sentence_end, min_run_chars):
+                pieces.append((start, end, self.detect(text[start:end])))
+            if boundary:
+                sentence_start = boundary.end()
+
+        segments: List[Segment] = []
+        for index, (start, end, detection) in enumerate(pieces):
+            language = detection.language
+            if detection.confidence < min_confidence:
+                neighbours = [pieces[index - 1][2]] if index else []
+                neighbours += [piece[2] for piece in pieces[index + 1:index + 2]]
+                for neighbour in neighbours:
+                    if neighbour.script == detection.script and neighbour.confidence >= min_confidence:
+                        language = neighbour.language
+                        break
+
+            if segments and segments[-1].language == language:
+                # Merged confidence is the length-weighted mean of the pieces
+                previous = segments[-1]
+                weighted = (previous.confidence * (previous.end - previous.start)
+                            + detection.confidence * (end - start))
+                segments[-1] = Segment(previous.start, end, language,
+                                       round(weighted / (end - previous.start), 4))
+            else:
+                segments.append(Segment(start, end, language, detection.confidence))
+        return segments
+
+    @staticmethod
+    def _script_runs(text: str, start: int, end: int, min_run_chars: int) -> List[Tuple[int, int]]:
+        """[start, end) spans of text[start:end] that stay in one script"""
+        # [start, end, script]; characters outside every script join the current run
+        runs: List[list] = []
+        for index in range(start, end):
+            script = script_of(text[index])
+            if runs and (script is None or script == runs[-1][2]):
+                continue
+            if runs and runs[-1][2] is None:
+                runs[-1][2] = script
+                continue
+            if runs:
+                runs[-1][1] = index
+            runs.append([index, end, script])
+        if not runs or not text[start:end].strip():
+            return []
+
+        # Punctuation touching a run's first letter (an opening quote or
+        # bracket) moves into that run; closing punctuation and whitespace
+        # already stay with the run before them
+        for previous, run in zip(runs, runs[1:]):
+            boundary = run[0]
+            while (boundary > previous[0] and not text[boundary - 1].isspace()
+                   and script_of(text[boundary - 1]) is None):
+                boundary -= 1
+            if not text[boundary - 1].isspace():
+                # No space between the runs ('said:"...'): only opening marks move
+                boundary = run[0]
+                while boundary > previous[0] and _opens(text[boundary - 1]):
+                    boundary -= 1
+            previous[1] = run[0] = boundary
+
+        # Runs outside the sentence's main script may be absorbed into it
+        lengths: Dict[Optional[str], int] = {}
+        for run_start, run_end, script in runs:
+            lengths[script] = lengths.get(script, 0) + run_end - run_start
+        dominant = max(lengths, key=lengths.__getitem__)
+
+        merged: List[list] = []
+        for run_start, run_end, script in runs:
+            if script != dominant:
+                content = text[run_start:run_end].split()
+                # Letterless runs, and lone short words such as a name, stay with the sentence
+                if script is None or (len(content) == 1 and len(content[0]) < min_run_chars):
+                    script = dominant
+            if merged and merged[-1][2] == script:
+                merged[-1][1] = run_end
+            else:
+                merged.append([run_start, run_end, script])
+        return [(run_start, run_end) for run_start, run_end, _ in merged]
@@ -0,0 +1,107 @@
+"""
+Dynamic micro-batching of concurrent single-item requests
+
+Many clients send one sentence per request. MicroBatcher coalesces items for
+the same key (language) that arrive within a short window, or until a batch
+is full, into one call of the batch function, then fans the results back out
+to the waiting callers. Each request pays at most the window in added
+latency, while the pipeline sees far fewer, larger calls under load.
+
+The first caller for a key becomes the batch leader: it waits out the window
+and then runs the batch on its own thread, so no background threads are
+needed.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class _Batch:
+    def __init__(self):
+        self.items: List[Any] = []
+        self.futures: List[Future] = []
+        self.closed = threading.Event()
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests per key into batched calls"""
+
+    def __init__(self, run_batch: Callable[[List[Any], Hashable], List[Any]],
+                 window_ms: float = 0, max_batch_size: int = 32):
+        """
+        Args:
+            run_batch: Called as run_batch(items, key); returns one result per item
+            window_ms: How long the first request waits for companions (0 disables batching)
+            max_batch_size: A batch is dispatched as soon as it holds this many items
+        """
+        self.run_batch = run_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._open: Dict[Hashable, _Batch] = {}
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_batch_size > 1
+
+    def run(self, key: Hashable, item: Any) -> Any:
+        """
+        Process item as part of the next batch for key and return its result
+
+        Exceptions raised by run_batch are re-raised in every caller of the batch.
+        """
+        future: Future = Future()
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            batch.items.append(item)
+            batch.futures.append(future)
+            if len(batch.items) >= self.max_batch_size:
+                self._close(key, batch)
+
+        if leader:
+            batch.closed.wait(self.window)
+            with self._lock:
+                self._close(key, batch)
+            self._execute(key, batch)
+
+        return future.result()
+
+    def _close(self, key: Hashable, batch: _Batch) -> None:
+        """Stop batch from accepting items (lock held)"""
+        if self._open.get(key) is batch:
+            del self._open[key]
+        batch.closed.set()
+
+    def _execute(self, key: Hashable, batch: _Batch) -> None:
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch.items)
+            self.largest_batch = max(self.largest_batch, len(batch.items))
+        try:
+            results = self.run_batch(batch.items, key)
+        except BaseException as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Batch size counters for health reporting"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'window_ms': self.window * 1000.0,
+                'max_batch_size': self.max_batch_size,
+                'batches': self.batches,
+                'items': self.items,
+                'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+            }
@@ -1,25 +1,65 @@
 """
-NLP Backend for Diagrammatic - Sentence Diagramming with spaCy and Stanza
+NLP Backend for Diagrammatic - Sentence Diagramming with Stanza
 Supports 20+ languages with dependency parsing, POS tagging, and morphological analysis
+
+Stanza (and torch with it) is only imported when the first pipeline is
+needed, so the server answers /api/health and /api/languages right away.
 """
 
-from flask import Flask, request, jsonify
+from startup import StartupTimer
+
+# Created before the remaining imports so that they are timed too
+startup = StartupTimer()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import spacy
-from spacy.language import Language
-import stanza
+import argparse
+import functools
+import importlib.metadata
 import logging
-from typing import Dict, List, Optional
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
 import json
-from quantum_grammar_parser import parse_quantum_grammar
+from quantum_grammar_parser import QuantumGrammarParser, parse_quantum_grammar
+from pipeline_cache import PipelineCache
+from result_cache import ResultCache, make_key
+from preload import PipelinePreloader
+from micro_batcher import MicroBatcher
+from response_format import (
+    JSON, UnsupportedFormatError, encode, install_json_provider, negotiate_format, to_columnar
+)
+from http_caching import install_compression, make_etag, not_modified, tag_response
+from language_detection import LanguageDetector
+from edit_sessions import SessionStore, diff_segments
+from jobs import ACTIVE_STATES, DONE, JobManager, JobStore
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from profiler import SamplingProfiler
+from inference_pool import InferencePool, InferenceTimeoutError, QueueFullError, WorkerCrashedError
+from setup_nlp import LANGUAGES as DEFAULT_PRELOAD_LANGUAGES
+
+if TYPE_CHECKING:
+    import stanza
+
+startup.mark('imports')
 
 app = Flask(__name__)
+install_json_provider(app)
+# Compress JSON/MessagePack responses of at least this many bytes (0 disables)
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+if COMPRESSION_MIN_BYTES > 0:
+    install_compression(app, min_bytes=COMPRESSION_MIN_BYTES)
 # Enable CORS for frontend development
 CORS(app, resources={
     r"/api/*": {
         "origins": ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:3000"],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "methods": ["GET", "POST", "DELETE", "OPTIONS"],
+        "allow_headers": ["Content-Type", "If-None-Match"],
+        "expose_headers": ["ETag", "Location"]
     }
 })
 
@@ -27,9 +67,56 @@ CORS(app, resources={
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global cache for loaded models
-models_cache: Dict[str, Language] = {}
-stanza_pipelines: Dict[str, stanza.Pipeline] = {}
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# Latency histograms and counters served by /api/metrics
+metrics = MetricsRegistry(enabled=env_flag('METRICS_ENABLED', True))
+request_seconds = metrics.histogram(
+    'diagrammatic_request_duration_seconds', 'Time to produce a response',
+    ('endpoint', 'method', 'status')
+)
+stage_seconds = metrics.histogram(
+    'diagrammatic_stage_duration_seconds',
+    'Time spent per processing stage (model_load, Stanza processors, serialize, encode, ...)',
+    ('stage', 'language')
+)
+stanza_texts = metrics.counter(
+    'diagrammatic_stanza_texts_total', 'Texts run through Stanza', ('language', 'processors')
+)
+
+# Sampling profiler behind /api/profiler, only reachable with PROFILER_ENABLED
+PROFILER_ENABLED = env_flag('PROFILER_ENABLED')
+profiler = SamplingProfiler(max_seconds=float(os.environ.get('PROFILER_MAX_SECONDS', '60')))
+
+# Stanza annotation layers, in pipeline order; each layer needs all the ones before it
+STANZA_PROCESSOR_ORDER = ('tokenize', 'pos', 'lemma', 'depparse')
+
+# Default (full) set of layers built for every pipeline
+STANZA_PROCESSORS = ','.join(STANZA_PROCESSOR_ORDER)
+
+# Stanza pipelines keyed by (language, processors)
+stanza_pipelines = PipelineCache(
+    max_pipelines=int(os.environ.get('PIPELINE_CACHE_MAX_PIPELINES', '8')),
+    max_rss_mb=float(os.environ.get('PIPELINE_CACHE_MAX_RSS_MB', '0')),
+    pinned=[(code.strip(), STANZA_PROCESSORS)
+            for code in os.environ.get('PIPELINE_CACHE_PINNED', '').split(',') if code.strip()]
+)
+
+# Cache of parse results keyed on text, language, processors and model version
+result_cache = ResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', '86400')),
+    disk_path=os.environ.get('RESULT_CACHE_PATH') or None,
+    disk_max_entries=int(os.environ.get('RESULT_CACHE_DISK_MAX_ENTRIES', '100000')),
+    max_bytes=int(float(os.environ.get('RESULT_CACHE_MAX_MB', '256')) * 1024 * 1024)
+)
 
 # Language codes supported by Stanza (more comprehensive)
 SUPPORTED_LANGUAGES = {
@@ -59,99 +146,704 @@ SUPPORTED_LANGUAGES = {
     'he': 'Hebrew',
 }
 
+# Upper bound on the number of texts accepted by /api/parse-batch
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '512'))
+
+# Maximum characters handed to Stanza at once by /api/parse-stream
+STREAM_CHUNK_CHARS = int(os.environ.get('STREAM_CHUNK_CHARS', '2000'))
+
+# Sentence parsed once per preloaded pipeline to warm it up
+WARMUP_TEXT = 'The quick brown fox jumps over the lazy dog.'
+
+
+class UnsupportedProcessorsError(Exception):
+    """The requested Stanza processors are unknown"""
+
 
-def load_stanza_pipeline(language_code: str) -> stanza.Pipeline:
+def resolve_processors(requested: Union[str, List[str], None]) -> str:
     """
-    Load or retrieve Stanza pipeline from cache
+    Normalize requested annotation layers into a canonical processors string
+
+    Accepts "tokenize,pos" or ["tokenize", "pos"]; layers the requested ones
+    depend on are added, so "lemma" becomes "tokenize,pos,lemma".
+
+    Raises:
+        UnsupportedProcessorsError: An unknown processor name, or a value
+            that is neither a string nor a list
     """
-    if language_code not in stanza_pipelines:
-        logger.info(f"Loading Stanza pipeline for {language_code}")
-        try:
-            stanza_pipelines[language_code] = stanza.Pipeline(
+    if requested is not None and not isinstance(requested, (str, list)):
+        raise UnsupportedProcessorsError('processors must be a comma-separated string or a list')
+    if not requested:
+        return STANZA_PROCESSORS
+    names = requested.split(',') if isinstance(requested, str) else requested
+    names = {str(name).strip().lower() for name in names} - {''}
+
+    unknown = names - set(STANZA_PROCESSOR_ORDER)
+    if unknown:
+        raise UnsupportedProcessorsError(
+            f"Unknown processors {', '.join(sorted(unknown))}; "
+            f"choose from {', '.join(STANZA_PROCESSOR_ORDER)}"
+        )
+    deepest = max((STANZA_PROCESSOR_ORDER.index(name) for name in names), default=0)
+    return ','.join(STANZA_PROCESSOR_ORDER[:deepest + 1])
+
+
+@functools.lru_cache(maxsize=None)
+def import_stanza():
+    """Import Stanza on first use; the time it takes is reported as deferred startup"""
+    with startup.defer('import_stanza'):
+        import stanza
+    return stanza
+
+
+@functools.lru_cache(maxsize=None)
+def stanza_version() -> str:
+    """Installed Stanza version, read from package metadata to avoid importing it"""
+    try:
+        return importlib.metadata.version('stanza')
+    except importlib.metadata.PackageNotFoundError:
+        return import_stanza().__version__
+
+
+def build_stanza_pipeline(language_code: str, processors: str = STANZA_PROCESSORS) -> 'stanza.Pipeline':
+    """
+    Construct a new Stanza pipeline (slow; use load_stanza_pipeline instead)
+    """
+    stanza = import_stanza()
+    logger.info(f"Loading Stanza pipeline for {language_code} ({processors})")
+    try:
+        with stage_seconds.time(stage='model_load', language=language_code):
+            pipeline = stanza.Pipeline(
                 lang=language_code,
-                processors='tokenize,pos,lemma,depparse',
+                processors=processors,
                 use_gpu=False
             )
-        except Exception as e:
-            logger.error(f"Failed to load Stanza pipeline for {language_code}: {e}")
-            raise
-    return stanza_pipelines[language_code]
+    except Exception as e:
+        logger.error(f"Failed to load Stanza pipeline for {language_code}: {e}")
+        raise
+    instrument_processors(pipeline, language_code)
+    return pipeline
+
+
+# Stages being timed on the current thread, so nested calls are counted once
+_active_stages = threading.local()
+
+
+def _timed_stage(function, stage: str, language_code: str):
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        active = getattr(_active_stages, 'names', None)
+        if active is None:
+            active = _active_stages.names = set()
+        if stage in active:
+            return function(*args, **kwargs)
+        active.add(stage)
+        try:
+            with stage_seconds.time(stage=stage, language=language_code):
+                return function(*args, **kwargs)
+        finally:
+            active.discard(stage)
+    return timed
+
+
+def instrument_processors(pipeline: 'stanza.Pipeline', language_code: str) -> None:
+    """
+    Record the time spent in each processor of pipeline (tokenize, pos, ...)
+    under its own stage name
+    """
+    processors = getattr(pipeline, 'processors', None)
+    if not metrics.enabled or not isinstance(processors, dict):
+        return
+    for name, processor in processors.items():
+        # bulk_process may call process on the same processor; the guard in
+        # _timed_stage keeps that from being counted twice
+        for method in ('process', 'bulk_process'):
+            original = getattr(processor, method, None)
+            if original is not None:
+                setattr(processor, method, _timed_stage(original, name, language_code))
+
+
+def stanza_pipeline_key(language_code: str, processors: str = STANZA_PROCESSORS) -> Tuple[str, str]:
+    """
+    Cache key of the pipeline that should serve processors for a language
+
+    A resident pipeline with a superset of the layers is shared (Stanza runs
+    only the requested processors on it), so a POS-only request reuses the
+    full pipeline when that is loaded instead of building a second copy of
+    the tokenizer and tagger. Otherwise the smallest variant is built.
+    """
+    key = (language_code, processors)
+    if key in stanza_pipelines:
+        return key
+    needed = set(processors.split(','))
+    for candidate in reversed(stanza_pipelines.keys()):
+        if candidate[0] == language_code and needed <= set(candidate[1].split(',')):
+            return candidate
+    return key
+
+
+def load_stanza_pipeline(language_code: str, processors: str = STANZA_PROCESSORS) -> 'stanza.Pipeline':
+    """
+    Load or retrieve Stanza pipeline from cache
+
+    Concurrent first requests for a language share a single load.
+    """
+    key = (language_code, processors)
+    return stanza_pipelines.get(key, lambda: build_stanza_pipeline(*key))
+
+
+def use_stanza_pipeline(key: Tuple[str, str]):
+    """
+    Context manager yielding the cached pipeline for a stanza_pipeline_key,
+    with exclusive use for inference
+    """
+    return stanza_pipelines.use(key, lambda: build_stanza_pipeline(*key))
+
+
+def check_warmup_results(results: List[Dict], language_code: str) -> None:
+    """
+    Raise if a warmup parse failed
+
+    parse_texts_with_stanza reports errors (a missing or corrupt model) as
+    results with success false rather than raising, so the preloader would
+    otherwise mark the language ready.
+    """
+    for result in results:
+        if not result.get('success'):
+            raise RuntimeError(f"Stanza pipeline for {language_code} failed: {result.get('error')}")
+
+
+def preload_stanza_pipeline(language_code: str) -> None:
+    """
+    Load the pipeline wherever inference for the language runs
+    """
+    if inference_pool.enabled:
+        # Loading happens inside the worker that owns the language
+        check_warmup_results(
+            inference_pool.run(language_code, [WARMUP_TEXT], language_code, timeout=None), language_code
+        )
+    else:
+        load_stanza_pipeline(language_code)
+
+
+def warmup_stanza_pipeline(language_code: str) -> None:
+    """
+    Run a warmup sentence through the pipeline so the first real request is fast
+    """
+    check_warmup_results(run_stanza([WARMUP_TEXT], language_code), language_code)
+
+
+preloader = PipelinePreloader(
+    load=preload_stanza_pipeline,
+    warmup=warmup_stanza_pipeline,
+    max_workers=int(os.environ.get('PRELOAD_WORKERS', '4'))
+)
+
+
+def preload_languages(languages: Optional[List[str]] = None) -> List[str]:
+    """
+    Resolve and pin the languages to preload
+
+    Defaults to PRELOAD_LANGUAGES from the environment, or the languages
+    downloaded by setup_nlp.py. Preloaded languages are pinned in the
+    pipeline cache so they stay warm.
+    """
+    if languages is None:
+        configured = os.environ.get('PRELOAD_LANGUAGES', '')
+        languages = [code.strip() for code in configured.split(',') if code.strip()]
+    if not languages:
+        languages = list(DEFAULT_PRELOAD_LANGUAGES)
+
+    unsupported = [code for code in languages if code not in SUPPORTED_LANGUAGES]
+    if unsupported:
+        logger.warning(f"Skipping preload of unsupported languages: {', '.join(unsupported)}")
+    languages = [code for code in languages if code in SUPPORTED_LANGUAGES]
+
+    if stanza_pipelines.max_pipelines and len(languages) > stanza_pipelines.max_pipelines:
+        logger.warning(f"Preloading {len(languages)} languages exceeds "
+                       f"PIPELINE_CACHE_MAX_PIPELINES={stanza_pipelines.max_pipelines}; "
+                       f"pinned pipelines are kept regardless")
+    for code in languages:
+        stanza_pipelines.pin((code, STANZA_PROCESSORS))
+    return languages
+
+
+def start_preload(languages: Optional[List[str]] = None) -> None:
+    """
+    Load and warm pipelines in the background (see preload_languages)
+    """
+    preloader.start(preload_languages(languages))
+
+
+def serialize_document(doc, language_code: str) -> Dict:
+    """
+    Convert a processed Stanza document into the API result structure
+    """
+    tokens = []
+    sentences = []
+
+    for sent in doc.sentences:
+        sent_tokens = []
+        for word in sent.words:
+            token_data = {
+                'id': word.id,
+                'text': word.text,
+                'lemma': word.lemma,
+                'pos': word.pos,
+                'xpos': word.xpos,
+                'upos': word.upos,
+                'deprel': word.deprel,
+                'head': word.head,
+                'index': word.id - 1  # 0-based index
+            }
+            sent_tokens.append(token_data)
+            tokens.append(token_data)
+
+        sentences.append({
+            'text': sent.text,
+            'tokens': sent_tokens
+        })
+
+    return {
+        'success': True,
+        'language': language_code,
+        'sentences': sentences,
+        'tokens': tokens,
+        'token_count': len(tokens),
+        'sentence_count': len(sentences)
+    }
+
 
+# Version of the statistics built by document_statistics (tree_analytics). Bump it
+# whenever their shape or values change, so ETags and cached results produced by
+# older code are not served as current
+ANALYTICS_SCHEMA_VERSION = '2'
 
-def parse_with_stanza(text: str, language_code: str) -> Dict:
+
+def stanza_cache_key(text: str, language_code: str, processors: str = STANZA_PROCESSORS) -> str:
+    """Result cache key for a Stanza parse"""
+    return make_key('stanza', text, language_code, processors, stanza_version(),
+                    ANALYTICS_SCHEMA_VERSION)
+
+
+def stanza_etag(endpoint: str, text: str, language_code: str, response_format: str,
+                processors: str = STANZA_PROCESSORS) -> str:
+    """ETag for a Stanza-backed response: the cache key inputs plus the response shape"""
+    return make_etag(endpoint, text, language_code, response_format,
+                     processors, stanza_version(), ANALYTICS_SCHEMA_VERSION)
+
+
+def parse_with_stanza(text: str, language_code: str, processors: str = STANZA_PROCESSORS) -> Dict:
     """
     Parse text using Stanza for comprehensive NLP analysis
+
+    Layers not in processors are left as None in the result. Successful
+    results are cached; the returned dict must not be mutated.
+    """
+    return result_cache.get_or_compute(
+        stanza_cache_key(text, language_code, processors),
+        lambda: _parse_with_stanza_uncached(text, language_code, processors)
+    )
+
+
+def _parse_with_stanza_uncached(text: str, language_code: str, processors: str) -> Dict:
+    if micro_batcher.enabled:
+        # Coalesce with concurrent requests for the same pipeline
+        return micro_batcher.run((language_code, processors), text)
+    return run_stanza([text], language_code, processors)[0]
+
+
+def parse_texts_with_stanza(texts: List[str], language_code: str,
+                            processors: str = STANZA_PROCESSORS) -> List[Dict]:
+    """
+    Run Stanza over texts in the current process
+
+    This is also the entry point executed inside inference pool workers.
     """
     try:
-        nlp = load_stanza_pipeline(language_code)
-        doc = nlp(text)
-
-        tokens = []
-        sentences = []
-
-        for sent in doc.sentences:
-            sent_tokens = []
-            for word in sent.words:
-                token_data = {
-                    'id': word.id,
-                    'text': word.text,
-                    'lemma': word.lemma,
-                    'pos': word.pos,
-                    'xpos': word.xpos,
-                    'upos': word.upos,
-                    'deprel': word.deprel,
-                    'head': word.head,
-                    'index': word.id - 1  # 0-based index
-                }
-                sent_tokens.append(token_data)
-                tokens.append(token_data)
-
-            sentences.append({
-                'text': sent.text,
-                'tokens': sent_tokens
-            })
-
-        return {
-            'success': True,
-            'language': language_code,
-            'sentences': sentences,
-            'tokens': tokens,
-            'token_count': len(tokens),
-            'sentence_count': len(sentences)
-        }
+        key = stanza_pipeline_key(language_code, processors)
+        # Only restrict the processors run when sharing a pipeline with extra layers
+        options = {'processors': processors} if key[1] != processors else {}
+        with use_stanza_pipeline(key) as nlp:
+            if len(texts) == 1:
+                docs = [nlp(texts[0], **options)]
+            else:
+                document = import_stanza().Document
+                docs = nlp([document([], text=text) for text in texts], **options)
+        with stage_seconds.time(stage='serialize', language=language_code):
+            return [serialize_document(doc, language_code) for doc in docs]
 
     except Exception as e:
         logger.error(f"Stanza parsing error: {e}")
-        return {
+        return [{
             'success': False,
             'error': str(e),
             'language': language_code
-        }
+        } for _ in texts]
+
+
+# Optional process pool that runs Stanza inference off the request threads
+inference_pool = InferencePool(
+    handler=parse_texts_with_stanza,
+    workers=int(os.environ.get('INFERENCE_WORKERS', '0')),
+    max_queue=int(os.environ.get('INFERENCE_MAX_QUEUE', '32')),
+    timeout=float(os.environ.get('INFERENCE_TIMEOUT', '30'))
+)
+
+
+def run_stanza(texts: List[str], language_code: str,
+               processors: str = STANZA_PROCESSORS) -> List[Dict]:
+    """
+    Parse texts in the inference pool when enabled, otherwise in this thread
+
+    Raises:
+        QueueFullError: The pool worker for the language is saturated
+        InferenceTimeoutError: The pool did not answer within INFERENCE_TIMEOUT
+    """
+    stanza_texts.inc(len(texts), language=language_code, processors=processors)
+    with stage_seconds.time(stage='inference', language=language_code):
+        if inference_pool.enabled:
+            return inference_pool.run(language_code, texts, language_code, processors)
+        return parse_texts_with_stanza(texts, language_code, processors)
+
+
+def _run_stanza_batch(texts: List[str], key: Tuple[str, str]) -> List[Dict]:
+    return run_stanza(texts, *key)
+
+
+# Coalesces concurrent single-text parses into one Stanza call per (language, processors)
+micro_batcher = MicroBatcher(
+    run_batch=_run_stanza_batch,
+    window_ms=float(os.environ.get('MICRO_BATCH_WINDOW_MS', '0')),
+    max_batch_size=int(os.environ.get('MICRO_BATCH_MAX_SIZE', '32'))
+)
+
+
+def parse_batch_with_stanza(texts: List[str], language_code: str,
+                            processors: str = STANZA_PROCESSORS) -> List[Dict]:
+    """
+    Parse several texts of the same language in one bulk Stanza call
+
+    Stanza accepts a list of Documents and batches neural inference across
+    all of them, which is much faster than calling the pipeline per text.
+    Results are returned in input order with the same shape as
+    parse_with_stanza; texts already in the result cache are not re-parsed.
+    """
+    keys = [stanza_cache_key(text, language_code, processors) for text in texts]
+    results: List[Optional[Dict]] = [result_cache.get(key) for key in keys]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    parsed = run_stanza([texts[i] for i in pending], language_code, processors)
+    for i, result in zip(pending, parsed):
+        results[i] = result
+        if result['success']:
+            result_cache.put(keys[i], result)
+
+    return results
+
+
+def cached_parse_quantum_grammar(text: str) -> Dict:
+    """
+    Quantum Grammar parse served from the result cache when possible
+    """
+    return result_cache.get_or_compute(
+        make_key('quantum-grammar', text, QuantumGrammarParser.VERSION),
+        lambda: _parse_quantum_grammar_timed(text)
+    )
+
+
+def _parse_quantum_grammar_timed(text: str) -> Dict:
+    with stage_seconds.time(stage='quantum_grammar', language=''):
+        return parse_quantum_grammar(text)
+
+
+def respond(payload, response_format: str = JSON) -> Response:
+    """Serialize a payload with encode(), recording the time it takes"""
+    with stage_seconds.time(stage='encode', language=''):
+        return encode(payload, response_format)
+
+
+# Paragraph breaks, and sentence-ending punctuation followed by whitespace
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def iter_text_chunks(text: str, max_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Split text into chunks of at most about max_chars for incremental parsing
+
+    Chunks end at paragraph breaks, or at sentence punctuation inside long
+    paragraphs, so Stanza's sentence splitting is unaffected. A single
+    sentence longer than max_chars is kept whole.
+    """
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            yield paragraph
+            continue
+
+        chunk = ''
+        for sentence in SENTENCE_BREAK.split(paragraph):
+            if chunk and len(chunk) + 1 + len(sentence) > max_chars:
+                yield chunk
+                chunk = ''
+            chunk = f'{chunk} {sentence}' if chunk else sentence
+        if chunk:
+            yield chunk
+
+
+# Script and trigram language detector over a bounded prefix of each text
+language_detector = LanguageDetector(
+    max_chars=int(os.environ.get('LANGUAGE_DETECTION_MAX_CHARS', '1000'))
+)
 
 
 def detect_language(text: str) -> str:
     """
-    Simple language detection based on character patterns
-    Returns language code or 'en' as default
-    """
-    # Check for common non-Latin scripts
-    if any('\u0600' <= char <= '\u06FF' for char in text):  # Arabic
-        return 'ar'
-    elif any('\u0400' <= char <= '\u04FF' for char in text):  # Cyrillic (Russian, Ukrainian, etc.)
-        if any('\u0500' <= char <= '\u052F' for char in text):
-            return 'uk'  # Ukrainian
-        return 'ru'
-    elif any('\u4E00' <= char <= '\u9FFF' for char in text):  # Chinese
-        return 'zh'
-    elif any('\u3040' <= char <= '\u309F' or '\u30A0' <= char <= '\u30FF' for char in text):  # Japanese
-        return 'ja'
-    elif any('\u0E00' <= char <= '\u0E7F' for char in text):  # Thai
-        return 'th'
-    elif any('\u0900' <= char <= '\u097F' for char in text):  # Devanagari (Hindi)
-        return 'hi'
-
-    # Default to English for Latin script
-    return 'en'
+    Detect the language of text from its script and character trigrams
+    Returns language code or 'en' when no letters are recognized
+    """
+    return language_detector.detect(text).language
+
+
+# Language value that asks for per-segment detection and routing
+MIXED_LANGUAGE = 'mixed'
+
+
+def request_text(data: Dict) -> Optional[str]:
+    """The request's text field, stripped, or None unless it is a non-empty string"""
+    text = data.get('text')
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return text.strip()
+
+
+def is_supported_language(language, allow_mixed: bool = True) -> bool:
+    """Whether a request's language value names a pipeline (or 'mixed')"""
+    if allow_mixed and language == MIXED_LANGUAGE:
+        return True
+    return isinstance(language, str) and language in SUPPORTED_LANGUAGES
+
+# Runs the language groups of a mixed-language document concurrently
+segment_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('MIXED_PARSE_WORKERS', '4')),
+    thread_name_prefix='mixed-parse'
+)
+
+
+def parse_mixed_with_stanza(text: str, processors: str = STANZA_PROCESSORS) -> Dict:
+    """
+    Parse a document that mixes languages
+
+    The text is cut into single-language segments, segments of the same
+    language are parsed together in one bulk call on that language's
+    pipeline, and the language groups run concurrently. Sentences come back
+    in document order, each tagged with its language; the result's
+    `language` is the one covering the most tokens.
+    """
+    segments = language_detector.segments(text)
+    texts = [text[segment.start:segment.end].strip() for segment in segments]
+
+    groups: Dict[str, List[int]] = {}
+    for position, segment in enumerate(segments):
+        groups.setdefault(segment.language, []).append(position)
+
+    futures = {
+        language: segment_executor.submit(
+            parse_batch_with_stanza, [texts[i] for i in positions], language, processors
+        )
+        for language, positions in groups.items()
+    }
+    results: List[Optional[Dict]] = [None] * len(segments)
+    for language, future in futures.items():
+        for position, result in zip(groups[language], future.result()):
+            results[position] = result
+
+    for result in results:
+        if not result['success']:
+            return {'success': False, 'error': result['error'], 'language': MIXED_LANGUAGE}
+
+    sentences = []
+    tokens = []
+    token_counts: Dict[str, int] = {}
+    segment_summaries = []
+    for segment, result in zip(segments, results):
+        for sentence in result['sentences']:
+            sentences.append({**sentence, 'language': segment.language})
+            tokens.extend(sentence['tokens'])
+        token_counts[segment.language] = token_counts.get(segment.language, 0) + result['token_count']
+        segment_summaries.append({
+            'language': segment.language,
+            'confidence': segment.confidence,
+            'start': segment.start,
+            'end': segment.end,
+            'sentence_count': result['sentence_count']
+        })
+
+    return {
+        'success': True,
+        'language': max(token_counts, key=token_counts.__getitem__),
+        'languages': token_counts,
+        'segments': segment_summaries,
+        'sentences': sentences,
+        'tokens': tokens,
+        'token_count': len(tokens),
+        'sentence_count': len(sentences)
+    }
+
+
+def parse_document(text: str, language_code: str, processors: str = STANZA_PROCESSORS) -> Dict:
+    """Parse text in one language, or per segment when language_code is MIXED_LANGUAGE"""
+    if language_code == MIXED_LANGUAGE:
+        return parse_mixed_with_stanza(text, processors)
+    return parse_with_stanza(text, language_code, processors)
+
+
+# Previous versions of documents being edited, for /api/parse-incremental
+edit_sessions = SessionStore(
+    max_sessions=int(os.environ.get('EDIT_SESSION_MAX', '1000')),
+    ttl=float(os.environ.get('EDIT_SESSION_TTL', '1800'))
+)
+
+
+def split_edit_segments(text: str) -> List[str]:
+    """Sentence-sized pieces of text, the unit that is diffed between edits"""
+    return [
+        sentence.strip()
+        for paragraph in PARAGRAPH_BREAK.split(text)
+        for sentence in SENTENCE_BREAK.split(paragraph)
+        if sentence.strip()
+    ]
+
+
+def parse_edit_segments(texts: List[str], language_code: str,
+                        processors: str = STANZA_PROCESSORS) -> Dict:
+    """
+    Parse edit segments, one bulk call per language
+
+    With MIXED_LANGUAGE the language of each segment is detected on its own.
+    The result's `segments` hold one {text, language, sentences, token_count}
+    per input text.
+    """
+    if language_code == MIXED_LANGUAGE:
+        languages = [detect_language(text) for text in texts]
+    else:
+        languages = [language_code] * len(texts)
+
+    groups: Dict[str, List[int]] = {}
+    for position, language in enumerate(languages):
+        groups.setdefault(language, []).append(position)
+
+    segments: List[Optional[Dict]] = [None] * len(texts)
+    for language, positions in groups.items():
+        results = parse_batch_with_stanza([texts[i] for i in positions], language, processors)
+        for position, result in zip(positions, results):
+            if not result['success']:
+                return result
+            segments[position] = {
+                'text': texts[position],
+                'language': language,
+                'sentences': result['sentences'],
+                'token_count': result['token_count']
+            }
+    return {'success': True, 'segments': segments}
+
+
+# Sentence-sized segments parsed per step of a job. Progress is reported after each
+# step, not per sentence: a step is one batched Stanza call and one job store write
+JOB_BATCH_SEGMENTS = int(os.environ.get('JOB_BATCH_SEGMENTS', '16'))
+
+
+def run_parse_job(payload: Dict, progress) -> Dict:
+    """
+    Parse a long document for /api/jobs, in steps of JOB_BATCH_SEGMENTS segments
+
+    Returns the same {result, statistics} shape as /api/parse-detailed.
+    progress(done, total) counts segments, so done advances by up to
+    JOB_BATCH_SEGMENTS at a time; it raises JobCancelled once the job is
+    cancelled, which stops the parse between steps.
+    """
+    language, processors = payload['language'], payload['processors']
+    texts = split_edit_segments(payload['text'])
+    segments: List[Dict] = []
+    progress(0, len(texts))
+    for start in range(0, len(texts), JOB_BATCH_SEGMENTS):
+        parsed = parse_edit_segments(texts[start:start + JOB_BATCH_SEGMENTS], language, processors)
+        if not parsed['success']:
+            return parsed
+        segments.extend(parsed['segments'])
+        progress(len(segments), len(texts))
+
+    sentences = []
+    token_counts: Dict[str, int] = {}
+    for segment in segments:
+        sentences.extend({**sentence, 'language': segment['language']} for sentence in segment['sentences'])
+        token_counts[segment['language']] = token_counts.get(segment['language'], 0) + segment['token_count']
+    tokens = [token for sentence in sentences for token in sentence['tokens']]
+
+    result = {
+        'success': True,
+        'language': max(token_counts, key=token_counts.__getitem__) if token_counts else language,
+        'sentences': sentences,
+        'tokens': tokens,
+        'token_count': len(tokens),
+        'sentence_count': len(sentences)
+    }
+    if language == MIXED_LANGUAGE:
+        result['languages'] = token_counts
+    return {
+        'result': result,
+        'statistics': document_statistics(sentences, processors)
+    }
+
+
+# Background parses behind /api/jobs, recorded in a local SQLite job store
+job_manager = JobManager(
+    JobStore(
+        path=os.environ.get('JOB_STORE_PATH', 'jobs.sqlite3'),
+        ttl=float(os.environ.get('JOB_TTL', '3600'))
+    ),
+    handler=run_parse_job,
+    workers=int(os.environ.get('JOB_WORKERS', '2'))
+)
+
+
+def job_status(job: Dict) -> Dict:
+    """Public view of a job record"""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'progress': {
+            'done': job['done'],
+            'total': job['total'],
+            'fraction': job['done'] / job['total'] if job['total'] else float(job['status'] == DONE)
+        },
+        'error': job['error'],
+        'created': job['created'],
+        'updated': job['updated']
+    }
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    started = g.pop('request_started', None)
+    if started is not None:
+        request_seconds.observe(
+            time.perf_counter() - started,
+            endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=str(response.status_code)
+        )
+    return response
 
 
 @app.route('/api/health', methods=['GET'])
@@ -160,16 +852,134 @@ def health():
     return jsonify({
         'status': 'ok',
         'version': '1.0.0',
-        'supported_languages': SUPPORTED_LANGUAGES
+        'supported_languages': SUPPORTED_LANGUAGES,
+        'pipeline_cache': stanza_pipelines.stats(),
+        'result_cache': result_cache.stats(),
+        'inference_pool': inference_pool.stats(),
+        'micro_batching': micro_batcher.stats(),
+        'edit_sessions': edit_sessions.stats(),
+        'jobs': job_manager.stats(),
+        'startup': startup.report()
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """
+    Latency histograms and counters in the Prometheus text format
+
+    Values cover this worker process only.
+    """
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+@app.route('/api/profiler', methods=['GET'])
+def profiler_status():
+    """State of the sampling profiler (requires PROFILER_ENABLED)"""
+    if not PROFILER_ENABLED:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    return jsonify(profiler.status())
+
+
+@app.route('/api/profiler/start', methods=['POST'])
+def profiler_start():
+    """
+    Start sampling every thread's stack
+
+    Request body (optional):
+    {
+        "interval_ms": 10  # Positive number, values below 1 are raised to 1
+    }
+    """
+    if not PROFILER_ENABLED:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    interval_ms = data.get('interval_ms')
+    if interval_ms is None:
+        interval_ms = 10.0
+    try:
+        if isinstance(interval_ms, bool):
+            raise TypeError(interval_ms)
+        interval_ms = float(interval_ms)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'interval_ms must be a number'}), 400
+    if not math.isfinite(interval_ms) or interval_ms <= 0:
+        return jsonify({'error': 'interval_ms must be a positive number'}), 400
+    if not profiler.start(interval_ms):
+        return jsonify({'error': 'Profiler is already running', **profiler.status()}), 409
+    return jsonify(profiler.status())
+
+
+@app.route('/api/profiler/stop', methods=['POST'])
+def profiler_stop():
+    """Stop sampling and return the collapsed stacks (flamegraph.pl / speedscope input)"""
+    if not PROFILER_ENABLED:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    profiler.stop()
+    return Response(profiler.collapsed(), mimetype='text/plain')
+
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """
+    Readiness check for load balancers
+
+    Returns 200 once every preloaded pipeline (or the one given by
+    ?language=xx) is loaded and warmed, 503 otherwise.
+    """
+    language = request.args.get('language')
+    is_ready = preloader.is_ready(language)
+    return jsonify({
+        'ready': is_ready,
+        'languages': preloader.status()
+    }), 200 if is_ready else 503
+
+
 @app.route('/api/languages', methods=['GET'])
 def get_languages():
     """Get list of supported languages"""
-    return jsonify({
+    etag = make_etag('languages', json.dumps(SUPPORTED_LANGUAGES, sort_keys=True))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    return tag_response(jsonify({
         'languages': SUPPORTED_LANGUAGES,
         'count': len(SUPPORTED_LANGUAGES)
+    }), etag, cache_control='public, max-age=3600')
+
+
+@app.route('/api/detect-language', methods=['POST'])
+def detect_language_endpoint():
+    """
+    Detect the language of a text without parsing it
+
+    Request body:
+    {
+        "text": "El perro duerme en la casa"
+    }
+
+    Returns the language code, a confidence between 0 and 1 and the script
+    """
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({'error': 'Missing text field'}), 400
+
+    text = data.get('text', '').strip()
+    if not text:
+        return jsonify({'error': 'Text cannot be empty'}), 400
+
+    detection = language_detector.detect(text)
+    return jsonify({
+        'language': detection.language,
+        'name': SUPPORTED_LANGUAGES.get(detection.language),
+        'confidence': detection.confidence,
+        'script': detection.script
     })
 
 
@@ -181,8 +991,12 @@ def parse_sentence():
     Request body:
     {
         "text": "The quick brown fox jumps over the lazy dog",
-        "language": "en"  # Optional, will auto-detect if not provided
+        "language": "en",  # Optional, will auto-detect if not provided
+        "processors": "tokenize,pos"  # Optional, defaults to the full pipeline
     }
+
+    "language": "mixed" detects the language per segment and parses each
+    segment with its own pipeline (see parse_mixed_with_stanza).
     """
     data = request.get_json()
 
@@ -193,25 +1007,187 @@ def parse_sentence():
     if not text:
         return jsonify({'error': 'Text cannot be empty'}), 400
 
+    response_format = negotiate_format(request)
+    processors = resolve_processors(data.get('processors'))
+
     # Auto-detect language if not provided
     language = data.get('language')
     if not language:
         language = detect_language(text)
 
     # Validate language code
-    if language not in SUPPORTED_LANGUAGES:
+    if language != MIXED_LANGUAGE and language not in SUPPORTED_LANGUAGES:
         return jsonify({
             'error': f'Language {language} not supported',
             'supported': list(SUPPORTED_LANGUAGES.keys())
         }), 400
 
+    # Identical requests are answered from the client's copy
+    etag = stanza_etag('parse', text, language, response_format, processors)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     # Parse the text
-    result = parse_with_stanza(text, language)
+    result = parse_document(text, language, processors)
 
     if not result['success']:
         return jsonify(result), 500
 
-    return jsonify(result)
+    if response_format != JSON:
+        result = to_columnar(result)
+    return tag_response(respond(result, response_format), etag)
+
+
+@app.route('/api/parse-batch', methods=['POST'])
+def parse_batch():
+    """
+    Parse many texts in one request, batching Stanza inference per language
+
+    Request body:
+    {
+        "items": [
+            "The quick brown fox jumps over the lazy dog",
+            {"text": "El perro duerme", "language": "es"}
+        ],
+        "language": "en",  # Optional default for items without a language
+        "processors": "tokenize,pos"  # Optional, applies to every item
+    }
+
+    Returns one parse result per item, in the same order as the input
+    """
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('items'), list):
+        return jsonify({'error': 'Missing items field'}), 400
+
+    items = data['items']
+    if not items:
+        return jsonify({'error': 'Items cannot be empty'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({
+            'error': f'Batch too large, maximum is {MAX_BATCH_SIZE} items'
+        }), 400
+
+    default_language = data.get('language')
+    response_format = negotiate_format(request)
+    processors = resolve_processors(data.get('processors'))
+
+    # Group item positions by language so each pipeline runs once
+    groups: Dict[str, List[int]] = {}
+    texts: List[str] = []
+    languages: List[str] = []
+    for position, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'text': item}
+        if not isinstance(item, dict):
+            return jsonify({'error': f'Item {position} must be a string or object'}), 400
+
+        text = item.get('text')
+        if not isinstance(text, str):
+            return jsonify({'error': f'Item {position} text must be a string'}), 400
+        text = text.strip()
+        if not text:
+            return jsonify({'error': f'Item {position} text cannot be empty'}), 400
+
+        language = item.get('language') or default_language or detect_language(text)
+        if not isinstance(language, str) or language not in SUPPORTED_LANGUAGES:
+            return jsonify({
+                'error': f'Item {position}: language {language} not supported',
+                'supported': list(SUPPORTED_LANGUAGES.keys())
+            }), 400
+
+        texts.append(text)
+        languages.append(language)
+        groups.setdefault(language, []).append(position)
+
+    etag = stanza_etag('parse-batch', json.dumps([texts, languages], ensure_ascii=False),
+                       default_language or '', response_format, processors)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    results: List[Optional[Dict]] = [None] * len(texts)
+    for language, positions in groups.items():
+        parsed = parse_batch_with_stanza([texts[i] for i in positions], language, processors)
+        for position, result in zip(positions, parsed):
+            results[position] = result
+
+    if response_format != JSON:
+        results = [to_columnar(result) for result in results]
+
+    return tag_response(respond({
+        'success': all(result['success'] for result in results),
+        'results': results,
+        'count': len(results),
+        'languages': {language: len(positions) for language, positions in groups.items()}
+    }, response_format), etag)
+
+
+@app.route('/api/parse-stream', methods=['POST'])
+def parse_stream():
+    """
+    Parse a long text incrementally, streaming one NDJSON line per sentence
+
+    Request body is the same as /api/parse. The text is parsed chunk by
+    chunk and each sentence is written as soon as its chunk is done:
+
+        {"index": 0, "text": "...", "tokens": [...]}
+        ...
+        {"done": true, "language": "en", "sentence_count": 12, "token_count": 140}
+
+    If a chunk fails, an {"error": ..., "success": false} line ends the stream.
+    Chunks bypass the result cache, so one large upload cannot flush it.
+    """
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({'error': 'Missing text field'}), 400
+
+    text = data.get('text')
+    if not isinstance(text, str):
+        return jsonify({'error': 'Text must be a string'}), 400
+    text = text.strip()
+    if not text:
+        return jsonify({'error': 'Text cannot be empty'}), 400
+
+    language = data.get('language') or detect_language(text)
+    processors = resolve_processors(data.get('processors'))
+
+    if not is_supported_language(language, allow_mixed=False):
+        return jsonify({
+            'error': f'Language {language} not supported',
+            'supported': list(SUPPORTED_LANGUAGES.keys())
+        }), 400
+
+    def generate() -> Iterator[str]:
+        sentence_count = 0
+        token_count = 0
+        for chunk in iter_text_chunks(text):
+            try:
+                result = run_stanza([chunk], language, processors)[0]
+            except (QueueFullError, InferenceTimeoutError, WorkerCrashedError) as e:
+                result = {'success': False, 'error': str(e)}
+            if not result['success']:
+                yield json.dumps({'success': False, 'error': result['error']}) + '\n'
+                return
+            for sentence in result['sentences']:
+                yield json.dumps({
+                    'index': sentence_count,
+                    'text': sentence['text'],
+                    'tokens': sentence['tokens']
+                }, ensure_ascii=False) + '\n'
+                sentence_count += 1
+                token_count += len(sentence['tokens'])
+
+        yield json.dumps({
+            'done': True,
+            'language': language,
+            'sentence_count': sentence_count,
+            'token_count': token_count
+        }) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 
 @app.route('/api/parse-detailed', methods=['POST'])
@@ -229,48 +1205,249 @@ def parse_detailed():
     if not text:
         return jsonify({'error': 'Text cannot be empty'}), 400
 
+    response_format = negotiate_format(request)
+    processors = resolve_processors(data.get('processors'))
     language = data.get('language', detect_language(text))
 
-    if language not in SUPPORTED_LANGUAGES:
+    if language != MIXED_LANGUAGE and language not in SUPPORTED_LANGUAGES:
         return jsonify({
             'error': f'Language {language} not supported',
             'supported': list(SUPPORTED_LANGUAGES.keys())
         }), 400
 
-    result = parse_with_stanza(text, language)
+    etag = stanza_etag('parse-detailed', text, language, response_format, processors)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    result = parse_document(text, language, processors)
 
     if not result['success']:
         return jsonify(result), 500
 
-    # Add additional analysis
     analysis = {
-        'result': result,
-        'statistics': {
-            'avg_sentence_length': len(result['tokens']) / max(1, result['sentence_count']),
-            'pos_distribution': analyze_pos_distribution(result['tokens']),
-            'dependency_types': analyze_dependencies(result['tokens'])
-        }
+        'result': to_columnar(result) if response_format != JSON else result,
+        'statistics': document_statistics(result['sentences'], processors)
     }
 
-    return jsonify(analysis)
+    return tag_response(respond(analysis, response_format), etag)
+
+
+def document_statistics(sentences: List[Dict], processors: str, per_sentence: bool = True) -> Dict:
+    """
+    Additional analysis, limited to the layers that were computed
+
+    All sentences are analyzed together as one array-backed TreeBatch. With
+    depparse, `tree` adds depth, branching, dependency distance and
+    projectivity, and per_sentence adds each sentence's subtree spans.
+    """
+    # NumPy is only imported once statistics are first needed (see startup)
+    from tree_analytics import TreeBatch
+
+    batch = TreeBatch.from_sentences(sentences)
+    statistics = {
+        'avg_sentence_length': batch.size / max(1, len(sentences))
+    }
+    layers = processors.split(',')
+    if 'pos' in layers:
+        statistics['pos_distribution'] = batch.pos_distribution()
+    if 'depparse' in layers:
+        statistics['dependency_types'] = batch.dependency_types()
+        statistics['tree'] = batch.tree_statistics(per_sentence)
+    return statistics
 
 
 def analyze_pos_distribution(tokens: List[Dict]) -> Dict[str, int]:
     """Count POS tag distribution"""
-    distribution = {}
-    for token in tokens:
-        pos = token.get('upos', 'UNKNOWN')
-        distribution[pos] = distribution.get(pos, 0) + 1
-    return distribution
+    from tree_analytics import TreeBatch
+    return TreeBatch.from_sentences([{'tokens': tokens}]).pos_distribution()
 
 
 def analyze_dependencies(tokens: List[Dict]) -> Dict[str, int]:
     """Count dependency relation types"""
-    distribution = {}
-    for token in tokens:
-        deprel = token.get('deprel', 'root')
-        distribution[deprel] = distribution.get(deprel, 0) + 1
-    return distribution
+    from tree_analytics import TreeBatch
+    return TreeBatch.from_sentences([{'tokens': tokens}]).dependency_types()
+
+
+@app.route('/api/parse-incremental', methods=['POST'])
+def parse_incremental():
+    """
+    Re-parse only the sentences that changed since the previous version
+
+    Request body:
+    {
+        "text": "The full current text",
+        "session_id": "...",  # Optional, from the previous response
+        "version": 3,  # Optional, the version the client currently holds
+        "language": "en",  # Optional, defaults to the session's or detected language
+        "processors": "tokenize,pos"  # Optional, defaults to the full pipeline
+    }
+
+    The text is cut into sentence-sized segments and diffed against the
+    session's previous version. `changes` lists the replaced ranges of the
+    previous segment list with their new segments; applying them in reverse
+    order (segments[start:end] = change.segments) yields the current
+    document. When the session is unknown or expired, or the version,
+    language or processors do not match, `reset` is true and the changes
+    rebuild the document from an empty list.
+    """
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({'error': 'Missing text field'}), 400
+
+    text = request_text(data)
+    if text is None:
+        return jsonify({'error': 'Text cannot be empty'}), 400
+
+    processors = resolve_processors(data.get('processors'))
+    session = edit_sessions.get(data.get('session_id'))
+    language = data.get('language') or (session and session.language) or detect_language(text)
+    if not is_supported_language(language):
+        return jsonify({
+            'error': f'Language {language} not supported',
+            'supported': list(SUPPORTED_LANGUAGES.keys())
+        }), 400
+
+    # Only start a session once the request is known to be valid
+    if session is None:
+        session = edit_sessions.create()
+
+    texts = split_edit_segments(text)
+    with session.lock:
+        reset = (data.get('version') != session.version or language != session.language
+                 or processors != session.processors)
+        previous_texts = [] if reset else session.texts
+        previous_segments = [] if reset else session.segments
+        opcodes = diff_segments(previous_texts, texts)
+
+        changed = [j for op, _, _, j1, j2 in opcodes if op in ('replace', 'insert') for j in range(j1, j2)]
+        parsed = parse_edit_segments([texts[j] for j in changed], language, processors)
+        if not parsed['success']:
+            return jsonify(parsed), 500
+
+        segments: List[Optional[Dict]] = [None] * len(texts)
+        for j, segment in zip(changed, parsed['segments']):
+            segments[j] = segment
+        changes = []
+        for op, i1, i2, j1, j2 in opcodes:
+            if op == 'equal':
+                segments[j1:j2] = previous_segments[i1:i2]
+            else:
+                changes.append({'op': op, 'start': i1, 'end': i2, 'segments': segments[j1:j2]})
+
+        session.apply(texts, segments, language, processors)
+        version = session.version
+
+    sentences = [sentence for segment in segments for sentence in segment['sentences']]
+    return jsonify({
+        'success': True,
+        'session_id': session.session_id,
+        'version': version,
+        'reset': reset,
+        'language': language,
+        'changes': changes,
+        'reparsed': len(changed),
+        'reused': len(texts) - len(changed),
+        'segment_count': len(texts),
+        'sentence_count': len(sentences),
+        'token_count': sum(segment['token_count'] for segment in segments),
+        # Per-sentence spans would resend the whole document on every edit
+        'statistics': document_statistics(sentences, processors, per_sentence=False)
+    })
+
+
+@app.route('/api/parse-incremental/<session_id>', methods=['DELETE'])
+def end_edit_session(session_id: str):
+    """Discard an editing session once the document is closed"""
+    if not edit_sessions.discard(session_id):
+        return jsonify({'error': 'Unknown session'}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a long document for background parsing
+
+    Request body: as for /api/parse-detailed ("text", optional "language",
+    "processors"). Answers 202 with the job id at once; poll
+    GET /api/jobs/<job_id> for progress and fetch GET /api/jobs/<job_id>/result.
+    Submitting the same text, language and processors again while the first
+    job is queued, running or kept returns that job.
+    """
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({'error': 'Missing text field'}), 400
+
+    text = request_text(data)
+    if text is None:
+        return jsonify({'error': 'Text cannot be empty'}), 400
+
+    processors = resolve_processors(data.get('processors'))
+    language = data.get('language') or detect_language(text)
+    if not is_supported_language(language):
+        return jsonify({
+            'error': f'Language {language} not supported',
+            'supported': list(SUPPORTED_LANGUAGES.keys())
+        }), 400
+
+    job, deduplicated = job_manager.submit(
+        make_key('job', text, language, processors, stanza_version(), ANALYTICS_SCHEMA_VERSION),
+        {'text': text, 'language': language, 'processors': processors}
+    )
+    response = jsonify({**job_status(job), 'deduplicated': deduplicated})
+    response.status_code = 202
+    response.headers['Location'] = f"/api/jobs/{job['job_id']}"
+    return response
+
+
+@app.route('/api/jobs/stats', methods=['GET'])
+def job_stats():
+    """Jobs in the shared store per status, plus this worker's counters"""
+    return jsonify({**job_manager.stats(), 'jobs': job_manager.store.counts()})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Status and progress of a job"""
+    job = job_manager.store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job_status(job))
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id: str):
+    """
+    Result of a finished job, in the /api/parse-detailed shape
+
+    Answers 202 with the job status while it is queued or running, and 409
+    if it failed or was cancelled.
+    """
+    job = job_manager.store.get(job_id, with_result=True)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    if job['status'] in ACTIVE_STATES:
+        return jsonify(job_status(job)), 202
+    if job['status'] != DONE:
+        return jsonify(job_status(job)), 409
+
+    response_format = negotiate_format(request)
+    analysis = job['result']
+    if response_format != JSON:
+        analysis['result'] = to_columnar(analysis['result'])
+    return respond(analysis, response_format)
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id: str):
+    """Cancel a queued or running job; finished jobs are left as they are"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job_status(job))
 
 
 @app.route('/api/parse-quantum-grammar', methods=['POST'])
@@ -294,9 +1471,14 @@ def parse_quantum_grammar_endpoint():
     if not text:
         return jsonify({'error': 'Text cannot be empty'}), 400
 
+    etag = make_etag('quantum-grammar', text, QuantumGrammarParser.VERSION)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     try:
-        result = parse_quantum_grammar(text)
-        return jsonify(result)
+        result = cached_parse_quantum_grammar(text)
+        return tag_response(respond(result), etag)
     except Exception as e:
         logger.error(f"Quantum Grammar parsing error: {e}")
         return jsonify({
@@ -305,6 +1487,27 @@ def parse_quantum_grammar_endpoint():
         }), 500
 
 
+@app.errorhandler(UnsupportedFormatError)
+def unsupported_format(error):
+    return jsonify({'error': str(error)}), 406
+
+
+@app.errorhandler(UnsupportedProcessorsError)
+def unsupported_processors(error):
+    return jsonify({'error': str(error)}), 400
+
+
+@app.errorhandler(QueueFullError)
+def inference_queue_full(error):
+    return jsonify({'success': False, 'error': str(error)}), 429, {'Retry-After': '1'}
+
+
+@app.errorhandler(InferenceTimeoutError)
+@app.errorhandler(WorkerCrashedError)
+def inference_unavailable(error):
+    return jsonify({'success': False, 'error': str(error)}), 503, {'Retry-After': '5'}
+
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -315,7 +1518,27 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 
+startup.mark('app_setup')
+_phases = ', '.join(f'{phase} {seconds:.3f}s' for phase, seconds in startup.phases.items())
+logger.info(f"Backend initialized in {startup.total():.3f}s ({_phases})")
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Diagrammatic NLP backend server')
+    parser.add_argument(
+        '--preload', nargs='?', const='', default=None, metavar='LANGS',
+        help='Load and warm pipelines at startup; optional comma-separated '
+             'language list (default: PRELOAD_LANGUAGES or setup_nlp.LANGUAGES)'
+    )
+    args = parser.parse_args()
+
     logger.info("Starting NLP Backend Server")
     logger.info(f"Supported languages: {len(SUPPORTED_LANGUAGES)}")
-    app.run(debug=True, port=5000, host='127.0.0.1')
+
+    debug = True
+    # With the debug reloader the module runs twice; only preload in the serving child
+    serving_process = not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    if serving_process and (args.preload is not None or env_flag('PRELOAD_MODELS')):
+        start_preload([code.strip() for code in (args.preload or '').split(',') if code.strip()] or None)
+
+    app.run(debug=debug, port=5000, host='127.0.0.1')
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Bulk corpus parser for offline dependency and Quantum Grammar analysis
+
+Reads a plain-text corpus (one document per non-empty line) or a JSONL
+corpus ({"text": ..., "id": ..., "language": ...} per line), parses it with
+Stanza and/or the Quantum Grammar parser using a pool of worker processes,
+and writes JSONL or CoNLL-U. Input is streamed, so corpus size is not
+limited by memory.
+
+Examples:
+    python3 parse_corpus.py corpus.txt -o parsed.jsonl --workers 4
+    python3 parse_corpus.py corpus.jsonl -o parsed.conllu --format conllu --language en
+    python3 parse_corpus.py corpus.txt -o qg.jsonl --mode quantum --resume
+
+With --resume, progress is checkpointed to OUTPUT.checkpoint after every
+batch; an interrupted run picks up after the last completed batch.
+
+CoNLL-U output only holds parsed sentences: records that fail to parse are
+written to OUTPUT.errors.jsonl instead ({"id", "language", "error"} per
+line). JSONL output keeps failures inline in each record's "stanza" result.
+"""
+
+import argparse
+import json
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# One input record: (id, text, language or None)
+Record = Tuple[str, str, Optional[str]]
+
+MODES = ('stanza', 'quantum', 'both')
+FORMATS = ('jsonl', 'conllu')
+
+
+def iter_lines(path: str, use_mmap: bool = False) -> Iterator[str]:
+    """Stream decoded lines from path, optionally through a memory map"""
+    if not use_mmap:
+        with open(path, encoding='utf-8') as handle:
+            yield from handle
+        return
+
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.decode('utf-8')
+
+
+def iter_records(path: str, input_format: str, use_mmap: bool = False) -> Iterator[Record]:
+    """Yield (id, text, language) for every non-empty record in the corpus"""
+    for line_number, line in enumerate(iter_lines(path, use_mmap), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if input_format == 'jsonl':
+            item = json.loads(line)
+            text = (item.get('text') or '').strip()
+            if text:
+                yield str(item.get('id', line_number)), text, item.get('language')
+        else:
+            yield str(line_number), line, None
+
+
+def iter_batches(records: Iterator[Record], batch_size: int) -> Iterator[List[Record]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_batch(batch: List[Record], mode: str, default_language: Optional[str]) -> List[Dict]:
+    """
+    Parse one batch of records (runs inside pool workers)
+
+    Stanza texts are grouped by language so each pipeline sees one bulk call.
+    """
+    # Imported here so the parent process never loads the NLP stack
+    from nlp_backend import SUPPORTED_LANGUAGES, detect_language, parse_batch_with_stanza
+    from quantum_grammar_parser import get_parser
+
+    outputs = [{'id': record_id} for record_id, _, _ in batch]
+
+    if mode in ('stanza', 'both'):
+        groups: Dict[str, List[int]] = {}
+        for position, (_, text, language) in enumerate(batch):
+            language = language or default_language or detect_language(text)
+            outputs[position]['language'] = language
+            if language not in SUPPORTED_LANGUAGES:
+                outputs[position]['stanza'] = {
+                    'success': False,
+                    'error': f'Language {language} not supported',
+                    'language': language
+                }
+                continue
+            groups.setdefault(language, []).append(position)
+
+        for language, positions in groups.items():
+            results = parse_batch_with_stanza([batch[i][1] for i in positions], language)
+            for position, result in zip(positions, results):
+                outputs[position]['stanza'] = result
+
+    if mode in ('quantum', 'both'):
+        parser = get_parser()
+        for position, (_, text, _) in enumerate(batch):
+            outputs[position]['quantum_grammar'] = parser.parse_compact(text).to_dict()
+
+    return outputs
+
+
+def _parse_batch_star(args) -> List[Dict]:
+    return parse_batch(*args)
+
+
+def parse_error(output: Dict) -> Optional[Dict]:
+    """Error log entry for a record whose Stanza parse failed, or None"""
+    stanza_result = output.get('stanza') or {}
+    if stanza_result.get('success'):
+        return None
+    return {'id': output['id'], 'language': output.get('language'),
+            'error': stanza_result.get('error', 'not parsed')}
+
+
+def to_conllu(output: Dict) -> str:
+    """
+    Render one parsed record as CoNLL-U sentences
+
+    Failed records render as nothing, since a block of comments without
+    token lines is not valid CoNLL-U; see parse_error.
+    """
+    lines = []
+    stanza_result = output.get('stanza') or {}
+    if not stanza_result.get('success'):
+        return ''
+
+    parser = None
+    if 'quantum_grammar' in output:
+        from quantum_grammar_parser import get_parser
+        parser = get_parser()
+
+    for index, sentence in enumerate(stanza_result['sentences'], 1):
+        lines.append(f"# sent_id = {output['id']}-{index}")
+        lines.append(f"# text = {sentence['text']}")
+        if parser is not None:
+            lines.append(f"# quantum_grammar = {parser.parse_compact(sentence['text']).modification_chain}")
+        for token in sentence['tokens']:
+            lines.append('\t'.join(
+                '_' if value is None else str(value) for value in (
+                    token['id'], token['text'], token['lemma'], token['upos'], token['xpos'],
+                    None, token['head'], token['deprel'], None, None
+                )
+            ))
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def format_output(output: Dict, output_format: str) -> str:
+    if output_format == 'conllu':
+        return to_conllu(output)
+    return json.dumps(output, ensure_ascii=False) + '\n'
+
+
+def load_checkpoint(path: str) -> Dict:
+    checkpoint = {'records': 0, 'offset': 0, 'error_offset': 0}
+    try:
+        with open(path, encoding='utf-8') as handle:
+            checkpoint.update(json.load(handle))
+    except FileNotFoundError:
+        pass
+    return checkpoint
+
+
+def save_checkpoint(path: str, records: int, offset: int, error_offset: int = 0) -> None:
+    # Write then rename so a crash never leaves a half-written checkpoint
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        json.dump({'records': records, 'offset': offset, 'error_offset': error_offset}, handle)
+    os.replace(temporary, path)
+
+
+def truncate_file(path: str, offset: int) -> None:
+    """Create path if needed and drop everything after offset"""
+    with open(path, 'a', encoding='utf-8'):
+        pass
+    with open(path, 'r+b') as handle:
+        handle.truncate(offset)
+
+
+class Progress:
+    """Periodic progress and throughput reporting on stderr"""
+
+    def __init__(self, interval: float, already_done: int = 0):
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.records = 0
+        self.tokens = 0
+        self.already_done = already_done
+
+    def update(self, outputs: List[Dict]) -> None:
+        self.records += len(outputs)
+        for output in outputs:
+            result = output.get('stanza') or output.get('quantum_grammar') or {}
+            self.tokens += result.get('token_count') or len(result.get('tokens', ()))
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final: bool = False) -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        label = 'Done' if final else 'Progress'
+        print(f"{label}: {self.already_done + self.records} records "
+              f"({self.records / elapsed:.1f} records/s, {self.tokens / elapsed:.0f} tokens/s, "
+              f"{elapsed:.1f}s elapsed)", file=sys.stderr, flush=True)
+
+
+def run(args: argparse.Namespace) -> None:
+    checkpoint_path = args.output + '.checkpoint'
+    checkpoint = (load_checkpoint(checkpoint_path) if args.resume
+                  else {'records': 0, 'offset': 0, 'error_offset': 0})
+    # Only CoNLL-U needs a separate error log; JSONL records carry their errors
+    log_errors = args.format == 'conllu'
+    errors_path = args.output + '.errors.jsonl'
+
+    # Drop anything written after the last checkpoint, then append
+    truncate_file(args.output, checkpoint['offset'])
+    if log_errors:
+        truncate_file(errors_path, checkpoint['error_offset'])
+    if checkpoint['records']:
+        print(f"Resuming after {checkpoint['records']} records", file=sys.stderr)
+
+    records = iter_records(args.input, args.input_format, args.mmap)
+    for _ in range(checkpoint['records']):
+        next(records, None)
+
+    tasks = ((batch, args.mode, args.language) for batch in iter_batches(records, args.batch_size))
+    progress = Progress(args.progress_interval, checkpoint['records'])
+    done = checkpoint['records']
+    failed = 0
+
+    pool = None
+    if args.workers > 1:
+        pool = multiprocessing.get_context('spawn').Pool(args.workers)
+        results = pool.imap(_parse_batch_star, tasks)
+    else:
+        results = map(_parse_batch_star, tasks)
+
+    try:
+        with open(args.output, 'a', encoding='utf-8') as out, \
+                open(errors_path if log_errors else os.devnull, 'a', encoding='utf-8') as errors:
+            for outputs in results:
+                out.write(''.join(format_output(output, args.format) for output in outputs))
+                if log_errors:
+                    entries = [entry for entry in map(parse_error, outputs) if entry is not None]
+                    errors.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n'
+                                         for entry in entries))
+                    errors.flush()
+                    failed += len(entries)
+                out.flush()
+                done += len(outputs)
+                if args.resume:
+                    save_checkpoint(checkpoint_path, done, out.tell(),
+                                    errors.tell() if log_errors else 0)
+                progress.update(outputs)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    progress.report(final=True)
+    if failed:
+        print(f'{failed} records failed to parse, see {errors_path}', file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Parse a text or JSONL corpus offline with Stanza and/or Quantum Grammar'
+    )
+    parser.add_argument('input', help='Corpus file: one document per line, or JSONL')
+    parser.add_argument('-o', '--output', required=True, help='Output file')
+    parser.add_argument('--input-format', choices=('text', 'jsonl'),
+                        help='Input format (default: from the file extension)')
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', help='Output format')
+    parser.add_argument('--mode', choices=MODES, default='stanza', help='Which parsers to run')
+    parser.add_argument('--language', help='Language for records without one (default: auto-detect)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes')
+    parser.add_argument('--batch-size', type=int, default=64, help='Records per worker task')
+    parser.add_argument('--mmap', action='store_true', help='Memory-map the input file')
+    parser.add_argument('--resume', action='store_true',
+                        help='Checkpoint progress and continue an interrupted run')
+    parser.add_argument('--progress-interval', type=float, default=10.0,
+                        help='Seconds between progress reports')
+    args = parser.parse_args(argv)
+
+    if args.input_format is None:
+        args.input_format = 'jsonl' if args.input.endswith(('.jsonl', '.ndjson')) else 'text'
+    if args.format == 'conllu' and args.mode == 'quantum':
+        parser.error('CoNLL-U output requires --mode stanza or both')
+
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Bounded LRU cache for loaded NLP pipelines
+
+Each Stanza pipeline holds hundreds of MB of model weights, so keeping every
+language that has ever been requested resident eventually exhausts worker
+memory. PipelineCache keeps at most a configurable number of pipelines (and
+optionally stays under a process RSS budget), evicting the least recently
+used ones first. Pinned keys are never evicted.
+
+The cache is safe to share between request threads: concurrent misses for
+the same key wait on a single in-flight load instead of each constructing
+their own pipeline, and every pipeline carries a lock that serializes
+inference on it.
+"""
+
+import gc
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Return the resident set size of this process in MB
+
+    Reads /proc/self/statm where available; returns None on platforms
+    without procfs so that RSS budgeting is simply skipped there.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def key_label(key: Hashable) -> str:
+    """Readable form of a cache key, e.g. ('en', 'tokenize,pos') -> 'en:tokenize,pos'"""
+    if isinstance(key, tuple):
+        return ':'.join(str(part) for part in key)
+    return str(key)
+
+
+class PipelineCache:
+    """LRU cache of pipelines with a count limit, RSS budget and pinning"""
+
+    def __init__(self, max_pipelines: int = 8, max_rss_mb: float = 0,
+                 pinned: Optional[Iterable[Hashable]] = None):
+        """
+        Args:
+            max_pipelines: Maximum number of resident pipelines (0 = unlimited)
+            max_rss_mb: Process RSS budget in MB that triggers eviction (0 = disabled)
+            pinned: Keys that are never evicted once loaded
+        """
+        self.max_pipelines = max_pipelines
+        self.max_rss_mb = max_rss_mb
+        self.pinned = set(pinned or ())
+        # key -> (pipeline, inference lock), least recently used first
+        self._pipelines: 'OrderedDict[Hashable, Tuple[Any, threading.Lock]]' = OrderedDict()
+        # key -> Future resolved by the one thread currently loading it
+        self._loading: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_waits = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pipelines
+
+    def __len__(self) -> int:
+        return len(self._pipelines)
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the resident keys, least recently used first"""
+        with self._lock:
+            return list(self._pipelines)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached pipeline for key, loading it with loader on a miss
+        """
+        return self._get_entry(key, loader)[0]
+
+    @contextmanager
+    def use(self, key: Hashable, loader: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Yield the pipeline for key while holding its inference lock
+
+        Stanza pipelines are not safe to run from several threads at once, so
+        callers that run inference should go through this rather than get().
+        """
+        pipeline, inference_lock = self._get_entry(key, loader)
+        with inference_lock:
+            yield pipeline
+
+    def _get_entry(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, threading.Lock]:
+        """Look up key, performing or waiting on a single-flight load on a miss"""
+        with self._lock:
+            entry = self._pipelines.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._pipelines.move_to_end(key)
+                return entry
+
+            pending = self._loading.get(key)
+            owner = pending is None
+            if owner:
+                self.misses += 1
+                pending = self._loading[key] = Future()
+            else:
+                self.load_waits += 1
+
+        if not owner:
+            return pending.result()
+
+        try:
+            entry = (loader(), threading.Lock())
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            self._pipelines[key] = entry
+            self._enforce_limits(keep=key)
+        pending.set_result(entry)
+        return entry
+
+    def pin(self, key: Hashable) -> None:
+        """Protect key from eviction"""
+        with self._lock:
+            self.pinned.add(key)
+
+    def unpin(self, key: Hashable) -> None:
+        """Allow key to be evicted again"""
+        with self._lock:
+            self.pinned.discard(key)
+
+    def evict(self, key: Hashable) -> bool:
+        """Drop key from the cache, returning whether it was present"""
+        with self._lock:
+            return self._evict(key)
+
+    def _evict(self, key: Hashable) -> bool:
+        # Threads already holding the pipeline keep their reference, so an
+        # in-progress inference finishes normally after eviction
+        if key not in self._pipelines:
+            return False
+        del self._pipelines[key]
+        self.evictions += 1
+        logger.info(f"Evicted pipeline {key_label(key)}")
+        return True
+
+    def _next_victim(self, keep: Hashable) -> Optional[Hashable]:
+        """Least recently used key that may be evicted"""
+        for key in self._pipelines:
+            if key != keep and key not in self.pinned:
+                return key
+        return None
+
+    def _over_budget(self) -> bool:
+        if self.max_pipelines and len(self._pipelines) > self.max_pipelines:
+            return True
+        if self.max_rss_mb:
+            rss = current_rss_mb()
+            return rss is not None and rss > self.max_rss_mb
+        return False
+
+    def _enforce_limits(self, keep: Hashable) -> None:
+        """Evict LRU pipelines until the cache is back within its limits (lock held)"""
+        evicted = False
+        while self._over_budget():
+            victim = self._next_victim(keep)
+            if victim is None:
+                break
+            self._evict(victim)
+            evicted = True
+            # Release model tensors now so the RSS check sees the freed memory
+            gc.collect()
+        if evicted and self._over_budget():
+            logger.warning("Pipeline cache still over budget after eviction; "
+                           "remaining pipelines are pinned")
+
+    def stats(self) -> Dict:
+        """Counters and configuration for health reporting"""
+        with self._lock:
+            loaded = [key_label(key) for key in self._pipelines]
+            loading = [key_label(key) for key in self._loading]
+        lookups = self.hits + self.misses
+        rss = current_rss_mb()
+        return {
+            'loaded': loaded,
+            'loading': loading,
+            'size': len(loaded),
+            'max_pipelines': self.max_pipelines,
+            'max_rss_mb': self.max_rss_mb,
+            'rss_mb': round(rss, 1) if rss is not None else None,
+            'pinned': sorted(key_label(key) for key in self.pinned),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'load_waits': self.load_waits,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,137 @@
+"""
+Background model preloading and warmup
+
+Loading a Stanza pipeline takes seconds, and the first parse through a fresh
+pipeline is slower still while lazy buffers are allocated. PipelinePreloader
+loads a list of languages in parallel in the background, runs a warmup
+sentence through each, and tracks per-language readiness so that a load
+balancer can hold traffic until the process is warm.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Readiness states, in the order a language moves through them
+PENDING = 'pending'
+LOADING = 'loading'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class PipelinePreloader:
+    """Loads and warms pipelines in the background, tracking readiness"""
+
+    def __init__(self, load: Callable[[str], object], warmup: Callable[[str], None],
+                 max_workers: int = 4):
+        """
+        Args:
+            load: Loads (and caches) the pipeline for a language code
+            warmup: Runs a warmup parse for a language code
+            max_workers: Number of languages loaded concurrently
+        """
+        self._load = load
+        self._warmup = warmup
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._status: Dict[str, Dict] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, languages: Iterable[str], warmup: bool = True) -> None:
+        """Begin preloading languages on a background thread"""
+        languages = self._schedule(languages)
+        self._thread = threading.Thread(
+            target=self._run, args=(languages, warmup), name='pipeline-preload', daemon=True
+        )
+        self._thread.start()
+
+    def run(self, languages: Iterable[str], warmup: bool = True) -> None:
+        """Preload languages, blocking until all have finished"""
+        self._run(self._schedule(languages), warmup)
+
+    def warm(self, languages: Optional[Iterable[str]] = None) -> None:
+        """
+        Warm up already loaded languages (all loaded ones by default)
+
+        Used when pipelines were loaded in one process and inference should
+        first happen in another, e.g. after a prefork server forks workers.
+        """
+        if languages is None:
+            languages = [language for language, status in self.status().items()
+                         if status['state'] == WARMING]
+        for language in languages:
+            self._warm_one(language, time.perf_counter())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until preloading finishes, returning whether it did"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _schedule(self, languages: Iterable[str]) -> List[str]:
+        languages = list(dict.fromkeys(languages))
+        with self._lock:
+            for language in languages:
+                self._status[language] = {'state': PENDING}
+        return languages
+
+    def _run(self, languages: List[str], warmup: bool) -> None:
+        started = time.perf_counter()
+        logger.info(f"Preloading {len(languages)} pipeline(s): {', '.join(languages)}")
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='pipeline-preload') as executor:
+            list(executor.map(lambda language: self._preload_one(language, warmup), languages))
+        loaded = sum(1 for status in self.status().values() if status['state'] != FAILED)
+        logger.info(f"Preloaded {loaded}/{len(languages)} pipeline(s) "
+                    f"in {time.perf_counter() - started:.1f}s")
+
+    def _preload_one(self, language: str, warmup: bool) -> None:
+        try:
+            self._set(language, state=LOADING)
+            started = time.perf_counter()
+            self._load(language)
+            loaded = time.perf_counter()
+            self._set(language, state=WARMING, load_seconds=round(loaded - started, 3))
+        except Exception as e:
+            logger.error(f"Preloading {language} failed: {e}")
+            self._set(language, state=FAILED, error=str(e))
+            return
+        if warmup:
+            self._warm_one(language, loaded)
+
+    def _warm_one(self, language: str, started: float) -> None:
+        try:
+            self._warmup(language)
+            self._set(language, state=READY,
+                      warmup_seconds=round(time.perf_counter() - started, 3))
+        except Exception as e:
+            logger.error(f"Warming up {language} failed: {e}")
+            self._set(language, state=FAILED, error=str(e))
+
+    def _set(self, language: str, **fields) -> None:
+        with self._lock:
+            self._status[language].update(fields)
+
+    def status(self) -> Dict[str, Dict]:
+        """Per-language readiness details"""
+        with self._lock:
+            return {language: dict(status) for language, status in self._status.items()}
+
+    def is_ready(self, language: Optional[str] = None) -> bool:
+        """
+        Whether every preloaded language (or just the given one) is ready
+
+        Languages that were never scheduled for preloading count as ready,
+        since they are loaded on demand.
+        """
+        with self._lock:
+            if language is not None:
+                status = self._status.get(language)
+                return status is None or status['state'] == READY
+            return all(status['state'] == READY for status in self._status.values())
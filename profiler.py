@@ -0,0 +1,109 @@
+"""
+Sampling profiler for live diagnosis of a running server
+
+SamplingProfiler periodically snapshots the Python stack of every thread
+(sys._current_frames) from a background thread and counts identical stacks.
+It never instruments code, so its overhead is bounded by the sampling
+interval. The result is in the collapsed-stack format read by flamegraph.pl
+and speedscope:
+
+    thread;module:function:line;module:function:line 42
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+
+class SamplingProfiler:
+    """Background stack sampler that can be started and stopped at runtime"""
+
+    def __init__(self, max_seconds: float = 60.0, max_depth: int = 64):
+        """
+        Args:
+            max_seconds: A run stops itself after this long, in case nobody stops it
+            max_depth: Innermost frames kept per stack
+        """
+        self.max_seconds = max_seconds
+        self.max_depth = max_depth
+        self.interval = 0.01
+        self._lock = threading.Lock()
+        self._stacks: Dict[str, int] = {}
+        self._samples = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval_ms: float = 10.0) -> bool:
+        """Clear previous samples and start sampling; False if already running"""
+        with self._lock:
+            if self.running:
+                return False
+            self.interval = max(interval_ms, 1.0) / 1000.0
+            self._stacks = {}
+            self._samples = 0
+            self._stop.clear()
+            self._started_at = time.time()
+            self._stopped_at = None
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self) -> None:
+        """Stop sampling, keeping the collected stacks"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.monotonic() >= deadline:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(names.get(thread_id, str(thread_id)), frame)
+                with self._lock:
+                    self._stacks[stack] = self._stacks.get(stack, 0) + 1
+            with self._lock:
+                self._samples += 1
+        self._stopped_at = time.time()
+
+    def _collapse(self, thread_name: str, frame) -> str:
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            frames.append(f'{module}:{code.co_name}:{frame.f_lineno}')
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ';'.join(reversed(frames))
+
+    def collapsed(self) -> str:
+        """Collected stacks, most frequent first, one 'stack count' per line"""
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: -item[1])
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'running': self.running,
+                'interval_ms': self.interval * 1000.0,
+                'samples': self._samples,
+                'distinct_stacks': len(self._stacks),
+                'started_at': self._started_at,
+                'stopped_at': self._stopped_at,
+                'max_seconds': self.max_seconds,
+            }
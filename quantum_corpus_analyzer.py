@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Corpus-level Quantum Grammar analysis
+
+QuantumGrammarParser summarizes one sentence at a time. This module
+aggregates code, category and tense distributions and fact-pattern counts
+over whole corpora. Input files are cut into byte-range shards that worker
+processes read and analyze independently. Each shard yields a
+CorpusStatistics, and those are combined with an associative merge, so
+shards can be reduced in any grouping.
+
+Examples:
+    python3 quantum_corpus_analyzer.py docs/ quantum-grammar-rules.txt
+    python3 quantum_corpus_analyzer.py corpus/ --workers 8 -o stats.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from functools import reduce
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from quantum_grammar_parser import QuantumGrammarParser, QuantumGrammarResult, get_parser
+
+# Sentence-ending punctuation followed by whitespace
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+# Extensions picked up when a directory is given
+CORPUS_EXTENSIONS = ('.txt', '.md')
+
+# (path, start byte, end byte)
+Shard = Tuple[str, int, int]
+
+
+def _add_counts(target: Dict[str, int], counts: Dict[str, int]) -> None:
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + count
+
+
+class CorpusStatistics:
+    """Mergeable Quantum Grammar statistics over many sentences"""
+
+    def __init__(self):
+        self.sentences = 0
+        self.tokens = 0
+        self.fact_sentences = 0
+        self.code_counts: Dict[str, int] = {}
+        self.tense_counts: Dict[str, int] = {"present": 0, "past": 0, "future": 0}
+        self.pattern_counts: Dict[str, int] = {}
+
+    def add(self, result: QuantumGrammarResult) -> None:
+        """Accumulate one parsed sentence"""
+        if not len(result):
+            return
+        self.sentences += 1
+        self.tokens += len(result)
+        if result.has_facts:
+            self.fact_sentences += 1
+        _add_counts(self.code_counts, result.code_counts)
+        _add_counts(self.tense_counts, result.tense_counts)
+        for pattern in result.patterns:
+            self.pattern_counts[pattern.label] = self.pattern_counts.get(pattern.label, 0) + 1
+
+    def merge(self, other: 'CorpusStatistics') -> 'CorpusStatistics':
+        """Combine two statistics into a new one (associative and commutative)"""
+        merged = CorpusStatistics()
+        for part in (self, other):
+            merged.sentences += part.sentences
+            merged.tokens += part.tokens
+            merged.fact_sentences += part.fact_sentences
+            _add_counts(merged.code_counts, part.code_counts)
+            _add_counts(merged.tense_counts, part.tense_counts)
+            _add_counts(merged.pattern_counts, part.pattern_counts)
+        return merged
+
+    def to_dict(self, categories: Dict[int, str] = QuantumGrammarParser.CODES) -> Dict:
+        """Summary in the same vocabulary as the per-sentence statistics"""
+        code_distribution = dict(sorted(self.code_counts.items()))
+        category_distribution: Dict[str, int] = {}
+        for code, count in code_distribution.items():
+            category = categories.get(int(code), "UNKNOWN")
+            category_distribution[category] = category_distribution.get(category, 0) + count
+
+        fiction_sentences = self.sentences - self.fact_sentences
+        return {
+            "sentence_count": self.sentences,
+            "token_count": self.tokens,
+            "code_distribution": code_distribution,
+            "category_distribution": category_distribution,
+            "tense_distribution": self.tense_counts,
+            "pattern_counts": self.pattern_counts,
+            "fact_sentences": self.fact_sentences,
+            "fiction_sentences": fiction_sentences,
+            "fact_ratio": self.fact_sentences / self.sentences if self.sentences else 0.0,
+            "fact_to_fiction_ratio": self.fact_sentences / fiction_sentences if fiction_sentences else None,
+        }
+
+
+def iter_corpus_files(paths: List[str]) -> Iterator[str]:
+    """Expand directories into the text files they contain"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in sorted(os.walk(path)):
+                for name in sorted(names):
+                    if name.endswith(CORPUS_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def make_shards(paths: List[str], shard_bytes: int) -> List[Shard]:
+    """Cut every file into byte ranges of about shard_bytes"""
+    shards = []
+    for path in iter_corpus_files(paths):
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), shard_bytes):
+            shards.append((path, start, min(start + shard_bytes, size)))
+    return shards
+
+
+def iter_shard_lines(shard: Shard) -> Iterator[str]:
+    """
+    Lines that start inside the shard's byte range
+
+    A line straddling a boundary belongs to the shard it starts in, so
+    every line is read exactly once across all shards.
+    """
+    path, start, end = shard
+    with open(path, 'rb') as handle:
+        if start:
+            handle.seek(start - 1)
+            handle.readline()
+        while handle.tell() < end:
+            line = handle.readline()
+            if not line:
+                break
+            yield line.decode('utf-8', errors='replace')
+
+
+def analyze_shard(shard: Shard, unit: str = 'sentence') -> CorpusStatistics:
+    """Parse every sentence (or line) in a shard and accumulate statistics"""
+    parser = get_parser()
+    stats = CorpusStatistics()
+    for line in iter_shard_lines(shard):
+        line = line.strip()
+        if not line:
+            continue
+        texts = SENTENCE_BREAK.split(line) if unit == 'sentence' else [line]
+        for text in texts:
+            stats.add(parser.parse_compact(text))
+    return stats
+
+
+def _analyze_shard_star(args) -> CorpusStatistics:
+    return analyze_shard(*args)
+
+
+def analyze_corpus(paths: List[str], workers: int = 1, unit: str = 'sentence',
+                   shard_bytes: int = 4 * 1024 * 1024) -> CorpusStatistics:
+    """
+    Analyze all files under paths, sharded across worker processes
+    """
+    shards = make_shards(paths, shard_bytes)
+    tasks = [(shard, unit) for shard in shards]
+    if workers > 1 and len(shards) > 1:
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            parts = pool.imap_unordered(_analyze_shard_star, tasks)
+            return reduce(CorpusStatistics.merge, parts, CorpusStatistics())
+    return reduce(CorpusStatistics.merge, map(_analyze_shard_star, tasks), CorpusStatistics())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Quantum Grammar statistics over a corpus')
+    parser.add_argument('paths', nargs='+', help='Text files or directories (.txt/.md)')
+    parser.add_argument('-o', '--output', help='Write the JSON summary here instead of stdout')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--unit', choices=('sentence', 'line'), default='sentence',
+                        help='Analyze each sentence, or each line as a whole')
+    parser.add_argument('--shard-mb', type=float, default=4.0, help='Shard size in MB')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = analyze_corpus(args.paths, args.workers, args.unit, int(args.shard_mb * 1024 * 1024))
+    elapsed = time.perf_counter() - started
+
+    summary = stats.to_dict()
+    summary['elapsed_seconds'] = round(elapsed, 3)
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(text + '\n')
+    else:
+        print(text)
+    print(f"Analyzed {stats.sentences} sentences ({stats.tokens} tokens) in {elapsed:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,12 +8,237 @@ Core principle: Facts are established by the 5,6,7 pattern (POSITION-LODIAL-FACT
 """
 
 import re
-from typing import List, Dict, Tuple, Optional
+from array import array
+from collections import deque
+from typing import List, Dict, NamedTuple, Sequence, Tuple, Optional
+
+
+# Suffix classes recognised by the reversed-suffix trie
+VERB_SUFFIX = 1
+ADJECTIVE_SUFFIX = 2
+ADVERB_SUFFIX = 4
+PAST_SUFFIX = 8
+FUTURE_SUFFIX = 16
+
+# Compact tense flags, indexing TENSE_NAMES and CODE_SUFFIXES
+NO_TENSE = 0
+PAST = 1
+FUTURE = 2
+TENSE_NAMES = (None, "past", "future")
+CODE_SUFFIXES = ("", ".8", ".9")
+
+# Base codes of the word classes the contextual rules look at
+ADVERB_CODE = 1
+VERB_CODE = 2
+PRONOUN_CODE = 4
+POSITION_CODE = 5
+LODIAL_CODE = 6
+FACT_CODE = 7
+
+# (canonical word, base code, tense flag) as produced for a single word
+Tag = Tuple[str, int, int]
+
+
+class SuffixTrie:
+    """
+    Trie over reversed suffixes
+
+    Matching walks a word backwards once and collects the flags of every
+    suffix it ends with, instead of one endswith() call per suffix.
+    """
+
+    def __init__(self):
+        self._root: Dict = {}
+
+    def add(self, suffix: str, flag: int) -> None:
+        node = self._root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[None] = node.get(None, 0) | flag
+
+    def match(self, word: str) -> Tuple[int, int]:
+        """
+        Return (flags of all matching suffixes, flags of matching suffixes
+        strictly shorter than the word)
+        """
+        flags = 0
+        proper_flags = 0
+        node = self._root
+        length = len(word)
+        for depth, char in enumerate(reversed(word), 1):
+            node = node.get(char)
+            if node is None:
+                break
+            flag = node.get(None)
+            if flag:
+                flags |= flag
+                if depth < length:
+                    proper_flags |= flag
+        return flags, proper_flags
+
+
+class TaggingEngine:
+    """
+    Compiled word tagger for a QuantumGrammarParser class
+
+    The word sets of the parser are folded into a single lexicon, the suffix
+    heuristics into a SuffixTrie, and every word's compact tag is memoized,
+    so tagging a token is normally one dict lookup.
+    """
+
+    _engines: Dict[type, 'TaggingEngine'] = {}
+
+    @classmethod
+    def for_parser(cls, parser_class: type) -> 'TaggingEngine':
+        """Shared engine for parser_class, compiled on first use"""
+        engine = cls._engines.get(parser_class)
+        if engine is None:
+            engine = cls._engines[parser_class] = cls(parser_class)
+        return engine
+
+    def __init__(self, rules: type):
+        self.rules = rules
+        self.cache_size = rules.TAG_CACHE_SIZE
+
+        self.suffixes = SuffixTrie()
+        for suffixes, flag in ((rules.VERB_SUFFIXES, VERB_SUFFIX),
+                               (rules.ADJECTIVE_SUFFIXES, ADJECTIVE_SUFFIX),
+                               (rules.ADVERB_SUFFIXES, ADVERB_SUFFIX),
+                               (rules.PAST_TENSE_SUFFIXES, PAST_SUFFIX),
+                               (rules.FUTURE_TENSE_SUFFIXES, FUTURE_SUFFIX)):
+            for suffix in suffixes:
+                self.suffixes.add(suffix, flag)
+
+        # Closed-class words mapped to base codes, highest priority last so it wins
+        self.lexicon: Dict[str, int] = {}
+        for words, code in ((rules.COMMON_VERBS, VERB_CODE),
+                            (rules.LODIAL_WORDS, LODIAL_CODE),
+                            (rules.POSITION_WORDS, POSITION_CODE),
+                            (rules.CONJUNCTION_WORDS, 0)):
+            for word in words:
+                self.lexicon[word] = code
+
+        self.tags: Dict[str, Tag] = {}
+
+    def tag(self, word: str) -> Tag:
+        """
+        Memoized (canonical word, base code, tense flag) for a lowercased word
+
+        The canonical word is the memo table's own copy of the string, so
+        results that hold on to it share one object per distinct word.
+        """
+        tag = self.tags.get(word)
+        if tag is None:
+            if len(self.tags) >= self.cache_size:
+                self.tags.clear()
+            code, tense = self._compute_tag(word)
+            tag = self.tags[word] = (word, code, tense)
+        return tag
+
+    def _compute_tag(self, word: str) -> Tuple[int, int]:
+        code = self.lexicon.get(word)
+        if code is not None and code != VERB_CODE:
+            # Conjunction, position or lodial word
+            return code, NO_TENSE
+
+        matched = self.suffixes.match(word)
+        flags = matched[0]
+        if code == VERB_CODE or flags & VERB_SUFFIX:
+            return VERB_CODE, self.detect_tense(word, matched)
+        if flags & ADJECTIVE_SUFFIX:
+            return 3, NO_TENSE
+        if flags & ADVERB_SUFFIX:
+            return ADVERB_CODE, self.detect_tense(word, matched)
+
+        # Default: noun/fact or pronoun
+        return FACT_CODE, NO_TENSE
+
+    def detect_tense(self, word: str, matched: Tuple[int, int]) -> int:
+        """Tense flag of word given its SuffixTrie match"""
+        rules = self.rules
+        flags, proper_flags = matched
+
+        # Past tense detection
+        if word in rules.PAST_TENSE_VERBS or proper_flags & PAST_SUFFIX:
+            return PAST
+
+        # Future tense detection
+        if word in rules.FUTURE_TENSE_MARKERS:
+            return FUTURE
+        if flags & FUTURE_SUFFIX and word not in rules.NON_FUTURE_ING_WORDS:
+            return FUTURE
+
+        # Special cases
+        if word == "going":
+            return FUTURE
+        if word in rules.PAST_TIME_WORDS:
+            return PAST
+        if word in rules.FUTURE_TIME_WORDS:
+            return FUTURE
+
+        return NO_TENSE
+
+
+class ModificationPattern(NamedTuple):
+    """A sequence of base codes annotated on the modification chain"""
+    codes: Tuple[str, ...]
+    label: str
+    establishes_facts: bool = False
+
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton over sequences of base codes
+
+    Stepping it once per token finds every registered pattern in a single
+    pass, however many patterns there are. Matches are reported as a
+    bitmask of pattern indices.
+    """
+
+    def __init__(self, patterns: Sequence[ModificationPattern]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [0]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for code in pattern.codes:
+                next_state = self._goto[state].get(code)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][code] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                state = next_state
+            self._output[state] |= 1 << index
+
+        # Breadth-first failure links; outputs inherit their fallback's
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for code, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and code not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(code, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def step(self, state: int, code: str) -> Tuple[int, int]:
+        """Advance on code, returning (new state, bitmask of patterns ending here)"""
+        while state and code not in self._goto[state]:
+            state = self._fail[state]
+        state = self._goto[state].get(code, 0)
+        return state, self._output[state]
 
 
 class QuantumGrammarParser:
     """Parser for Quantum Grammar analysis"""
 
+    # Bump whenever tagging or pattern rules change output (invalidates cached results)
+    VERSION = "1.0"
+
     # Numeric code definitions
     CODES = {
         0: "CONJUNCTION",
@@ -62,9 +287,31 @@ class QuantumGrammarParser:
     FUTURE_TENSE_MARKERS = {"will", "going", "gonna", "shall"}
     FUTURE_TENSE_SUFFIXES = {"ing"}  # "going" in context
 
+    # Verb/adjective heuristics (suffix checks)
+    VERB_SUFFIXES = {"ate", "ify", "ize", "en"}
+    ADJECTIVE_SUFFIXES = {"ful", "less", "ous", "ive", "able", "ible", "al"}
+    ADVERB_SUFFIXES = {"ly"}
+
+    # Words whose "-ing" does not mark future tense
+    NON_FUTURE_ING_WORDS = {"being", "doing", "going"}
+    PAST_TIME_WORDS = {"yesterday"}
+    FUTURE_TIME_WORDS = {"tomorrow", "tomorrow's", "soon"}
+
+    # Upper bound on memoized word tags before the table is reset
+    TAG_CACHE_SIZE = 100000
+
+    # Modification patterns annotated on the chain, in output order
+    PATTERNS: Tuple[ModificationPattern, ...] = (
+        ModificationPattern(("5", "6", "7"), "POSITIONED-FACT-PATTERN: 5>6>7", establishes_facts=True),
+        ModificationPattern(("1", "2"), "ADVERB-MODIFIES-VERB: 1>2"),
+        ModificationPattern(("4", "1", "2"), "PRONOUN-ADVERB-VERB: 4<1>2"),
+    )
+
     def __init__(self):
         """Initialize the parser"""
-        pass
+        self._engine = TaggingEngine.for_parser(type(self))
+        self.patterns = tuple(self.PATTERNS)
+        self._matcher = PatternMatcher(self.patterns)
 
     def parse(self, text: str) -> Dict:
         """
@@ -76,33 +323,28 @@ class QuantumGrammarParser:
         Returns:
             Dictionary containing parsed results
         """
-        # Tokenize
-        tokens = self._tokenize(text)
+        return self.parse_compact(text).to_dict()
 
-        # Tag words with initial codes
-        tagged_tokens = [self._tag_word(token) for token in tokens]
-
-        # Apply contextual rules
-        tagged_tokens = self._apply_contextual_rules(tagged_tokens)
+    def parse_compact(self, text: str) -> 'QuantumGrammarResult':
+        """
+        Parse text into a compact, array-backed result
 
-        # Detect modification patterns
-        modification_chain = self._detect_modifications(tagged_tokens)
+        Use this for bulk work; call to_dict() on the result only where the
+        JSON shape returned by parse() is needed.
+        """
+        # Tokenize and tag words with initial codes
+        words, initial_codes, tenses = self._tag_words(self._tokenize(text))
 
-        # Check for 5,6,7 patterns (fact establishment)
-        has_facts = self._check_for_facts(tagged_tokens)
+        # Apply contextual rules, detect patterns and count codes in one sweep
+        codes, matched, code_counts, tense_counts = self._analyze(initial_codes, tenses)
 
-        # Calculate statistics
-        stats = self._calculate_statistics(tagged_tokens, has_facts)
+        # Facts are established by the 5,6,7 pattern
+        has_facts = any(pattern.establishes_facts for pattern in matched)
 
-        return {
-            "success": True,
-            "text": text,
-            "tokens": tagged_tokens,
-            "modification_chain": modification_chain,
-            "has_facts": has_facts,
-            "fact_establishment": "Facts are established" if has_facts else "No facts established - fictional language",
-            "statistics": stats
-        }
+        return QuantumGrammarResult(
+            text, words, initial_codes, codes, tenses, matched,
+            code_counts, tense_counts, has_facts, self.CODES
+        )
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into words"""
@@ -116,261 +358,217 @@ class QuantumGrammarParser:
 
         Returns dictionary with word info and primary code
         """
-        word_lower = word.lower()
+        _, code, tense = self._engine.tag(word.lower())
+        return token_dict(word, code, code, tense, self.CODES)
 
-        # Check conjunctions
-        if word_lower in self.CONJUNCTION_WORDS:
-            return {
-                "text": word,
-                "code": "0",
-                "category": "CONJUNCTION",
-                "primary_category": "CONJUNCTION",
-                "is_verb": False,
-                "tense": None
-            }
-
-        # Check position words
-        if word_lower in self.POSITION_WORDS:
-            return {
-                "text": word,
-                "code": "5",
-                "category": "POSITION",
-                "primary_category": "POSITION",
-                "is_verb": False,
-                "tense": None
-            }
-
-        # Check lodial words
-        if word_lower in self.LODIAL_WORDS:
-            return {
-                "text": word,
-                "code": "6",
-                "category": "LODIAL",
-                "primary_category": "LODIAL",
-                "is_verb": False,
-                "tense": None
-            }
-
-        # Check verbs
-        if word_lower in self.COMMON_VERBS or self._is_likely_verb(word_lower):
-            tense = self._detect_tense(word_lower)
-            code = "2"
-            if tense == "past":
-                code = "2.8"
-            elif tense == "future":
-                code = "2.9"
-
-            return {
-                "text": word,
-                "code": code,
-                "category": "VERB",
-                "primary_category": "VERB",
-                "is_verb": True,
-                "tense": tense
-            }
-
-        # Check for adjectives (very basic heuristic)
-        if self._is_likely_adjective(word_lower):
-            return {
-                "text": word,
-                "code": "3",
-                "category": "ADJECTIVE",
-                "primary_category": "ADJECTIVE",
-                "is_verb": False,
-                "tense": None
-            }
-
-        # Check for adverbs (words ending in -ly)
-        if word_lower.endswith("ly"):
-            tense = self._detect_tense(word_lower)
-            code = "1"
-            if tense == "past":
-                code = "1.8"
-            elif tense == "future":
-                code = "1.9"
-
-            return {
-                "text": word,
-                "code": code,
-                "category": "ADVERB",
-                "primary_category": "ADVERB",
-                "is_verb": False,
-                "tense": tense
-            }
+    def _tag_words(self, words: List[str]) -> Tuple[List[str], array, array]:
+        """
+        Tag already lowercased words (as produced by _tokenize) in one pass
 
-        # Default: noun/fact or pronoun
-        return {
-            "text": word,
-            "code": "7",
-            "category": "FACT",
-            "primary_category": "FACT",
-            "is_verb": False,
-            "tense": None
-        }
+        Returns (canonical words, base codes, tense flags)
+        """
+        tag = self._engine.tag
+        tags = [tag(word) for word in words]
+        return ([word for word, _, _ in tags],
+                array('B', [code for _, code, _ in tags]),
+                array('B', [tense for _, _, tense in tags]))
 
     def _detect_tense(self, word: str) -> Optional[str]:
         """Detect if word indicates past or future tense"""
         word_lower = word.lower()
-
-        # Past tense detection
-        if word_lower in self.PAST_TENSE_VERBS:
-            return "past"
-        for suffix in self.PAST_TENSE_SUFFIXES:
-            if word_lower.endswith(suffix) and len(word_lower) > len(suffix):
-                return "past"
-
-        # Future tense detection
-        if word_lower in self.FUTURE_TENSE_MARKERS:
-            return "future"
-        if word_lower.endswith("ing") and word_lower not in {"being", "doing", "going"}:
-            return "future"
-
-        # Special cases
-        if word_lower == "going":
-            return "future"
-        if word_lower == "yesterday":
-            return "past"
-        if word_lower in {"tomorrow", "tomorrow's", "soon"}:
-            return "future"
-
-        return None
+        return TENSE_NAMES[self._engine.detect_tense(word_lower, self._engine.suffixes.match(word_lower))]
 
     def _is_likely_verb(self, word: str) -> bool:
         """Basic heuristic for identifying verbs"""
-        # Check for common verb endings or patterns
-        verb_indicators = {"ate", "ify", "ize", "en"}
-        for indicator in verb_indicators:
-            if word.endswith(indicator):
-                return True
-        return False
+        return bool(self._engine.suffixes.match(word)[0] & VERB_SUFFIX)
 
     def _is_likely_adjective(self, word: str) -> bool:
         """Basic heuristic for identifying adjectives"""
-        adjective_endings = {"ful", "less", "ous", "ive", "able", "ible", "al"}
-        for ending in adjective_endings:
-            if word.endswith(ending):
-                return True
-        return False
+        return bool(self._engine.suffixes.match(word)[0] & ADJECTIVE_SUFFIX)
+
+    def register_pattern(self, codes: Sequence[str], label: str,
+                         establishes_facts: bool = False) -> None:
+        """
+        Add a modification pattern for this parser instance
 
-    def _apply_contextual_rules(self, tokens: List[Dict]) -> List[Dict]:
+        Args:
+            codes: Sequence of base codes, e.g. ("4", "1", "2")
+            label: Annotation appended to the modification chain when found
+            establishes_facts: Whether a match means facts are established
+        """
+        self.patterns = self.patterns + (ModificationPattern(tuple(codes), label, establishes_facts),)
+        self._matcher = PatternMatcher(self.patterns)
+
+    def _analyze(self, initial_codes: array, tenses: array) -> Tuple[array, List[ModificationPattern],
+                                                                     Dict[str, int], Dict[str, int]]:
         """
-        Apply contextual rules from documentation:
-        - POSITION without LODIAL -> ADVERB
-        - LODIAL without POSITION -> ADVERB
+        Single linear sweep over the tagged codes
+
+        Applies the contextual rules from the documentation:
+        - POSITION without following LODIAL -> ADVERB
+        - LODIAL without preceding POSITION -> ADVERB
         - FACT (7) can ONLY exist when preceded by POSITION (5) + LODIAL (6)
         - FACT without 5,6 preceding it -> PRONOUN (4)
+
+        Rules look at the neighbours' original codes. While sweeping, the
+        resulting base codes are fed through the pattern automaton and
+        counted for the statistics.
+
+        Returns:
+            (final base codes, matched patterns in registration order,
+             base code counts, tense counts)
         """
-        modified_tokens = []
+        codes = array('B', initial_codes)
+        code_counts: Dict[str, int] = {}
+        tense_counts = {"present": 0, "past": 0, "future": 0}
+        step = self._matcher.step
+        state = 0
+        found = 0
 
-        for i, token in enumerate(tokens):
-            token_copy = token.copy()
+        count = len(codes)
+        prev2 = prev1 = None
+        current = initial_codes[0] if count else None
+        for i in range(count):
+            following = initial_codes[i + 1] if i + 1 < count else None
 
             # Rule 1: POSITION without following LODIAL
-            if token_copy["code"] == "5":
-                if i + 1 < len(tokens) and tokens[i + 1]["code"] != "6":
-                    token_copy["code"] = "1"
-                    token_copy["category"] = "ADVERB"
+            if current == POSITION_CODE:
+                if following is not None and following != LODIAL_CODE:
+                    codes[i] = ADVERB_CODE
 
             # Rule 2: LODIAL without preceding POSITION
-            elif token_copy["code"] == "6":
-                if i == 0 or tokens[i - 1]["code"] != "5":
-                    token_copy["code"] = "1"
-                    token_copy["category"] = "ADVERB"
+            elif current == LODIAL_CODE:
+                if prev1 != POSITION_CODE:
+                    codes[i] = ADVERB_CODE
 
             # Rule 3: FACT (7) can ONLY exist if preceded by POSITION (5) + LODIAL (6)
-            elif token_copy["code"] == "7":
-                # Check if preceded by 5,6 pattern
-                if not (i >= 2 and tokens[i - 2]["code"] == "5" and tokens[i - 1]["code"] == "6"):
-                    token_copy["code"] = "4"
-                    token_copy["category"] = "PRONOUN"
-
-            modified_tokens.append(token_copy)
-
-        return modified_tokens
-
-    def _check_for_facts(self, tokens: List[Dict]) -> bool:
-        """
-        Check if sentence contains 5,6,7 pattern (facts established)
+            elif current == FACT_CODE:
+                if not (prev2 == POSITION_CODE and prev1 == LODIAL_CODE):
+                    codes[i] = PRONOUN_CODE
 
-        A fact is established by the sequence POSITION (5) > LODIAL (6) > FACT (7)
-        """
-        for i in range(len(tokens) - 2):
-            # Look for 5,6,7 pattern
-            if (tokens[i]["code"].startswith("5") and
-                tokens[i + 1]["code"].startswith("6") and
-                tokens[i + 2]["code"].startswith("7")):
-                return True
-
-        return False
-
-    def _detect_modifications(self, tokens: List[Dict]) -> str:
-        """
-        Detect modification patterns showing how words relate to each other
-
-        Returns a string representation of the modification chain
-        """
-        if not tokens:
-            return ""
+            code = BASE_CODE_STRINGS[codes[i]]
+            state, matches = step(state, code)
+            found |= matches
 
-        # Build simple modification chain
-        chain_parts = []
-        for i, token in enumerate(tokens):
-            code = token["code"].split(".")[0]  # Get base code
-            chain_parts.append(code)
+            code_counts[code] = code_counts.get(code, 0) + 1
+            tense = tenses[i]
+            if tense:
+                tense_counts[TENSE_NAMES[tense]] += 1
+            elif code not in ["8", "9"]:
+                tense_counts["present"] += 1
 
-        # Analyze patterns
-        modification_chain = " ".join(chain_parts)
+            prev2, prev1, current = prev1, current, following
 
-        # Add directional indicators for common patterns
-        # This is a simplified analysis
-        if self._contains_pattern(chain_parts, ["5", "6", "7"]):
-            modification_chain += " [POSITIONED-FACT-PATTERN: 5>6>7]"
+        matched = [pattern for index, pattern in enumerate(self.patterns) if found & (1 << index)]
+        return codes, matched, code_counts, tense_counts
 
-        if self._contains_pattern(chain_parts, ["1", "2"]):
-            modification_chain += " [ADVERB-MODIFIES-VERB: 1>2]"
 
-        if self._contains_pattern(chain_parts, ["4", "1", "2"]):
-            modification_chain += " [PRONOUN-ADVERB-VERB: 4<1>2]"
+# Base code strings, shared instead of allocating one per token
+BASE_CODE_STRINGS = tuple(str(code) for code in range(10))
 
-        return modification_chain
 
-    def _contains_pattern(self, codes: List[str], pattern: List[str]) -> bool:
-        """Check if codes contain a specific pattern"""
-        for i in range(len(codes) - len(pattern) + 1):
-            if codes[i:i + len(pattern)] == pattern:
-                return True
-        return False
+def token_dict(text: str, initial_code: int, code: int, tense: int,
+               categories: Dict[int, str]) -> Dict:
+    """API token shape for one compact token"""
+    return {
+        "text": text,
+        "code": BASE_CODE_STRINGS[code] + CODE_SUFFIXES[tense],
+        "category": categories[code],
+        "primary_category": categories[initial_code],
+        "is_verb": initial_code == VERB_CODE,
+        "tense": TENSE_NAMES[tense]
+    }
 
-    def _calculate_statistics(self, tokens: List[Dict], has_facts: bool) -> Dict:
-        """Calculate statistics about the parsed text"""
-        code_counts = {}
-        tense_counts = {"present": 0, "past": 0, "future": 0}
 
-        for token in tokens:
-            code = token["code"].split(".")[0]
-            code_counts[code] = code_counts.get(code, 0) + 1
+class QuantumGrammarResult:
+    """
+    Compact Quantum Grammar parse of one text
 
-            if token["tense"]:
-                tense_counts[token["tense"]] += 1
-            elif code not in ["8", "9"]:
-                tense_counts["present"] += 1
+    Tokens are stored column-wise: canonical (shared) word strings plus
+    byte arrays of initial codes, final codes and tense flags. Categories,
+    code strings and flags are derived from those, so the dict form from
+    QuantumGrammarParser.parse is only materialized by to_dict().
+    """
 
+    __slots__ = ('text', 'words', 'initial_codes', 'codes', 'tenses', 'patterns',
+                 'code_counts', 'tense_counts', 'has_facts', 'categories')
+
+    def __init__(self, text: str, words: List[str], initial_codes: array, codes: array,
+                 tenses: array, patterns: List[ModificationPattern],
+                 code_counts: Dict[str, int], tense_counts: Dict[str, int],
+                 has_facts: bool, categories: Dict[int, str]):
+        self.text = text
+        self.words = words
+        self.initial_codes = initial_codes
+        self.codes = codes
+        self.tenses = tenses
+        self.patterns = patterns
+        self.code_counts = code_counts
+        self.tense_counts = tense_counts
+        self.has_facts = has_facts
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def modification_chain(self) -> str:
+        """Base codes joined by spaces, followed by the matched pattern labels"""
+        chain = " ".join(BASE_CODE_STRINGS[code] for code in self.codes)
+        for pattern in self.patterns:
+            chain += f" [{pattern.label}]"
+        return chain
+
+    def tokens(self) -> List[Dict]:
+        """Tokens in the API dict shape"""
+        categories = self.categories
+        return [token_dict(word, initial_code, code, tense, categories)
+                for word, initial_code, code, tense
+                in zip(self.words, self.initial_codes, self.codes, self.tenses)]
+
+    def statistics(self) -> Dict:
+        """Statistics about the parsed text"""
         # Map codes to human-readable categories
         category_distribution = {}
-        for code, count in code_counts.items():
-            category = self.CODES.get(int(code), "UNKNOWN")
+        for code, count in self.code_counts.items():
+            category = self.categories.get(int(code), "UNKNOWN")
             category_distribution[category] = count
 
         return {
-            "token_count": len(tokens),
-            "code_distribution": code_counts,
+            "token_count": len(self.words),
+            "code_distribution": self.code_counts,
             "category_distribution": category_distribution,
-            "tense_distribution": tense_counts,
-            "facts_established": has_facts,
-            "communication_type": "FACT-COMMUNICATION" if has_facts else "FICTIONAL-COMMUNICATION"
+            "tense_distribution": self.tense_counts,
+            "facts_established": self.has_facts,
+            "communication_type": "FACT-COMMUNICATION" if self.has_facts else "FICTIONAL-COMMUNICATION"
+        }
+
+    def to_dict(self) -> Dict:
+        """Result in the JSON shape returned by the API"""
+        return {
+            "success": True,
+            "text": self.text,
+            "tokens": self.tokens(),
+            "modification_chain": self.modification_chain,
+            "has_facts": self.has_facts,
+            "fact_establishment": "Facts are established" if self.has_facts else "No facts established - fictional language",
+            "statistics": self.statistics()
         }
 
 
+# Long-lived parser shared by parse_quantum_grammar; parsing keeps no
+# per-call state on the instance, so it is safe to share between threads
+_default_parser: Optional[QuantumGrammarParser] = None
+
+
+def get_parser() -> QuantumGrammarParser:
+    """Return the shared default parser, creating it on first use"""
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = QuantumGrammarParser()
+    return _default_parser
+
+
 def parse_quantum_grammar(text: str) -> Dict:
     """
     Convenience function to parse text using Quantum Grammar
@@ -381,5 +579,4 @@ def parse_quantum_grammar(text: str) -> Dict:
     Returns:
         Dictionary containing parsed results
     """
-    parser = QuantumGrammarParser()
-    return parser.parse(text)
+    return get_parser().parse(text)
@@ -0,0 +1,165 @@
+"""
+Response encodings for parse results
+
+The default parse response lists every token twice (inside its sentence and
+in the flat `tokens` list) with the same keys repeated on every token.
+Clients can opt into a compact columnar layout instead, either as JSON or,
+when msgpack is installed, as MessagePack:
+
+    ?format=compact   or  Accept: application/vnd.diagrammatic.columnar+json
+    ?format=msgpack   or  Accept: application/msgpack
+
+Each token appears once. Per-field arrays hold the values, and
+upos/xpos/deprel are indices into small string tables. Sentences are
+[start, end) ranges over the token arrays.
+
+OrjsonProvider speeds up the default JSON path when orjson is installed.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from flask import Request, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional encoding
+    msgpack = None
+
+JSON = 'json'
+COMPACT = 'compact'
+MSGPACK = 'msgpack'
+
+COMPACT_MIMETYPE = 'application/vnd.diagrammatic.columnar+json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+# Token fields stored as indices into a string table
+TABLE_FIELDS = ('upos', 'xpos', 'deprel')
+
+
+class UnsupportedFormatError(Exception):
+    """The requested response format is not available"""
+
+
+def negotiate_format(request: Request) -> str:
+    """
+    Pick the response format from ?format= or the Accept header
+
+    Raises:
+        UnsupportedFormatError: An unknown format, or msgpack without the
+            msgpack package installed
+    """
+    requested = request.args.get('format')
+    if requested is None:
+        accepted = request.accept_mimetypes
+        if any(accepted[mimetype] for mimetype in MSGPACK_MIMETYPES) and msgpack is not None:
+            requested = MSGPACK
+        elif accepted[COMPACT_MIMETYPE]:
+            requested = COMPACT
+        else:
+            requested = JSON
+
+    if requested not in (JSON, COMPACT, MSGPACK):
+        raise UnsupportedFormatError(f'Unknown format {requested}')
+    if requested == MSGPACK and msgpack is None:
+        raise UnsupportedFormatError('MessagePack responses require the msgpack package')
+    return requested
+
+
+def to_columnar(result: Dict) -> Dict:
+    """
+    Convert a parse_with_stanza result into the de-duplicated columnar layout
+    """
+    if not result.get('success'):
+        return result
+
+    tables: Dict[str, List[Optional[str]]] = {field: [] for field in TABLE_FIELDS}
+    lookups: Dict[str, Dict[Optional[str], int]] = {field: {} for field in TABLE_FIELDS}
+    columns: Dict[str, List[Any]] = {
+        'id': [], 'text': [], 'lemma': [], 'head': [],
+        **{field: [] for field in TABLE_FIELDS}
+    }
+    sentences = []
+
+    for sentence in result['sentences']:
+        start = len(columns['id'])
+        for token in sentence['tokens']:
+            columns['id'].append(token['id'])
+            columns['text'].append(token['text'])
+            columns['lemma'].append(token['lemma'])
+            columns['head'].append(token['head'])
+            for field in TABLE_FIELDS:
+                value = token[field]
+                lookup = lookups[field]
+                index = lookup.get(value)
+                if index is None:
+                    index = lookup[value] = len(tables[field])
+                    tables[field].append(value)
+                columns[field].append(index)
+        entry = {'text': sentence['text'], 'start': start, 'end': len(columns['id'])}
+        if 'language' in sentence:
+            entry['language'] = sentence['language']
+        sentences.append(entry)
+
+    columnar = {
+        'success': True,
+        'format': 'columnar',
+        'language': result['language'],
+        'tables': tables,
+        'tokens': columns,
+        'sentences': sentences,
+        'token_count': result['token_count'],
+        'sentence_count': result['sentence_count']
+    }
+    # Mixed-language results keep their per-segment summary
+    for key in ('languages', 'segments'):
+        if key in result:
+            columnar[key] = result[key]
+    return columnar
+
+
+def encode(payload: Any, response_format: str, status: int = 200) -> Response:
+    """Serialize a (already columnar, if requested) payload as a response"""
+    from flask import current_app
+
+    if response_format == MSGPACK:
+        return Response(msgpack.packb(payload, use_bin_type=True), status=status,
+                        mimetype=MSGPACK_MIMETYPES[0])
+    response = current_app.json.response(payload)
+    response.status_code = status
+    if response_format == COMPACT:
+        response.mimetype = COMPACT_MIMETYPE
+    return response
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with the same sorted-key output"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+        except TypeError:
+            # Types orjson does not know (e.g. Decimal) take the standard path
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps(obj) + '\n', mimetype=self.mimetype)
+
+
+def install_json_provider(app) -> None:
+    """Use OrjsonProvider for app when orjson is available"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,259 @@
+"""
+Content-addressed cache for parse results
+
+Parse results are keyed on a hash of (normalized text, language, processors,
+model version), so repeated sentences skip the NLP pipeline entirely. Results
+live in an in-memory LRU tier and, when a path is configured, in an SQLite
+tier that survives restarts. Both tiers honour a TTL and a maximum entry
+count; the memory tier is also bounded by the approximate size of its
+entries, measured as the length of their JSON encoding. Live Python objects
+take several times that, so the byte budget is a proportional bound rather
+than an exact RSS limit.
+
+Cached results are shared between requests and must not be mutated.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of text used for cache keys"""
+    return unicodedata.normalize('NFC', text).strip()
+
+
+def make_key(namespace: str, text: str, *parts: Any) -> str:
+    """
+    Build a cache key from the normalized text and any distinguishing parts
+
+    Args:
+        namespace: Which parser produced the result (e.g. 'stanza')
+        text: Input text
+        parts: Language, processors, model version, ...
+    """
+    payload = json.dumps([namespace, normalize_text(text), *parts], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskTier:
+    """SQLite-backed result store shared across restarts"""
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        self._conn.commit()
+        self._puts_since_trim = 0
+        # Row count kept up to date by this process, so stats never scan the table;
+        # rows written by other processes sharing the file are only seen at startup
+        self._size = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the JSON-encoded result for key, or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created FROM results WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                cursor = self._conn.execute('DELETE FROM results WHERE key = ?', (key,))
+                self._size -= cursor.rowcount
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        return value
+
+    def put(self, key: str, encoded: str) -> None:
+        """Store an already JSON-encoded result"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                (key, encoded, now, now)
+            )
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    'UPDATE results SET value = ?, created = ?, accessed = ? WHERE key = ?',
+                    (encoded, now, now, key)
+                )
+            self._puts_since_trim += 1
+            # Trimming scans the table, so only do it every so often
+            if self._puts_since_trim >= 100:
+                self._trim(now)
+            self._conn.commit()
+
+    def _trim(self, now: float) -> None:
+        """Drop expired rows, then the least recently accessed overflow (lock held)"""
+        self._puts_since_trim = 0
+        if self.ttl:
+            cursor = self._conn.execute('DELETE FROM results WHERE created < ?', (now - self.ttl,))
+            self._size -= cursor.rowcount
+        if self.max_entries:
+            cursor = self._conn.execute(
+                'DELETE FROM results WHERE key IN ('
+                ' SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            self._size -= cursor.rowcount
+
+    def __len__(self) -> int:
+        return max(self._size, 0)
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional SQLite) cache of parse results"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 0,
+                 disk_path: Optional[str] = None, disk_max_entries: int = 100000,
+                 max_bytes: int = 0):
+        """
+        Args:
+            max_entries: Maximum results held in memory (0 disables the cache)
+            max_bytes: Approximate memory budget, as the summed JSON size of
+                the entries (0 = bounded by max_entries only)
+            ttl: Seconds a result stays valid (0 = never expires)
+            disk_path: SQLite file for the persistent tier (None = memory only)
+            disk_max_entries: Maximum results kept on disk (0 = unlimited)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (created, value, approximate size in bytes)
+        self._memory: 'OrderedDict[str, Tuple[float, Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.disk = DiskTier(disk_path, disk_max_entries, ttl) if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None"""
+        if not self.max_entries:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value, _ = entry
+                if not self.ttl or time.time() - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                self._drop_memory(key)
+
+        if self.disk is not None:
+            try:
+                encoded = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache disk read failed: {e}")
+                encoded = None
+            if encoded is not None:
+                value = json.loads(encoded)
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store_memory(key, value, len(encoded))
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result in every tier"""
+        if not self.max_entries:
+            return
+
+        # Encode once: the length sizes the memory entry and the text goes to disk
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._store_memory(key, value, len(encoded))
+
+        if self.disk is not None:
+            try:
+                self.disk.put(key, encoded)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache disk write failed: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict]) -> Dict:
+        """
+        Return the cached result for key, computing and storing it on a miss
+
+        Only results with 'success' set are stored, so transient failures
+        are retried on the next request.
+        """
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            if result.get('success'):
+                self.put(key, result)
+        return result
+
+    def _store_memory(self, key: str, value: Any, size: int) -> None:
+        """Insert into the memory tier, evicting LRU entries (lock held)"""
+        self._drop_memory(key)
+        if self.max_bytes and size > self.max_bytes:
+            # A single result larger than the whole budget stays on disk only
+            return
+        self._memory[key] = (time.time(), value, size)
+        self._bytes += size
+        while (len(self._memory) > self.max_entries
+               or (self.max_bytes and self._bytes > self.max_bytes)):
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _drop_memory(self, key: str) -> None:
+        """Remove key from the memory tier if present (lock held)"""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def stats(self) -> Dict:
+        """Hit-rate metrics for health reporting"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                'size': len(self._memory),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+        if self.disk is not None:
+            stats['disk_path'] = self.disk.path
+            stats['disk_size'] = len(self.disk)
+        return stats
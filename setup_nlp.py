@@ -4,7 +4,6 @@ Setup script to download Stanza language models for the Diagrammatic app
 Run this once after installing Python dependencies
 """
 
-import stanza
 import sys
 
 # List of language codes to download models for
@@ -31,6 +30,9 @@ LANGUAGES = [
 
 def download_models():
     """Download Stanza models for all supported languages"""
+    # Imported here so the backend can read LANGUAGES without loading Stanza
+    import stanza
+
     print(f"Downloading Stanza models for {len(LANGUAGES)} languages...")
     print("This may take several minutes depending on your internet connection.\n")
 
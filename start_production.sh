@@ -0,0 +1,6 @@
+#!/bin/bash
+# Start the Flask NLP backend under gunicorn with preloaded, shared models
+# Worker/thread counts and bind address are read from the environment (see gunicorn.conf.py)
+source venv/bin/activate
+export PRELOAD_MODELS="${PRELOAD_MODELS:-true}"
+exec gunicorn -c gunicorn.conf.py wsgi:app
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Keep the backend's stores in memory and make the top-level modules importable
+os.environ.setdefault('JOB_STORE_PATH', ':memory:')
+os.environ.setdefault('RESULT_CACHE_PATH', '')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import benchmark
+from tree_analytics import TreeBatch
+
+
+def run(throughput, p50, p95=None, p99=None):
+    return {'throughput': throughput, 'p50_ms': p50, 'p95_ms': p95 or p50, 'p99_ms': p99 or p50}
+
+
+def test_compare_runs_flags_only_changes_beyond_threshold():
+    baseline = {'results': {'parse': run(100.0, 10.0), 'detect': run(1000.0, 1.0)},
+                'peak_rss_mb': 100.0}
+    current = {'results': {'parse': run(95.0, 10.5), 'detect': run(800.0, 1.5)},
+               'peak_rss_mb': 130.0}
+    regressions = benchmark.compare_runs(baseline, current, threshold=0.10)
+    assert regressions == [
+        'detect throughput -20.0%', 'detect p50_ms +50.0%', 'detect p95_ms +50.0%',
+        'detect p99_ms +50.0%', 'peak_rss_mb +30.0%',
+    ]
+
+
+def test_compare_runs_skips_missing_and_skipped_benchmarks():
+    baseline = {'results': {'parse': run(100.0, 10.0), 'stanza': {'skipped': 'Stanza unavailable'}}}
+    current = {'results': {'stanza': run(1.0, 1000.0)}}
+    assert benchmark.compare_runs(baseline, current, threshold=0.10) == []
+
+
+def test_compare_command_exits_on_regression(tmp_path):
+    baseline, current = tmp_path / 'baseline.json', tmp_path / 'current.json'
+    baseline.write_text(json.dumps({'results': {'parse': run(100.0, 10.0)}}))
+    current.write_text(json.dumps({'results': {'parse': run(100.0, 10.5)}}))
+    benchmark.main(['compare', str(baseline), str(current)])
+
+    current.write_text(json.dumps({'results': {'parse': run(50.0, 20.0)}}))
+    with pytest.raises(SystemExit) as exit_info:
+        benchmark.main(['compare', str(baseline), str(current)])
+    assert exit_info.value.code == 1
+
+
+def test_meta_mismatches_lists_differing_run_settings():
+    meta = {'command': 'micro', 'platform': 'Linux', 'cpu_count': 8, 'python': '3.11.4',
+            'options': {'rounds': 20}}
+    assert benchmark.meta_mismatches({'meta': meta}, {'meta': dict(meta)}) == []
+    other = dict(meta, cpu_count=1, options={'rounds': 5})
+    assert benchmark.meta_mismatches({'meta': meta}, {'meta': other}) == ['cpu_count', 'options']
+
+
+def test_synthetic_treebank_is_reproducible_and_well_formed():
+    treebank = benchmark.synthetic_treebank(size=50, seed=7)
+    assert treebank == benchmark.synthetic_treebank(size=50, seed=7)
+    assert treebank != benchmark.synthetic_treebank(size=50, seed=8)
+    for sentence in treebank:
+        tokens = sentence['tokens']
+        assert 5 <= len(tokens) <= 40
+        assert [token['head'] for token in tokens].count(0) == 1
+        assert all(0 <= token['head'] <= len(tokens) for token in tokens)
+
+    statistics = TreeBatch.from_sentences(treebank).tree_statistics(per_sentence=False)
+    assert statistics['depth']['max'] >= 1
+
+
+def test_unique_payload_tags_text_only():
+    payload = {'text': 'The cat sat on the mat.', 'language': 'en'}
+    tagged = benchmark.unique_payload(payload, 'abc-1')
+    assert tagged == {'text': 'The cat sat on the mat. [abc-1]', 'language': 'en'}
+    assert payload['text'] == 'The cat sat on the mat.'
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+import nlp_backend
+from jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobManager, JobStore
+
+
+def wait_for(store, job_id, states, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job is not None and job['status'] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not reach {states}')
+
+
+def echo(payload, progress):
+    progress(1, 1)
+    return {'result': {'text': payload['text']}, 'statistics': {}}
+
+
+class Gate:
+    """Handler that waits inside the job until released"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, payload, progress):
+        progress(0, 2)
+        self.started.set()
+        self.release.wait(5)
+        progress(1, 2)
+        return {'result': {}, 'statistics': {}}
+
+
+def test_store_expires_finished_jobs_after_ttl():
+    store = JobStore(ttl=0.05)
+    job = store.create('key')
+    store.transition(job['job_id'], (QUEUED,), RUNNING)
+    store.transition(job['job_id'], (RUNNING,), DONE, result={'value': 1})
+    assert store.get(job['job_id'], with_result=True)['result'] == {'value': 1}
+    time.sleep(0.1)
+    assert store.get(job['job_id'], with_result=True) is None
+    assert store.find('key') is None
+
+
+def test_store_keeps_active_jobs_past_ttl():
+    store = JobStore(ttl=0.01)
+    job = store.create('key')
+    time.sleep(0.05)
+    assert store.get(job['job_id'])['status'] == QUEUED
+
+
+def test_submitting_the_same_key_returns_the_existing_job():
+    manager = JobManager(JobStore(), handler=echo, workers=1)
+    first, first_deduplicated = manager.submit('key', {'text': 'a'})
+    wait_for(manager.store, first['job_id'], (DONE,))
+    second, second_deduplicated = manager.submit('key', {'text': 'a'})
+    assert (first_deduplicated, second_deduplicated) == (False, True)
+    assert second['job_id'] == first['job_id']
+    assert manager.stats()['deduplicated'] == 1
+
+
+def test_failed_jobs_are_not_reused():
+    manager = JobManager(JobStore(), handler=lambda payload, progress: {'success': False, 'error': 'x'})
+    job, _ = manager.submit('key', {})
+    assert wait_for(manager.store, job['job_id'], (FAILED,))['error'] == 'x'
+    retry, deduplicated = manager.submit('key', {})
+    assert not deduplicated and retry['job_id'] != job['job_id']
+
+
+def test_cancel_stops_a_running_job():
+    gate = Gate()
+    manager = JobManager(JobStore(), handler=gate, workers=1)
+    job, _ = manager.submit('key', {})
+    assert gate.started.wait(5)
+    assert manager.cancel(job['job_id'])['status'] == CANCELLED
+    gate.release.set()
+    time.sleep(0.05)
+    job = manager.store.get(job['job_id'], with_result=True)
+    assert job['status'] == CANCELLED and job['result'] is None
+    assert manager.stats()['finished'][CANCELLED] == 1
+
+
+@pytest.fixture
+def client(monkeypatch):
+    manager = JobManager(JobStore(ttl=60), handler=echo, workers=1)
+    monkeypatch.setattr(nlp_backend, 'job_manager', manager)
+    monkeypatch.setattr(nlp_backend, 'stanza_version', lambda: 'test')
+    return nlp_backend.app.test_client()
+
+
+def test_result_endpoint_returns_the_finished_result(client):
+    response = client.post('/api/jobs', json={'text': 'The cat sat on the mat.', 'language': 'en'})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert response.headers['Location'] == f'/api/jobs/{job_id}'
+    wait_for(nlp_backend.job_manager.store, job_id, (DONE,))
+
+    result = client.get(f'/api/jobs/{job_id}/result')
+    assert result.status_code == 200
+    assert result.get_json()['result'] == {'text': 'The cat sat on the mat.'}
+
+    again = client.post('/api/jobs', json={'text': 'The cat sat on the mat.', 'language': 'en'})
+    assert again.get_json()['job_id'] == job_id and again.get_json()['deduplicated']
+
+
+def test_result_endpoint_answers_202_while_running_and_409_when_cancelled(client, monkeypatch):
+    gate = Gate()
+    monkeypatch.setattr(nlp_backend, 'job_manager', JobManager(JobStore(), handler=gate, workers=1))
+    job_id = client.post('/api/jobs', json={'text': 'Long text.', 'language': 'en'}).get_json()['job_id']
+    assert gate.started.wait(5)
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 202
+    assert client.delete(f'/api/jobs/{job_id}').get_json()['status'] == CANCELLED
+    gate.release.set()
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 409
+
+
+def test_result_endpoint_answers_404_for_unknown_and_expired_jobs(client, monkeypatch):
+    assert client.get('/api/jobs/unknown/result').status_code == 404
+    monkeypatch.setattr(nlp_backend, 'job_manager', JobManager(JobStore(ttl=0.05), handler=echo, workers=1))
+    job_id = client.post('/api/jobs', json={'text': 'Short.', 'language': 'en'}).get_json()['job_id']
+    wait_for(nlp_backend.job_manager.store, job_id, (DONE,))
+    time.sleep(0.1)
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 404
+
+
+@pytest.mark.parametrize('body', [
+    {'text': 5},
+    {'text': '   '},
+    {'text': 'The cat sat.', 'language': ['en']},
+    {'text': 'The cat sat.', 'language': 'xx'},
+    {'text': 'The cat sat.', 'processors': 5},
+])
+def test_submit_rejects_invalid_requests(client, body):
+    assert client.post('/api/jobs', json=body).status_code == 400
+    assert nlp_backend.job_manager.stats()['submitted'] == 0
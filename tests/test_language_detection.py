@@ -0,0 +1,92 @@
+import os
+import re
+
+import pytest
+
+from language_detection import LATIN, LanguageDetector
+
+README = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'README.md')
+
+detector = LanguageDetector()
+
+
+def readme_prose():
+    """README lines with at least six words, outside code blocks and tables"""
+    lines = []
+    in_code = False
+    with open(README, encoding='utf-8') as handle:
+        for line in handle:
+            if line.startswith('```'):
+                in_code = not in_code
+            elif not in_code and not line.startswith('|'):
+                text = re.sub(r'`[^`]*`', ' ', line).strip()
+                if len(re.findall(r'[A-Za-z]{2,}', text)) >= 6:
+                    lines.append(text)
+    return lines
+
+
+@pytest.mark.parametrize('text', [
+    'I run.', 'Run!', 'Hi', 'OK.', 'John loves Mary.',
+    'Sentence number 1.', 'Computer science is fun', 'Data processing pipeline',
+])
+def test_short_latin_input_falls_back_to_english(text):
+    detection = detector.detect(text)
+    assert detection.language == 'en'
+    assert detection.script == LATIN
+
+
+def test_english_readme_is_detected_as_english():
+    lines = readme_prose()
+    assert len(lines) > 50
+    assert [line for line in lines if detector.detect(line).language != 'en'] == []
+
+
+@pytest.mark.parametrize('text', ['I run.', 'Hi', 'OK.', 'John loves Mary.'])
+def test_short_input_reports_low_confidence(text):
+    assert detector.detect(text).confidence < 0.5
+
+
+@pytest.mark.parametrize('text, language', [
+    ('Le chien dort.', 'fr'),
+    ('Der Hund schläft.', 'de'),
+    ('Ik ben erg moe vandaag.', 'nl'),
+    ('Mój brat pracuje w szpitalu nad rzeką.', 'pl'),
+    ('Mi hermano trabaja en el hospital cerca del río.', 'es'),
+])
+def test_short_sentences_with_enough_evidence_are_classified(text, language):
+    assert detector.detect(text).language == language
+
+
+def test_short_input_in_other_scripts_uses_the_script_default():
+    assert detector.detect('Привет').language == 'ru'
+    assert detector.detect('سلام').language == 'ar'
+
+
+def test_no_letters_returns_default():
+    detection = detector.detect('12 + 7 = 19')
+    assert detection.language == 'en'
+    assert detection.confidence == 0.0
+
+
+def test_quoted_phrase_in_another_script_is_its_own_segment():
+    text = 'He said "مرحبا بك يا صديقي" and left.'
+    segments = detector.segments(text)
+    assert [segment.language for segment in segments] == ['en', 'ar', 'en']
+    assert [text[segment.start:segment.end].strip() for segment in segments] == [
+        'He said', '"مرحبا بك يا صديقي"', 'and left.'
+    ]
+    assert segments[0].start == 0 and segments[-1].end == len(text)
+
+
+def test_single_foreign_word_stays_with_its_sentence():
+    text = 'We met Иван yesterday at the station.'
+    segments = detector.segments(text)
+    assert [(segment.start, segment.end, segment.language) for segment in segments] == [(0, len(text), 'en')]
+
+
+def test_quotes_without_surrounding_space_stay_with_the_quoted_run():
+    text = 'Он сказал: «I love you so much» и ушёл домой быстро.'
+    segments = detector.segments(text)
+    assert [text[segment.start:segment.end].strip() for segment in segments] == [
+        'Он сказал:', '«I love you so much»', 'и ушёл домой быстро.'
+    ]
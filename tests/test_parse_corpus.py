@@ -0,0 +1,89 @@
+import json
+
+import parse_corpus
+
+
+def parsed(record_id, text):
+    return {'id': record_id, 'language': 'en', 'stanza': {'success': True, 'sentences': [{
+        'text': text,
+        'tokens': [{'id': 1, 'text': text, 'lemma': text.lower(), 'upos': 'INTJ', 'xpos': None,
+                    'head': 0, 'deprel': 'root'}],
+    }]}}
+
+
+def failed(record_id, language='xx'):
+    return {'id': record_id, 'language': language,
+            'stanza': {'success': False, 'error': f'Language {language} not supported'}}
+
+
+def fake_parse_batch(batch, mode, default_language):
+    return [parsed(record_id, text) if text != 'fail' else failed(record_id)
+            for record_id, text, _ in batch]
+
+
+def conllu_blocks(text):
+    return [block for block in text.split('\n\n') if block.strip()]
+
+
+def test_to_conllu_skips_failed_records():
+    assert parse_corpus.to_conllu(failed('1')) == ''
+    assert parse_corpus.to_conllu({'id': '2'}) == ''
+    assert parse_corpus.to_conllu(parsed('3', 'Hello')) == (
+        '# sent_id = 3-1\n# text = Hello\n1\tHello\thello\tINTJ\t_\t_\t0\troot\t_\t_\n\n'
+    )
+
+
+def test_parse_error():
+    assert parse_corpus.parse_error(parsed('1', 'Hello')) is None
+    assert parse_corpus.parse_error(failed('2')) == {
+        'id': '2', 'language': 'xx', 'error': 'Language xx not supported'
+    }
+
+
+def test_conllu_run_sends_failures_to_the_error_log(monkeypatch, tmp_path):
+    monkeypatch.setattr(parse_corpus, 'parse_batch', fake_parse_batch)
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('Hello\nfail\nWorld\nfail\n')
+    output = tmp_path / 'parsed.conllu'
+    parse_corpus.main([str(corpus), '-o', str(output), '--format', 'conllu', '--batch-size', '2'])
+
+    blocks = conllu_blocks(output.read_text())
+    assert [block.splitlines()[0] for block in blocks] == ['# sent_id = 1-1', '# sent_id = 3-1']
+    assert all(any(not line.startswith('#') for line in block.splitlines()) for block in blocks)
+    errors = [json.loads(line) for line in (tmp_path / 'parsed.conllu.errors.jsonl').read_text().splitlines()]
+    assert [error['id'] for error in errors] == ['2', '4']
+
+
+def test_jsonl_run_keeps_failures_inline(monkeypatch, tmp_path):
+    monkeypatch.setattr(parse_corpus, 'parse_batch', fake_parse_batch)
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('Hello\nfail\n')
+    output = tmp_path / 'parsed.jsonl'
+    parse_corpus.main([str(corpus), '-o', str(output)])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record['stanza']['success'] for record in records] == [True, False]
+    assert not (tmp_path / 'parsed.jsonl.errors.jsonl').exists()
+
+
+def test_resume_truncates_the_error_log_to_the_checkpoint(monkeypatch, tmp_path):
+    monkeypatch.setattr(parse_corpus, 'parse_batch', fake_parse_batch)
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('Hello\nfail\nWorld\nfail\n')
+    output = tmp_path / 'parsed.conllu'
+    errors = tmp_path / 'parsed.conllu.errors.jsonl'
+    arguments = [str(corpus), '-o', str(output), '--format', 'conllu', '--batch-size', '2', '--resume']
+    parse_corpus.main(arguments)
+    complete_output, complete_errors = output.read_text(), errors.read_text()
+
+    # Simulate a crash after the first batch that left partial writes behind
+    first_batch_output = complete_output[:complete_output.index('# sent_id = 3-1')]
+    first_batch_errors = complete_errors.splitlines(keepends=True)[0]
+    parse_corpus.save_checkpoint(str(output) + '.checkpoint', 2, len(first_batch_output.encode()),
+                                 len(first_batch_errors.encode()))
+    output.write_text(first_batch_output + '# sent_id = partial\n')
+    errors.write_text(first_batch_errors + '{"id": "partial"}\n')
+
+    parse_corpus.main(arguments)
+    assert output.read_text() == complete_output
+    assert errors.read_text() == complete_errors
@@ -0,0 +1,53 @@
+import pytest
+
+import nlp_backend
+from pipeline_cache import PipelineCache
+from preload import FAILED, PipelinePreloader
+
+
+class BrokenPipeline:
+    """Loads, but fails every parse, like a pipeline over a corrupt model"""
+
+    def __call__(self, *args, **kwargs):
+        raise RuntimeError('model file is corrupt')
+
+
+class FailingPool:
+    """Inference pool whose workers report a missing model"""
+
+    enabled = True
+
+    def run(self, language, texts, *args, **kwargs):
+        return [{'success': False, 'error': 'missing model', 'language': language} for _ in texts]
+
+
+@pytest.fixture
+def preloader(monkeypatch):
+    monkeypatch.setattr(nlp_backend, 'stanza_pipelines', PipelineCache(max_pipelines=0))
+    monkeypatch.setattr(nlp_backend, 'build_stanza_pipeline', lambda *key: BrokenPipeline())
+    preloader = PipelinePreloader(load=nlp_backend.preload_stanza_pipeline,
+                                  warmup=nlp_backend.warmup_stanza_pipeline, max_workers=1)
+    monkeypatch.setattr(nlp_backend, 'preloader', preloader)
+    return preloader
+
+
+def test_failed_warmup_marks_language_failed(preloader):
+    preloader.run(['en'])
+    status = preloader.status()['en']
+    assert status['state'] == FAILED
+    assert 'model file is corrupt' in status['error']
+    assert not preloader.is_ready()
+
+
+def test_failed_load_in_inference_pool_marks_language_failed(preloader, monkeypatch):
+    monkeypatch.setattr(nlp_backend, 'inference_pool', FailingPool())
+    preloader.run(['en'], warmup=False)
+    assert preloader.status()['en']['state'] == FAILED
+    assert 'missing model' in preloader.status()['en']['error']
+
+
+def test_ready_endpoint_reports_failed_preload(preloader):
+    preloader.run(['en'])
+    response = nlp_backend.app.test_client().get('/api/ready')
+    assert response.status_code == 503
+    assert response.get_json()['languages']['en']['state'] == FAILED
@@ -0,0 +1,35 @@
+import pytest
+
+import nlp_backend
+from profiler import SamplingProfiler
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(nlp_backend, 'PROFILER_ENABLED', True)
+    monkeypatch.setattr(nlp_backend, 'profiler', SamplingProfiler(max_seconds=5))
+    yield nlp_backend.app.test_client()
+    nlp_backend.profiler.stop()
+
+
+@pytest.mark.parametrize('body', [
+    {'interval_ms': 'fast'}, {'interval_ms': [10]}, {'interval_ms': {}}, {'interval_ms': True},
+    {'interval_ms': 0}, {'interval_ms': -5}, {'interval_ms': 'nan'}, {'interval_ms': 'inf'},
+])
+def test_start_rejects_invalid_intervals(client, body):
+    response = client.post('/api/profiler/start', json=body)
+    assert response.status_code == 400
+    assert 'interval_ms' in response.get_json()['error']
+    assert not nlp_backend.profiler.status()['running']
+
+
+@pytest.mark.parametrize('body, interval_ms', [
+    (None, 10.0), ({}, 10.0), ({'interval_ms': None}, 10.0), ([1, 2], 10.0),
+    ({'interval_ms': 5}, 5.0), ({'interval_ms': '2.5'}, 2.5),
+])
+def test_start_accepts_numbers_and_defaults(client, body, interval_ms):
+    response = client.post('/api/profiler/start', json=body)
+    assert response.status_code == 200
+    assert response.get_json()['interval_ms'] == interval_ms
+    assert client.post('/api/profiler/start', json=body).status_code == 409
+    assert client.post('/api/profiler/stop').status_code == 200
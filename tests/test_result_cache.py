@@ -0,0 +1,139 @@
+import json
+
+import nlp_backend
+import result_cache
+from result_cache import ResultCache, make_key
+
+
+def result(text, padding=0):
+    return {'success': True, 'text': text, 'padding': 'x' * padding}
+
+
+def encoded_size(value):
+    return len(json.dumps(value, ensure_ascii=False))
+
+
+def test_memory_tier_evicts_by_bytes():
+    entry = result('a', padding=1000)
+    size = encoded_size(entry)
+    cache = ResultCache(max_entries=100, max_bytes=size * 3)
+    for i in range(5):
+        cache.put(f'k{i}', result('a', padding=1000))
+
+    stats = cache.stats()
+    assert stats['size'] == 3
+    assert stats['bytes'] <= stats['max_bytes']
+    assert stats['evictions'] == 2
+    assert cache.get('k0') is None
+    assert cache.get('k4') is not None
+
+
+def test_memory_tier_evicts_by_entries():
+    cache = ResultCache(max_entries=2)
+    for i in range(3):
+        cache.put(f'k{i}', result(str(i)))
+    assert cache.get('k0') is None
+    assert cache.get('k2') == result('2')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_replacing_an_entry_does_not_double_count_bytes():
+    cache = ResultCache(max_entries=10, max_bytes=10000)
+    cache.put('k', result('a', padding=100))
+    cache.put('k', result('a', padding=100))
+    assert cache.stats()['bytes'] == encoded_size(result('a', padding=100))
+
+
+def test_oversized_entry_skips_memory_but_reaches_disk(tmp_path):
+    cache = ResultCache(max_entries=10, max_bytes=100, disk_path=str(tmp_path / 'cache.db'))
+    cache.put('small', result('a'))
+    cache.put('big', result('b', padding=1000))
+
+    assert cache.stats()['size'] == 1
+    assert cache.get('small') == result('a')
+    assert cache.get('big') == result('b', padding=1000)
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ResultCache(max_entries=0)
+    cache.put('k', result('a'))
+    assert cache.get('k') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: now[0])
+    cache = ResultCache(max_entries=10, ttl=60)
+    cache.put('k', result('a'))
+
+    now[0] += 59
+    assert cache.get('k') == result('a')
+    now[0] += 2
+    assert cache.get('k') is None
+    stats = cache.stats()
+    assert stats['size'] == 0
+    assert stats['bytes'] == 0
+    assert stats['misses'] == 1
+
+
+def test_disk_entries_expire_after_ttl(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: now[0])
+    path = str(tmp_path / 'cache.db')
+    ResultCache(max_entries=10, ttl=60, disk_path=path).put('k', result('a'))
+
+    now[0] += 61
+    cache = ResultCache(max_entries=10, ttl=60, disk_path=path)
+    assert cache.get('k') is None
+    assert cache.stats()['disk_size'] == 0
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    first = ResultCache(max_entries=10, disk_path=path)
+    first.put('k', result('héllo'))
+    first.put('k', result('héllo'))
+    assert first.stats()['disk_size'] == 1
+
+    second = ResultCache(max_entries=10, disk_path=path)
+    assert second.stats()['disk_size'] == 1
+    assert second.get('k') == result('héllo')
+    assert second.get('k') == result('héllo')
+    stats = second.stats()
+    assert stats['disk_hits'] == 1
+    assert stats['memory_hits'] == 1
+    assert stats['bytes'] == encoded_size(result('héllo'))
+
+
+def test_disk_tier_trims_to_max_entries(tmp_path):
+    cache = ResultCache(max_entries=1, disk_path=str(tmp_path / 'cache.db'), disk_max_entries=10)
+    for i in range(100):
+        cache.put(f'k{i}', result(str(i)))
+    assert cache.stats()['disk_size'] == 10
+    assert cache.get('k99') == result('99')
+    assert cache.get('k0') is None
+
+
+def test_make_key_normalizes_text():
+    composed = 'caf\u00e9'
+    decomposed = 'cafe\u0301'
+    assert make_key('stanza', composed, 'fr') == make_key('stanza', f'  {decomposed}\n', 'fr')
+    assert make_key('stanza', 'a', 'en') != make_key('stanza', 'b', 'en')
+    assert make_key('stanza', 'a', 'en') != make_key('other', 'a', 'en')
+
+
+def test_stanza_key_depends_on_language_processors_and_version(monkeypatch):
+    monkeypatch.setattr(nlp_backend, 'stanza_version', lambda: '1.0.0')
+    base = nlp_backend.stanza_cache_key('Hello world.', 'en')
+    assert base == nlp_backend.stanza_cache_key('Hello world.', 'en')
+    assert base != nlp_backend.stanza_cache_key('Hello world.', 'de')
+    assert base != nlp_backend.stanza_cache_key('Hello world.', 'en', 'tokenize,pos')
+
+    monkeypatch.setattr(nlp_backend, 'stanza_version', lambda: '1.1.0')
+    assert base != nlp_backend.stanza_cache_key('Hello world.', 'en')
+
+    monkeypatch.setattr(nlp_backend, 'stanza_version', lambda: '1.0.0')
+    monkeypatch.setattr(nlp_backend, 'ANALYTICS_SCHEMA_VERSION', 'test')
+    assert base != nlp_backend.stanza_cache_key('Hello world.', 'en')
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from tree_analytics import TreeBatch
+
+UPOS = ('NOUN', 'VERB', 'ADJ', 'DET', 'ADP', 'PRON')
+DEPRELS = ('nsubj', 'obj', 'amod', 'det', 'case', 'obl', 'root')
+
+
+def random_sentence(rng, size):
+    """Tokens of a random dependency tree with 1-based heads (0 = root)"""
+    order = list(range(1, size + 1))
+    rng.shuffle(order)
+    heads = {order[0]: 0}
+    for position, word in enumerate(order[1:], 1):
+        heads[word] = rng.choice(order[:position])
+    return {'tokens': [
+        {'id': word, 'head': heads[word], 'upos': rng.choice(UPOS),
+         'deprel': 'root' if heads[word] == 0 else rng.choice(DEPRELS)}
+        for word in range(1, size + 1)
+    ]}
+
+
+# Reference implementations: the per-token dict passes TreeBatch replaced,
+# and brute-force tree walks for the tree statistics
+
+def pos_distribution(tokens):
+    distribution = {}
+    for token in tokens:
+        pos = token.get('upos', 'UNKNOWN')
+        distribution[pos] = distribution.get(pos, 0) + 1
+    return distribution
+
+
+def dependency_types(tokens):
+    distribution = {}
+    for token in tokens:
+        deprel = token.get('deprel', 'root')
+        distribution[deprel] = distribution.get(deprel, 0) + 1
+    return distribution
+
+
+def sentence_reference(tokens):
+    heads = {token['id']: token['head'] for token in tokens}
+
+    def depth(word):
+        steps = 0
+        while heads[word]:
+            word = heads[word]
+            steps += 1
+        return steps
+
+    def descendants(word):
+        return {other for other in heads if other == word or _dominates(heads, word, other)}
+
+    spans = []
+    for word in heads:
+        below = descendants(word)
+        spans.append([min(below) - 1, max(below)])
+    projective = all(
+        all(_dominates(heads, head, between) for between in range(min(word, head) + 1, max(word, head)))
+        for word, head in heads.items() if head
+    )
+    arcs = [(word, head) for word, head in heads.items() if head]
+    return {
+        'depth': max(depth(word) for word in heads),
+        'projective': projective,
+        'mean_dependency_distance': sum(abs(word - head) for word, head in arcs) / max(len(arcs), 1),
+        'subtree_spans': spans,
+        'children': [sum(1 for head in heads.values() if head == word) for word in heads],
+        'distances': [abs(word - head) for word, head in arcs],
+        'left': sum(1 for word, head in arcs if word < head),
+        'right': sum(1 for word, head in arcs if word > head),
+    }
+
+
+def _dominates(heads, ancestor, word):
+    while heads[word]:
+        word = heads[word]
+        if word == ancestor:
+            return True
+    return False
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_tree_batch_matches_reference(seed):
+    rng = random.Random(seed)
+    sentences = [random_sentence(rng, rng.randint(1, 14)) for _ in range(rng.randint(1, 6))]
+    tokens = [token for sentence in sentences for token in sentence['tokens']]
+    batch = TreeBatch.from_sentences(sentences)
+
+    assert batch.pos_distribution() == pos_distribution(tokens)
+    assert batch.dependency_types() == dependency_types(tokens)
+
+    statistics = batch.tree_statistics()
+    references = [sentence_reference(sentence['tokens']) for sentence in sentences]
+    for computed, reference in zip(statistics['sentences'], references):
+        assert computed['depth'] == reference['depth']
+        assert computed['projective'] == reference['projective']
+        assert computed['mean_dependency_distance'] == pytest.approx(reference['mean_dependency_distance'])
+        assert computed['subtree_spans'] == reference['subtree_spans']
+
+    depths = [reference['depth'] for reference in references]
+    children = [count for reference in references for count in reference['children']]
+    distances = [distance for reference in references for distance in reference['distances']]
+    internal = [count for count in children if count]
+    assert statistics['depth'] == {'mean': pytest.approx(sum(depths) / len(depths)), 'max': max(depths)}
+    assert statistics['branching_factor'] == {
+        'mean': pytest.approx(sum(internal) / len(internal) if internal else 0.0), 'max': max(children)
+    }
+    assert statistics['dependency_distance'] == {
+        'mean': pytest.approx(sum(distances) / max(len(distances), 1)), 'max': max(distances, default=0)
+    }
+    assert statistics['arc_direction'] == {
+        'left': sum(reference['left'] for reference in references),
+        'right': sum(reference['right'] for reference in references),
+    }
+    projective = sum(reference['projective'] for reference in references)
+    assert statistics['projective_sentences'] == projective
+    assert statistics['non_projective_sentences'] == len(references) - projective
+
+
+def test_non_projective_sentence_is_detected():
+    # 1 <- 3, 2 <- 4: the arcs cross
+    sentence = {'tokens': [
+        {'id': 1, 'head': 3, 'upos': 'NOUN', 'deprel': 'nsubj'},
+        {'id': 2, 'head': 4, 'upos': 'NOUN', 'deprel': 'obj'},
+        {'id': 3, 'head': 0, 'upos': 'VERB', 'deprel': 'root'},
+        {'id': 4, 'head': 3, 'upos': 'VERB', 'deprel': 'xcomp'},
+    ]}
+    statistics = TreeBatch.from_sentences([sentence]).tree_statistics()
+    assert statistics['sentences'][0]['projective'] is False
+    assert statistics['non_projective_sentences'] == 1
+
+
+def test_sentences_without_heads_have_no_tree_statistics():
+    sentence = {'tokens': [{'id': 1, 'head': None, 'upos': 'NOUN', 'deprel': None}]}
+    batch = TreeBatch.from_sentences([sentence])
+    assert batch.pos_distribution() == {'NOUN': 1}
+    assert batch.tree_statistics() == {}
+
+
+def test_schema_version_is_part_of_etags_and_cache_keys(monkeypatch):
+    import nlp_backend
+
+    monkeypatch.setattr(nlp_backend, 'stanza_version', lambda: '1.0')
+    before = (nlp_backend.stanza_etag('parse-detailed', 'Text.', 'en', 'json'),
+              nlp_backend.stanza_cache_key('Text.', 'en'))
+    monkeypatch.setattr(nlp_backend, 'ANALYTICS_SCHEMA_VERSION', 'next')
+    after = (nlp_backend.stanza_etag('parse-detailed', 'Text.', 'en', 'json'),
+             nlp_backend.stanza_cache_key('Text.', 'en'))
+    assert before[0] != after[0] and before[1] != after[1]
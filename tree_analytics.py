@@ -0,0 +1,217 @@
+"""
+Array-backed dependency tree analytics
+
+TreeBatch stores the words of many sentences as flat integer arrays (head
+index, dependency relation and UPOS codes) with sentence offsets, so the
+statistics of a whole document come from a few vectorized NumPy passes
+instead of per-token dict lookups:
+
+- UPOS and dependency relation distributions
+- tree depth, branching factor, dependency distance and arc direction
+- subtree spans and projectivity
+
+Heads are absolute word indices into the batch; a sentence root's head is
+the sentinel index one past the last word. Depths are found by pointer
+jumping (O(n log depth)); subtree spans and sizes are then accumulated one
+tree level at a time, deepest first (O(n)).
+
+Changing the shape or values of these statistics requires bumping
+ANALYTICS_SCHEMA_VERSION in nlp_backend, which feeds ETags and cache keys.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _intern(label, table: Dict) -> int:
+    code = table.get(label)
+    if code is None:
+        code = table[label] = len(table)
+    return code
+
+
+class TreeBatch:
+    """Dependency trees of many sentences as flat arrays"""
+
+    def __init__(self, heads: Optional[np.ndarray], deprels: np.ndarray, upos: np.ndarray,
+                 deprel_labels: List, upos_labels: List, offsets: np.ndarray):
+        """
+        Args:
+            heads: Absolute head index per word (size = root), or None without parses
+            deprels: Index into deprel_labels per word
+            upos: Index into upos_labels per word
+            offsets: Start of every sentence, plus the total word count
+        """
+        self.heads = heads
+        self.deprels = deprels
+        self.upos = upos
+        self.deprel_labels = deprel_labels
+        self.upos_labels = upos_labels
+        self.offsets = offsets
+        self._depths: Optional[np.ndarray] = None
+        self._spans: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_sentences(cls, sentences: Sequence[Dict]) -> 'TreeBatch':
+        """
+        Build a batch from API sentences ({'tokens': [...]} with 1-based heads)
+
+        Sentences without words are skipped. heads is None unless every word
+        has a head, i.e. unless the depparse layer ran.
+        """
+        heads: List[int] = []
+        deprels: List[int] = []
+        upos: List[int] = []
+        deprel_table: Dict = {}
+        upos_table: Dict = {}
+        offsets = [0]
+        parsed = True
+        for sentence in sentences:
+            tokens = sentence['tokens']
+            if not tokens:
+                continue
+            for token in tokens:
+                head = token.get('head')
+                if head is None:
+                    parsed = False
+                else:
+                    heads.append(head)
+                deprels.append(_intern(token.get('deprel'), deprel_table))
+                upos.append(_intern(token.get('upos'), upos_table))
+            offsets.append(offsets[-1] + len(tokens))
+
+        offsets_array = np.array(offsets, dtype=np.int64)
+        head_array = None
+        if parsed:
+            size = offsets[-1]
+            relative = np.array(heads, dtype=np.int64)
+            starts = np.repeat(offsets_array[:-1], np.diff(offsets_array))
+            head_array = np.where(relative > 0, starts + relative - 1, size)
+        return cls(head_array, np.array(deprels, dtype=np.int32), np.array(upos, dtype=np.int32),
+                   list(deprel_table), list(upos_table), offsets_array)
+
+    @property
+    def size(self) -> int:
+        """Number of words"""
+        return int(self.offsets[-1])
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @staticmethod
+    def _label_counts(codes: np.ndarray, labels: List) -> Dict:
+        counts = np.bincount(codes, minlength=len(labels))
+        return {label: int(count) for label, count in zip(labels, counts)}
+
+    def pos_distribution(self) -> Dict[str, int]:
+        """Word count per UPOS tag"""
+        return self._label_counts(self.upos, self.upos_labels)
+
+    def dependency_types(self) -> Dict[str, int]:
+        """Word count per dependency relation"""
+        return self._label_counts(self.deprels, self.deprel_labels)
+
+    def depths(self) -> np.ndarray:
+        """Arcs between each word and its sentence root (0 for the root)"""
+        if self._depths is None:
+            size = self.size
+            jump = np.append(self.heads, size)
+            # Distance to the sentinel, which points at itself at distance 0
+            distance = np.append(np.ones(size, dtype=np.int64), 0)
+            # Each round doubles the span covered; malformed (cyclic) heads stop at the bound
+            for _ in range(max(1, size.bit_length()) + 1):
+                if (jump == size).all():
+                    break
+                distance = distance + distance[jump]
+                jump = jump[jump]
+            self._depths = distance[:size] - 1
+        return self._depths
+
+    def subtree_spans(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """First word, last word and word count of every word's subtree"""
+        if self._spans is None:
+            size = self.size
+            depths = self.depths()
+            first = np.arange(size)
+            last = first.copy()
+            count = np.ones(size, dtype=np.int64)
+            # Words grouped by depth, deepest level first; each level folds into its parents
+            order = np.argsort(-depths, kind='stable')
+            level_sizes = np.bincount(depths)[::-1] if size else np.zeros(0, dtype=np.int64)
+            boundaries = np.cumsum(level_sizes)
+            for start, end in zip(boundaries[:-1] - level_sizes[:-1], boundaries[:-1]):
+                nodes = order[start:end]
+                parents = self.heads[nodes]
+                np.minimum.at(first, parents, first[nodes])
+                np.maximum.at(last, parents, last[nodes])
+                np.add.at(count, parents, count[nodes])
+            self._spans = (first, last, count)
+        return self._spans
+
+    def tree_statistics(self, per_sentence: bool = True) -> Dict:
+        """
+        Depth, branching, dependency distance, direction and projectivity
+
+        With per_sentence, `sentences` holds each sentence's depth,
+        projectivity, mean dependency distance and the [start, end) subtree
+        span of every word, in sentence-relative word indices.
+        """
+        size = self.size
+        if self.heads is None or size == 0:
+            return {}
+        starts = self.offsets[:-1]
+        positions = np.arange(size)
+        is_root = self.heads == size
+        arcs = ~is_root
+        distance = np.where(arcs, np.abs(positions - self.heads), 0)
+        children = np.bincount(self.heads[arcs], minlength=size)
+        depths = self.depths()
+        first, last, count = self.subtree_spans()
+
+        # A tree is projective exactly when every subtree covers a contiguous range
+        contiguous = (last - first + 1) == count
+        projective = np.logical_and.reduceat(contiguous, starts)
+        sentence_depths = np.maximum.reduceat(depths, starts)
+        arc_counts = np.add.reduceat(arcs.astype(np.int64), starts)
+        mean_distances = np.add.reduceat(distance, starts) / np.maximum(arc_counts, 1)
+        internal = children[children > 0]
+
+        statistics = {
+            'depth': {
+                'mean': float(sentence_depths.mean()),
+                'max': int(sentence_depths.max())
+            },
+            'branching_factor': {
+                'mean': float(internal.mean()) if internal.size else 0.0,
+                'max': int(children.max())
+            },
+            'dependency_distance': {
+                'mean': float(distance.sum() / max(int(arcs.sum()), 1)),
+                'max': int(distance.max())
+            },
+            # Dependents before their head (left) and after it (right)
+            'arc_direction': {
+                'left': int((arcs & (positions < self.heads)).sum()),
+                'right': int((arcs & (positions > self.heads)).sum())
+            },
+            'projective_sentences': int(projective.sum()),
+            'non_projective_sentences': int((~projective).sum())
+        }
+        if per_sentence:
+            sentence_of = np.repeat(starts, np.diff(self.offsets))
+            spans = np.stack([first - sentence_of, last - sentence_of + 1], axis=1)
+            statistics['sentences'] = [
+                {
+                    'depth': depth,
+                    'projective': is_projective,
+                    'mean_dependency_distance': mean_distance,
+                    'subtree_spans': sentence_spans.tolist()
+                }
+                for depth, is_projective, mean_distance, sentence_spans in zip(
+                    sentence_depths.tolist(), projective.tolist(), mean_distances.tolist(),
+                    np.split(spans, starts[1:])
+                )
+            ]
+        return statistics
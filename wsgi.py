@@ -0,0 +1,23 @@
+"""
+WSGI entry point for production serving
+
+Run with gunicorn using the bundled configuration:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets preload_app, so this module is imported once in the
+master process. When PRELOAD_MODELS is enabled the Stanza pipelines are
+loaded here, before workers are forked, and every worker then shares the
+read-only model weights copy-on-write instead of holding its own copy.
+Inference (including warmup) is deferred to the workers; see post_fork in
+gunicorn.conf.py.
+
+With INFERENCE_WORKERS set, models live in each worker's inference pool
+rather than the master, so preloading is left to the workers.
+"""
+
+from nlp_backend import app, env_flag, inference_pool, preload_languages, preloader, startup
+
+if env_flag('PRELOAD_MODELS') and not inference_pool.enabled:
+    preloader.run(preload_languages(), warmup=False)
+    startup.mark('preload_models')